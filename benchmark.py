@@ -0,0 +1,357 @@
+"""Micro-benchmarks for the compiler pipeline.
+
+Usage:
+    python benchmark.py                 # run every suite
+    python benchmark.py executor        # run selected suites
+    python benchmark.py -n 500 executor # change the repeat count
+"""
+from typing import Callable, Dict, List
+import argparse
+import statistics
+import time
+
+# Smallest possible program: measures pure per-run executor overhead
+TRIVIAL_IR = """
+define i32 @"main"()
+{
+entry:
+  ret i32 0
+}
+"""
+
+# Echoes its first stdin integer, so stdin and stdout are both exercised
+ECHO_IR = """
+@".fmt" = private constant [3 x i8] c"%d\\00"
+@".out" = private constant [4 x i8] c"%d\\0a\\00"
+declare i32 @"scanf"(i8* %".1", ...)
+declare i32 @"printf"(i8* %".1", ...)
+define i32 @"main"()
+{
+entry:
+  %"a" = alloca i32
+  store i32 0, i32* %"a"
+  %"f" = getelementptr [3 x i8], [3 x i8]* @".fmt", i32 0, i32 0
+  %"r" = call i32 (i8*, ...) @"scanf"(i8* %"f", i32* %"a")
+  %"v" = load i32, i32* %"a"
+  %"o" = getelementptr [4 x i8], [4 x i8]* @".out", i32 0, i32 0
+  %"p" = call i32 (i8*, ...) @"printf"(i8* %"o", i32 %"v")
+  ret i32 0
+}
+"""
+
+# Hot loop calling a helper through alloca/load/store IR, as IRGenerator emits it
+LOOP_IR = """
+@".out" = private constant [4 x i8] c"%d\\0a\\00"
+declare i32 @"printf"(i8* %".1", ...)
+define i32 @"step"(i32 %".1", i32 %".2")
+{
+entry:
+  %"a" = alloca i32
+  %"b" = alloca i32
+  store i32 %".1", i32* %"a"
+  store i32 %".2", i32* %"b"
+  %"x" = load i32, i32* %"a"
+  %"y" = load i32, i32* %"b"
+  %"m" = mul i32 %"y", 7
+  %"r" = urem i32 %"m", 13
+  %"s" = add i32 %"x", %"r"
+  ret i32 %"s"
+}
+define i32 @"main"()
+{
+entry:
+  %"s" = alloca i32
+  %"i" = alloca i32
+  store i32 0, i32* %"s"
+  store i32 0, i32* %"i"
+  br label %"cond"
+cond:
+  %"iv" = load i32, i32* %"i"
+  %"c" = icmp slt i32 %"iv", 50000000
+  br i1 %"c", label %"body", label %"done"
+body:
+  %"sv" = load i32, i32* %"s"
+  %"n" = call i32 @"step"(i32 %"sv", i32 %"iv")
+  store i32 %"n", i32* %"s"
+  %"inc" = add i32 %"iv", 1
+  store i32 %"inc", i32* %"i"
+  br label %"cond"
+done:
+  %"f" = load i32, i32* %"s"
+  %"o" = getelementptr [4 x i8], [4 x i8]* @".out", i32 0, i32 0
+  %"p" = call i32 (i8*, ...) @"printf"(i8* %"o", i32 %"f")
+  ret i32 0
+}
+"""
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 3) -> List[float]:
+    """Run fn repeatedly and return the per-call wall times in seconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(name: str, samples: List[float]) -> None:
+    """Print summary statistics for a list of timings."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:<44} mean {statistics.mean(samples) * 1000:9.3f} ms   "
+          f"median {statistics.median(samples) * 1000:9.3f} ms   p95 {p95 * 1000:9.3f} ms")
+
+
+def bench_executor(repeat: int) -> None:
+    """Per-run overhead of IRExecutor.execute (parse, JIT, stdio capture)."""
+    from ir.ir_executor import IRExecutor
+
+    executor = IRExecutor()
+    report("executor: empty main", measure(lambda: executor.execute(TRIVIAL_IR), repeat))
+    report("executor: echo, small stdin", measure(lambda: executor.execute(ECHO_IR, "42\n"), repeat))
+    big_stdin = "7 " * 32768
+    report("executor: echo, 64KiB stdin", measure(lambda: executor.execute(ECHO_IR, big_stdin), repeat))
+
+
+def bench_forkserver(repeat: int) -> None:
+    """Per-run overhead of executing in forked children, with and without recycling."""
+    from llvmlite import binding as llvm
+    from ir.ir_executor import IRExecutor
+    from ir.execution_pool import ExecutionPool
+
+    bitcode = llvm.parse_assembly(ECHO_IR).as_bitcode()
+    executor = IRExecutor()
+    for runs_per_child in (1, 100):
+        pool = ExecutionPool(executor, max_workers=1, max_runs_per_child=runs_per_child)
+        report(f"forkserver: echo, recycle every {runs_per_child}",
+               measure(lambda: pool.execute(bitcode, "42\n"), repeat))
+        print(f"{'':<44} avg fork {pool.stats()['avg_fork_ms']:.3f} ms")
+        pool.shutdown()
+
+
+def bench_optimizer(repeat: int) -> None:
+    """Generated-code speed of a hot loop at each optimization level."""
+    from ir.ir_executor import IRExecutor
+    from ir.ir_optimizer import IROptimizer
+
+    executor = IRExecutor()
+    optimizer = IROptimizer(executor.target_machine)
+    for level in range(4):
+        report(f"optimizer: O{level} pass pipeline", measure(lambda: optimizer.optimize_ir(LOOP_IR, level), repeat))
+        optimized = optimizer.optimize_ir(LOOP_IR, level)
+        samples = measure(lambda: executor.execute(optimized, optimization_level=level), min(repeat, 10), warmup=1)
+        report(f"optimizer: O{level} loop execution", samples)
+
+
+def bench_judge(repeat: int) -> None:
+    """Running 100 stdin cases: one JIT per case vs. one JIT per batch."""
+    from ir.ir_executor import IRExecutor
+
+    executor = IRExecutor()
+    inputs = [f"{i}\n" for i in range(100)]
+    report("judge: 100 cases, execute per case",
+           measure(lambda: [executor.execute(ECHO_IR, stdin) for stdin in inputs], max(1, repeat // 10)))
+    report("judge: 100 cases, run_cases batch",
+           measure(lambda: executor.run_cases(ECHO_IR, inputs), max(1, repeat // 10)))
+
+
+def bench_macros(repeat: int) -> None:
+    """Macro expansion cost per line as the number of defined macros grows."""
+    from frontend.preprocessor.macros import MacroTable
+
+    lines = [f"    total = total + MAX(values[{i}], LIMIT) * SCALE_{i % 50};" for i in range(1000)]
+    for count in (10, 1000, 10000):
+        table = MacroTable()
+        table.define_directive("MAX(a, b) ((a) > (b) ? (a) : (b))")
+        table.define_directive("LIMIT 100")
+        for i in range(count):
+            table.define_directive(f"SCALE_{i} {i}")
+        samples = measure(lambda: [table.expand(line) for line in lines], max(1, repeat // 10))
+        report(f"macros: 1000 lines, {count} macros", samples)
+
+
+def preprocessor_source(kloc: int) -> str:
+    """Synthetic translation unit: mostly code lines, with defines and conditional blocks."""
+    lines = ['#include <stdio.h>', '#define MAX(a, b) ((a) > (b) ? (a) : (b))', '#define LIMIT 100']
+    for i in range(kloc * 100):
+        lines.append(f'#define SCALE_{i} {i}')
+        lines.append('#ifdef DEBUG')
+        lines.append(f'    printf("%d\\n", SCALE_{i});')
+        lines.append('#else')
+        lines.extend(f'    total = total + MAX(values[{j}], LIMIT) * SCALE_{i};' for j in range(5))
+        lines.append('#endif')
+    return '\n'.join(lines)
+
+
+def bench_preprocessor(repeat: int) -> None:
+    """Whole-unit preprocessing cost, reported per 1000 source lines."""
+    from frontend.preprocessor.preprocessor import Preprocessor
+
+    preprocessor = Preprocessor()
+    preprocessor.output_cache = None  # measure scanning, not repeated-input lookups
+    for kloc in (1, 10):
+        source = preprocessor_source(kloc)
+        samples = measure(lambda: preprocessor.process(source), max(1, repeat // (10 * kloc)))
+        report(f"preprocessor: {kloc} KLOC", samples)
+        print(f"{'':<44} {statistics.mean(samples) * 1000 / kloc:.3f} ms per KLOC")
+
+    # Directive-heavy input: the same configuration checks repeated, as in headers
+    checks = ['#if defined(LIMIT) && LIMIT > 50 && (VERSION_MAJOR * 100 + VERSION_MINOR) >= 102',
+              '    fast_path();', '#elif LIMIT > 10', '    slow_path();', '#else', '    no_path();', '#endif']
+    source = '#define VERSION_MAJOR 1\n#define VERSION_MINOR 2\n#define LIMIT 100\n' + '\n'.join(checks * 1430)
+    samples = measure(lambda: preprocessor.process(source), max(1, repeat // 10))
+    report("preprocessor: 10 KLOC, 60% #if/#elif lines", samples)
+
+    includes = '\n'.join(f'#include <{name}.h>' for name in ('stdio', 'stdlib', 'string', 'math'))
+    preprocessor.header_cache.clear()
+    report("preprocessor: 4 stdlib includes, uncached",
+           measure(lambda: (preprocessor.header_cache.clear(), preprocessor.process(includes)), repeat))
+    preprocessor.preload_headers()
+    report("preprocessor: 4 stdlib includes, preloaded", measure(lambda: preprocessor.process(includes), repeat))
+
+
+
+# Straight-line programs the rd parser handles itself, followed by control
+# flow and %, which it hands to the ANTLR parser. Both engines must produce
+# identical ASTs and program output on all of them.
+FRONTEND_CORPUS = [
+    "int main(){ int a = 1; int b = (a + 2) * 3; return b; }",
+    'int main(){ int a = 1; int b = a * 2 + 3; printf("%d\\n", b); }',
+    "int main(){ float x = 1.5f; double y = x * 2.0; return 0; }",
+    "int main(){ int a = 1; return a - 1; }",
+    "int f(int x){ return x * 2; }",
+    "int main(){ return (1 + 2) * 3; }",
+    'int main(){ int a = 3; if (a > 2) { printf("big\\n"); } else { printf("small\\n"); } return 0; }',
+    'int main(){ int i = 0; int s = 0; while (i < 4) { int d = i * 2; s = s + d; i = i + 1; } printf("%d\\n", s); return 0; }',
+    'int main(){ int s = 0; for (int i = 0; i < 5; i = i + 1) { s = s + i; } printf("%d\\n", s); return 0; }',
+    'int main(){ int n = 10; int c = 0; while (n > 1) { if (n % 2 == 0) { n = n / 2; } else { n = 3 * n + 1; } c = c + 1; } printf("%d\\n", c); return 0; }',
+    'int main(){ int i = 3; do { i = i - 1; } while (i > 0); printf("%d\\n", i); return 0; }',
+]
+
+
+def frontend_source(declarations: int) -> str:
+    """Synthetic main() with a chain of arithmetic declarations and a final printf."""
+    lines = ['int main(){', '    int v0 = 1;']
+    for i in range(1, declarations):
+        lines.append(f'    int v{i} = (v{i - 1} + {i % 7}) * {i % 5 + 1};')
+    lines.append(f'    printf("%d\\n", v{declarations - 1});')
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def bench_frontend(repeat: int) -> None:
+    """ANTLR vs. recursive-descent parsing: AST agreement, program output and parse time."""
+    from pathlib import Path
+    from frontend.parser import Parser
+    from frontend.parser.c_parser import CParser
+    from frontend.parser.rd_parser import RecursiveDescentParser
+    from simple_compiler import ModernCompiler
+
+    engines = {engine: Parser(engine) for engine in ('antlr', 'rd')}
+    corpus = FRONTEND_CORPUS + [frontend_source(20)]
+    mismatches = [source for source in corpus if engines['antlr'].parse(source) != engines['rd'].parse(source)]
+    print(f"frontend: identical ASTs on {len(corpus) - len(mismatches)}/{len(corpus)} corpus programs "
+          f"({engines['rd'].rd_fallbacks} handed to ANTLR by rd)")
+    for source in mismatches:
+        print(f"  AST mismatch: {source.splitlines()[0][:90]}")
+
+    def run(compiler: 'ModernCompiler', source: str) -> str:
+        try:
+            return repr(compiler.compile_and_execute(source, include_ir=False).get('output'))
+        except Exception as e:
+            return f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+
+    compilers = {engine: ModernCompiler({'frontend_engine': engine}) for engine in ('antlr', 'rd')}
+    programs = [(source.splitlines()[0][:60], source) for source in corpus]
+    programs += [(path.name, path.read_text()) for path in sorted((Path(__file__).parent / 'examples').glob('*.c'))]
+    differing = []
+    for name, source in programs:
+        outputs = {engine: run(compiler, source) for engine, compiler in compilers.items()}
+        if outputs['antlr'] != outputs['rd']:
+            differing.append(name)
+            print(f"  output mismatch: {name}")
+            for engine, output in outputs.items():
+                print(f"    {engine:<6} {output[:80]}")
+    print(f"frontend: identical output on {len(programs) - len(differing)}/{len(programs)} programs")
+    for compiler in compilers.values():
+        if compiler.execution_pool is not None:
+            compiler.execution_pool.shutdown()
+    if mismatches or differing:
+        raise AssertionError(f"frontend engines disagree on {len(mismatches)} ASTs and {len(differing)} outputs")
+
+    # Parse time of the two parsers themselves, on input rd handles without fallback
+    antlr, rd = CParser(), RecursiveDescentParser()
+    for declarations in (20, 200):
+        source = frontend_source(declarations)
+        count = max(1, repeat // (declarations // 10))
+        antlr_samples = measure(lambda: antlr.parse(source), count)
+        rd_samples = measure(lambda: rd.parse(source), count)
+        report(f"frontend: antlr, {declarations} declarations", antlr_samples)
+        report(f"frontend: rd, {declarations} declarations", rd_samples)
+        print(f"{'':<44} speedup {statistics.mean(antlr_samples) / statistics.mean(rd_samples):.1f}x")
+
+
+
+def count_nodes(node: object) -> int:
+    """Number of AST nodes reachable from node, following dataclass fields and lists."""
+    from dataclasses import fields
+    from frontend.ast.nodes import Node
+
+    if isinstance(node, list):
+        return sum(count_nodes(item) for item in node)
+    if not isinstance(node, Node):
+        return 0
+    return 1 + sum(count_nodes(getattr(node, field.name)) for field in fields(node))
+
+
+def bench_ast(repeat: int) -> None:
+    """AST construction time and retained memory per node for large functions."""
+    import tracemalloc
+    from frontend.parser.rd_parser import RecursiveDescentParser
+
+    parser = RecursiveDescentParser()
+    for declarations in (1000, 10000):
+        source = frontend_source(declarations)
+        samples = measure(lambda: parser.parse(source), max(3, repeat * 100 // declarations), warmup=1)
+        report(f"ast: build, {declarations} declarations", samples)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        tree = parser.parse(source)
+        retained = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        nodes = count_nodes(tree)
+        print(f"{'':<44} {nodes} nodes, {statistics.mean(samples) * 1e6 / nodes:.2f} us and "
+              f"{retained / nodes:.0f} bytes per node")
+        del tree
+
+
+SUITES: Dict[str, Callable[[int], None]] = {
+    'executor': bench_executor,
+    'optimizer': bench_optimizer,
+    'judge': bench_judge,
+    'macros': bench_macros,
+    'preprocessor': bench_preprocessor,
+    'forkserver': bench_forkserver,
+    'frontend': bench_frontend,
+    'ast': bench_ast,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compiler pipeline benchmarks")
+    parser.add_argument('suites', nargs='*', help=f"suites to run (default: all): {', '.join(SUITES)}")
+    parser.add_argument('-n', '--repeat', type=int, default=100, help="timed iterations per benchmark")
+    args = parser.parse_args()
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+    for name in args.suites or SUITES:
+        print(f"== {name} ==")
+        SUITES[name](args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Union
+import hashlib
+import json
+import os
+import stat
+import threading
+
+
+def fingerprint(*parts: Any) -> str:
+    """Build a stable content hash from strings, bytes and JSON-serializable values.
+
+    Args:
+        parts: Values to hash; non-string values are serialized as sorted JSON
+
+    Returns:
+        Hex digest identifying the combined input
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode('utf-8')
+        else:
+            data = json.dumps(part, sort_keys=True, default=str).encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def cache_root() -> Path:
+    """Per-user base directory for on-disk caches ($XDG_CACHE_HOME/ai_compiler or ~/.cache/ai_compiler)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'ai_compiler'
+
+
+def _check_private(st: os.stat_result, path: Path) -> None:
+    if hasattr(os, 'getuid') and st.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by uid {st.st_uid}, not the current user")
+    if st.st_mode & 0o022:
+        raise PermissionError(f"{path} is writable by other users")
+
+
+def private_directory(path: Union[str, Path]) -> Path:
+    """Create a cache directory only the current user can access, or check an existing one.
+
+    Cached files are loaded back as pickles or machine code, so a directory
+    that another user can write to would let them run code in this process.
+
+    Args:
+        path: Directory to create (mode 0700) if missing
+
+    Returns:
+        The directory path
+
+    Raises:
+        OSError: If the directory cannot be created, is not a directory, is
+            owned by another user or is writable by group or others
+    """
+    path = Path(path)
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise NotADirectoryError(f"{path} is not a directory")
+    _check_private(st, path)
+    return path
+
+
+def read_private(path: Union[str, Path]) -> bytes:
+    """Read a cache file, refusing symlinks and files another user could have written.
+
+    Raises:
+        OSError: If the file is missing, a symlink, owned by another user or
+            writable by group or others
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+    with os.fdopen(fd, 'rb') as f:
+        _check_private(os.fstat(fd), Path(path))
+        return f.read()
+
+
+def write_private(path: Union[str, Path], data: bytes) -> None:
+    """Atomically replace a cache file with data, readable only by the current user.
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+class LRUCache:
+    """Thread-safe bounded mapping with least-recently-used eviction."""
+
+    def __init__(self, maxsize: int = 256):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept; 0 disables caching
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0,
+            }
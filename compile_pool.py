@@ -0,0 +1,181 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import multiprocessing
+import os
+import threading
+
+# Per-process state, populated by _init_worker in each pool worker
+_worker_compiler = None
+
+# Stats fields describing shared state (e.g. the on-disk object cache) rather than per-worker counters
+_SHARED_CACHE_FIELDS = ('files', 'bytes', 'max_bytes')
+
+_WARMUP_SOURCE = 'int main() { int x = 1 + 2; return x; }\n'
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Build and warm this worker's private compiler and executor."""
+    global _worker_compiler
+    from simple_compiler import ModernCompiler
+
+    # Workers are long-lived, so their parser caches are warmed up front
+    _worker_compiler = ModernCompiler({'warm_up_parser': True, **config})
+    try:
+        _worker_compiler.compile(_WARMUP_SOURCE)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Worker warm-up failed: {e}")
+
+
+def _run_in_worker(method: str, config: Dict[str, Any], args: Tuple, kwargs: Dict[str, Any]) -> Tuple[Any, int, Dict[str, Any]]:
+    """Run a ModernCompiler method with a per-request config inside a worker.
+
+    Returns:
+        Tuple of (method result, worker pid, worker cache stats)
+    """
+    compiler = _worker_compiler
+    result = getattr(compiler, method)(*args, config=config, **kwargs)
+    return result, os.getpid(), compiler.cache_stats()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class CompilePool:
+    """Dispatches compilations to a pool of worker processes.
+
+    Every worker owns its own warmed ModernCompiler (and IRExecutor), so
+    requests never share compiler state and compile throughput scales with
+    the number of cores instead of serializing on the GIL.
+    """
+
+    def __init__(self, workers: Optional[int] = None, config: Optional[Dict[str, Any]] = None,
+                 start_method: Optional[str] = None):
+        """Initialize the pool and start its workers.
+
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            config: Base compiler configuration for every worker
+            start_method: multiprocessing start method; defaults to 'fork'
+                where available so workers inherit already-imported modules
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers or os.cpu_count() or 1
+        self.config = dict(config or {})
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.start_method = start_method
+        self._lock = threading.Lock()
+        self._worker_stats: Dict[int, Dict[str, Any]] = {}
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker,
+            initargs=(self.config,),
+        )
+        # Start every worker up front so warm-up is not paid by the first requests
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        self.logger.info(f"Started {self.workers} compile workers ({self.start_method})")
+        return executor
+
+    def _submit(self, method: str, config: Optional[Dict[str, Any]], *args, **kwargs) -> Any:
+        return self._result(*self._submit_async(method, config, *args, **kwargs))
+
+    def _submit_async(self, method: str, config: Optional[Dict[str, Any]], *args, **kwargs) -> Tuple[Future, ProcessPoolExecutor]:
+        with self._lock:
+            executor = self._executor
+        future = executor.submit(_run_in_worker, method, dict(config or {}), args, kwargs)
+        return future, executor
+
+    def _result(self, future: Future, executor: ProcessPoolExecutor) -> Any:
+        try:
+            result, pid, cache_stats = future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. the JIT'd program crashed); replace the pool
+            self.logger.error("Compile worker pool broke, restarting workers")
+            with self._lock:
+                if self._executor is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._worker_stats.clear()
+                    self._executor = self._create_executor()
+            raise RuntimeError("Compile worker terminated unexpectedly")
+        with self._lock:
+            self._worker_stats[pid] = cache_stats
+        return result
+
+    def compile(self, source: str, config: Optional[Dict[str, Any]] = None, execute: bool = False) -> str:
+        """Compile source in a worker and return the formatted IR."""
+        return self._submit('compile', config, source, execute=execute)
+
+    def compile_and_execute(self, source: str, config: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """Compile and run source in a worker (see ModernCompiler.compile_and_execute)."""
+        return self._submit('compile_and_execute', config, source, **kwargs)
+
+    def run_batch(self, source: str, cases: List[Any], config: Optional[Dict[str, Any]] = None,
+                  optimization_level: int = 0) -> Dict[str, Any]:
+        """Compile source once, then run its test cases in parallel across workers.
+
+        One worker compiles the program to bitcode; the cases are split into
+        contiguous chunks, and each worker JITs the bitcode once and runs its
+        chunk (see ModernCompiler.run_batch).
+        """
+        from simple_compiler import record_run_timings, summarize_batch
+        from ir.ir_optimizer import IROptimizer
+        from profiling import StageTimer
+
+        optimization_level = IROptimizer.clamp_level(optimization_level)
+        bitcode, compile_timings = self._submit('compile_bitcode', config, source, optimization_level)
+        chunk_size = max(1, -(-len(cases) // self.workers))
+        pending = [
+            self._submit_async('execute_cases', config, bitcode, cases[i:i + chunk_size], optimization_level)
+            for i in range(0, len(cases), chunk_size)
+        ]
+        results = []
+        for future, executor in pending:
+            results.extend(self._result(future, executor))
+        timer = StageTimer()
+        timer.merge(compile_timings)
+        record_run_timings(timer, results)
+        return summarize_batch(results, optimization_level, timer.as_dict())
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregate the cache counters last reported by each worker, per cache."""
+        with self._lock:
+            reports = list(self._worker_stats.values())
+        aggregated: Dict[str, Dict[str, Any]] = {}
+        for report in reports:
+            for cache_name, stats in report.items():
+                totals = aggregated.setdefault(cache_name, {})
+                for key, value in stats.items():
+                    if key in ('hit_rate', 'avg_fork_ms', 'mean_ms', 'fallback_rate', 'speedup'):
+                        continue
+                    if key in _SHARED_CACHE_FIELDS:
+                        # Describes an on-disk cache every worker shares
+                        totals[key] = max(totals.get(key, 0), value)
+                    else:
+                        totals[key] = totals.get(key, 0) + value
+        for totals in aggregated.values():
+            if 'hits' in totals:
+                lookups = totals['hits'] + totals.get('misses', 0)
+                totals['hit_rate'] = round(totals['hits'] / lookups * 100, 2) if lookups else 0
+            if totals.get('forks'):
+                totals['avg_fork_ms'] = round(totals['fork_time_ms'] / totals['forks'], 3)
+            if 'll_fallbacks' in totals:
+                totals['fallback_rate'] = round(totals['ll_fallbacks'] / totals['parses'] * 100, 2) if totals['parses'] else 0
+            if totals.get('warm_ms'):
+                totals['speedup'] = round(totals['cold_ms'] / totals['warm_ms'], 2)
+            if 'total_ms' in totals:
+                totals['mean_ms'] = round(totals['total_ms'] / totals['calls'], 3) if totals['calls'] else 0
+            totals['workers'] = self.workers
+        return aggregated
+
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        with self._lock:
+            self._executor.shutdown(wait=True, cancel_futures=True)
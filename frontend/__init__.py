@@ -2,16 +2,32 @@
 
 from .parser.c_parser import CParser
 from .ast.nodes import *
-from typing import Dict, Type, Optional, List
+from typing import Any, Callable, Dict, Iterable, Type, Optional, List, Set, Tuple
 from abc import ABC, abstractmethod
+from importlib.machinery import ModuleSpec
 from pathlib import Path
+import hashlib
 import importlib
+import importlib.util
 import pkgutil
 import logging
+import sys
+import threading
+import time
+
+from compile_cache import LRUCache, fingerprint
 
 class FrontendPlugin(ABC):
     """Base class for frontend plugins."""
     
+    # Plugins that only hook into the preprocessor set this to False so
+    # process_source does not run an extra pass over the whole text
+    text_pass = True
+    
+    # Pure plugins promise that process() output depends only on the input
+    # text and the config passed to initialize(), so it can be memoized
+    pure = False
+    
     @abstractmethod
     def initialize(self, config: Dict) -> None:
         """Initialize the plugin with configuration."""
@@ -26,83 +42,209 @@ class FrontendPlugin(ABC):
     def get_name(self) -> str:
         """Get the plugin name."""
         pass
+    
+    def get_directives(self) -> Dict[str, Callable[[Any, str], Optional[str]]]:
+        """Extra preprocessor directives: name -> handler(preprocessor, arguments).
+        
+        The handler returns text to emit in place of the directive, or None.
+        """
+        return {}
+    
+    def get_macros(self) -> Dict[str, Any]:
+        """Extra predefined macros: name -> replacement text, or a callable returning it at each use."""
+        return {}
 
 class PluginManager:
-    """Manages frontend plugins."""
+    """Manages frontend plugins.
+
+    Discovery runs once per process for each plugin directory, and plugin
+    modules are only imported when the plugins are first needed. Each
+    plugin is re-initialized only when the config it sees changes, and the
+    time spent in every plugin is recorded.
+    """
+    
+    BUILTIN_PLUGINS = ("preprocessor", "parser", "ast")
     
-    def __init__(self):
-        self.plugins: Dict[str, FrontendPlugin] = {}
+    def __init__(self, output_cache_size: int = 256):
+        """Initialize the manager.
+        
+        Args:
+            output_cache_size: Maximum number of pure plugin outputs memoized
+        """
+        self._plugins: Dict[str, FrontendPlugin] = {}
+        # Discovered plugin modules not imported yet: (module name, spec or None for a package module)
+        self._pending: List[Tuple[str, Optional[ModuleSpec]]] = []
+        self._discovered: Set[str] = set()
+        # Plugin name -> fingerprint of the config it was last initialized with
+        self._initialized: Dict[str, str] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        # (plugin name, config fingerprint, input hash) -> output of a pure plugin
+        self.output_cache = LRUCache(output_cache_size)
+        self._lock = threading.RLock()
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def plugins(self) -> Dict[str, FrontendPlugin]:
+        """Registered plugins, importing discovered plugin modules on first access."""
+        if self._pending:
+            self._import_pending()
+        return self._plugins
+    
     def load_plugins(self, plugin_path: Optional[str] = None) -> None:
-        """Load plugins from the specified path or default location."""
+        """Discover plugins in the specified path or default location.
+        
+        Repeated calls for an already scanned path are free; modules are
+        imported lazily (see plugins).
+        """
         if plugin_path is None:
             plugin_path = str(Path(__file__).parent / "plugins")
         
-        # Load built-in plugins
-        self._load_builtin_plugins()
-        
-        # Load external plugins
-        self._load_external_plugins(plugin_path)
-    
-    def _load_builtin_plugins(self) -> None:
-        """Load built-in plugins."""
-        builtin_plugins = [
-            "preprocessor",
-            "parser",
-            "ast",
-        ]
-        
-        for plugin_name in builtin_plugins:
-            try:
-                module = importlib.import_module(f"frontend.{plugin_name}")
-                if hasattr(module, "Plugin"):
-                    plugin_class = getattr(module, "Plugin")
-                    if isinstance(plugin_class, type) and issubclass(plugin_class, FrontendPlugin):
-                        plugin_instance = plugin_class()
-                        self.register_plugin(plugin_instance)
-            except ImportError as e:
-                self.logger.warning(f"Failed to load built-in plugin {plugin_name}: {e}")
+        with self._lock:
+            # Built-in plugins
+            if '<builtin>' not in self._discovered:
+                self._discovered.add('<builtin>')
+                self._pending.extend((f"frontend.{name}", None) for name in self.BUILTIN_PLUGINS)
+            
+            # External plugins
+            if plugin_path not in self._discovered:
+                self._discovered.add(plugin_path)
+                self._discover_external_plugins(plugin_path)
     
-    def _load_external_plugins(self, plugin_path: str) -> None:
-        """Load external plugins from the specified path."""
+    def _discover_external_plugins(self, plugin_path: str) -> None:
+        """Find plugin modules in the specified path without importing them."""
         try:
             for finder, name, _ in pkgutil.iter_modules([plugin_path]):
+                spec = finder.find_spec(name)
+                if spec is None:
+                    self.logger.warning(f"Failed to load plugin {name}: no module spec")
+                    continue
+                self._pending.append((name, spec))
+        except Exception as e:
+            self.logger.warning(f"Failed to load plugins from {plugin_path}: {e}")
+    
+    def _import_pending(self) -> None:
+        """Import discovered plugin modules and register their Plugin classes."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            for name, spec in pending:
                 try:
-                    module = finder.find_module(name).load_module(name)
-                    if hasattr(module, "Plugin"):
-                        plugin_class = getattr(module, "Plugin")
-                        if isinstance(plugin_class, type) and issubclass(plugin_class, FrontendPlugin):
-                            plugin_instance = plugin_class()
-                            self.register_plugin(plugin_instance)
+                    if spec is None:
+                        module = importlib.import_module(name)
+                    else:
+                        module = importlib.util.module_from_spec(spec)
+                        sys.modules[name] = module
+                        spec.loader.exec_module(module)
+                    plugin_class = getattr(module, "Plugin", None)
+                    if isinstance(plugin_class, type) and issubclass(plugin_class, FrontendPlugin):
+                        self.register_plugin(plugin_class())
                 except Exception as e:
+                    if spec is not None:
+                        sys.modules.pop(name, None)
                     self.logger.warning(f"Failed to load plugin {name}: {e}")
-        except Exception as e:
-            self.logger.warning(f"Failed to load plugins from {plugin_path}: {e}")
     
     def register_plugin(self, plugin: FrontendPlugin) -> None:
         """Register a new plugin."""
         name = plugin.get_name()
-        if name in self.plugins:
-            self.logger.warning(f"Plugin {name} already registered, overwriting")
-        self.plugins[name] = plugin
+        with self._lock:
+            if name in self._plugins:
+                self.logger.warning(f"Plugin {name} already registered, overwriting")
+            self._plugins[name] = plugin
+            self._initialized.pop(name, None)
         self.logger.info(f"Registered plugin: {name}")
     
     def get_plugin(self, name: str) -> Optional[FrontendPlugin]:
         """Get a plugin by name."""
         return self.plugins.get(name)
     
+    def initialize_plugins(self, config: Dict, plugins: Optional[List[FrontendPlugin]] = None) -> None:
+        """Initialize plugins whose config changed since their last initialization.
+        
+        Args:
+            config: Compiler configuration
+            plugins: Plugins to consider (default: all registered plugins)
+        """
+        self._initialize(self.plugins.values() if plugins is None else plugins, config, fingerprint(config))
+    
+    def _initialize(self, plugins: Iterable[FrontendPlugin], config: Dict, key: str) -> None:
+        for plugin in plugins:
+            name = plugin.get_name()
+            if self._initialized.get(name) == key:
+                continue
+            with self._lock:
+                if self._initialized.get(name) == key:
+                    continue
+                start = time.perf_counter_ns()
+                try:
+                    plugin.initialize(config)
+                except Exception as e:
+                    self._entry(name)['errors'] += 1
+                    self.logger.error(f"Plugin {name} failed to initialize: {e}")
+                    raise
+                entry = self._entry(name)
+                entry['initializations'] += 1
+                entry['init_ms'] += (time.perf_counter_ns() - start) / 1e6
+                self._initialized[name] = key
+    
     def process_source(self, source: str, config: Dict) -> str:
-        """Process source code through all registered plugins."""
+        """Process source code through all registered plugins that need a text pass.
+        
+        Pure plugins are skipped when their output for the same input and
+        config is still in the output cache.
+        """
+        text_plugins = [plugin for plugin in self.plugins.values() if plugin.text_pass]
+        if not text_plugins:
+            return source
+        config_key = fingerprint(config)
+        self._initialize(text_plugins, config, config_key)
         processed = source
-        for plugin in self.plugins.values():
+        for plugin in text_plugins:
+            name = plugin.get_name()
+            cache_key = None
+            if plugin.pure:
+                cache_key = (name, config_key, hashlib.sha256(processed.encode('utf-8')).hexdigest())
+                cached = self.output_cache.get(cache_key)
+                if cached is not None:
+                    with self._lock:
+                        self._entry(name)['cache_hits'] += 1
+                    processed = cached
+                    continue
+            start = time.perf_counter_ns()
             try:
-                plugin.initialize(config)
                 processed = plugin.process(processed)
             except Exception as e:
-                self.logger.error(f"Plugin {plugin.get_name()} failed: {e}")
+                self._entry(name)['errors'] += 1
+                self.logger.error(f"Plugin {name} failed: {e}")
                 raise
+            finally:
+                elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+                with self._lock:
+                    entry = self._entry(name)
+                    entry['calls'] += 1
+                    entry['total_ms'] += elapsed_ms
+            if cache_key is not None:
+                self.output_cache.put(cache_key, processed)
         return processed
+    
+    def _entry(self, name: str) -> Dict[str, Any]:
+        return self._stats.setdefault(name, {'calls': 0, 'total_ms': 0.0, 'cache_hits': 0,
+                                             'initializations': 0, 'init_ms': 0.0, 'errors': 0})
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-plugin call counts and time spent processing and initializing, in milliseconds.
+        
+        calls counts actual process() runs; cache_hits counts pure plugin
+        runs answered from the output cache.
+        """
+        with self._lock:
+            return {
+                name: {
+                    **entry,
+                    'total_ms': round(entry['total_ms'], 3),
+                    'init_ms': round(entry['init_ms'], 3),
+                    'mean_ms': round(entry['total_ms'] / entry['calls'], 3) if entry['calls'] else 0,
+                }
+                for name, entry in self._stats.items()
+            }
 
 # Create a global plugin manager instance
 plugin_manager = PluginManager()
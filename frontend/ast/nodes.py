@@ -1,58 +1,70 @@
-import logging
-from dataclasses import dataclass
-from typing import List, Optional, Union, Any
+from dataclasses import dataclass, fields
+from typing import Iterator, List, Optional, Union, Any
 from enum import Enum
 
+# Nodes are slotted dataclasses: no per-instance __dict__, and construction
+# runs only the generated __init__. Type checks are opt-in (see validate_tree).
+
 class Node:
     """Base class for all AST nodes."""
-    def __init__(self, *args, **kwargs):
-        self.logger = logging.getLogger(__name__)
-        self.logger.debug(f"Creating {self.__class__.__name__} node")
-        super().__init__()
-        self._validate()
-
-    def _validate(self):
-        """Validate the node's state."""
-        self.logger.debug(f"Validating {self.__class__.__name__} node")
-        if not hasattr(self, '__class__'):
-            raise TypeError("Node must have a class")
-        if not isinstance(self, Node):
-            raise TypeError(f"Expected Node instance, got {type(self)}")
+    __slots__ = ()
+
+    def validate(self) -> None:
+        """Check this node's fields, running each class's _validate from the base down.
+
+        Raises:
+            TypeError: If a field has the wrong type
+            ValueError: If a field has an invalid value
+        """
+        for klass in reversed(type(self).__mro__):
+            check = klass.__dict__.get('_validate')
+            if check is not None:
+                check(self)
+
+    def children(self) -> Iterator['Node']:
+        """Yield the nodes held in this node's fields, including inside lists."""
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, Node):
+                yield value
+            elif isinstance(value, list):
+                yield from (item for item in value if isinstance(item, Node))
 
 class Expression(Node):
     """Base class for all expressions."""
-    def __init__(self, *args, **kwargs):
-        self.logger = logging.getLogger(__name__)
-        self.logger.debug(f"Creating Expression node: {self.__class__.__name__}")
-        super().__init__(*args, **kwargs)
-
-    def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating Expression node: {self.__class__.__name__}")
+    __slots__ = ()
 
 class Statement(Node):
     """Base class for all statements."""
-    def __init__(self, *args, **kwargs):
-        self.logger = logging.getLogger(__name__)
-        self.logger.debug(f"Creating Statement node: {self.__class__.__name__}")
-        super().__init__(*args, **kwargs)
-
-    def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating Statement node: {self.__class__.__name__}")
+    __slots__ = ()
 
 class Declaration(Node):
     """Base class for all declarations."""
-    def __init__(self, *args, **kwargs):
-        self.logger = logging.getLogger(__name__)
-        self.logger.debug(f"Creating Declaration node: {self.__class__.__name__}")
-        super().__init__(*args, **kwargs)
-
-    def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating Declaration node: {self.__class__.__name__}")
-
-@dataclass
+    __slots__ = ()
+
+def validate_tree(root: Node) -> int:
+    """Validate every node reachable from root.
+
+    Args:
+        root: The root of the tree, usually a TranslationUnit
+
+    Returns:
+        The number of nodes validated
+
+    Raises:
+        TypeError: If a node has a field of the wrong type
+        ValueError: If a node has an invalid field value
+    """
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        node.validate()
+        count += 1
+        stack.extend(node.children())
+    return count
+
+@dataclass(slots=True)
 class Type(Node):
     """Represents a C type."""
     name: str
@@ -62,8 +74,6 @@ class Type(Node):
     pointer_depth: int = 0
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating Type node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"Type name must be a string, got {type(self.name)}")
         if not isinstance(self.is_const, bool):
@@ -75,95 +85,79 @@ class Type(Node):
         if not isinstance(self.pointer_depth, int):
             raise TypeError(f"pointer_depth must be an integer, got {type(self.pointer_depth)}")
 
-@dataclass
+@dataclass(slots=True)
 class Identifier(Expression):
     """Represents an identifier."""
     name: str
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating Identifier node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"Identifier name must be a string, got {type(self.name)}")
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expression):
     """Base class for all literal values."""
     value: Any
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating Literal node: {self.value}")
         if self.value is None:
             raise ValueError("Literal value cannot be None")
 
-@dataclass
+@dataclass(slots=True)
 class IntegerLiteral(Literal):
     """Represents an integer literal."""
     value: int
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating IntegerLiteral node: {self.value}")
         if not isinstance(self.value, int):
             raise TypeError(f"IntegerLiteral value must be an integer, got {type(self.value)}")
 
-@dataclass
+@dataclass(slots=True)
 class FloatLiteral(Literal):
     """Represents a floating-point literal."""
     value: float
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating FloatLiteral node: {self.value}")
         if not isinstance(self.value, float):
             raise TypeError(f"FloatLiteral value must be a float, got {type(self.value)}")
 
-@dataclass
+@dataclass(slots=True)
 class DoubleLiteral(Literal):
     """Represents a double-precision floating-point literal."""
     value: float
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating DoubleLiteral node: {self.value}")
         if not isinstance(self.value, float):
             raise TypeError(f"DoubleLiteral value must be a float, got {type(self.value)}")
 
-@dataclass
+@dataclass(slots=True)
 class StringLiteral(Literal):
     """Represents a string literal."""
     value: str
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating StringLiteral node: {self.value}")
         if not isinstance(self.value, str):
             raise TypeError(f"StringLiteral value must be a string, got {type(self.value)}")
 
-@dataclass
+@dataclass(slots=True)
 class CharLiteral(Literal):
     """Represents a character literal."""
     value: str
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating CharLiteral node: {self.value}")
         if not isinstance(self.value, str) or len(self.value) != 1:
             raise TypeError(f"CharLiteral value must be a single character string, got {self.value}")
 
-@dataclass
+@dataclass(slots=True)
 class BooleanLiteral(Literal):
     """Represents a boolean literal."""
     value: bool
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating BooleanLiteral node: {self.value}")
         if not isinstance(self.value, bool):
             raise TypeError(f"BooleanLiteral value must be a boolean, got {type(self.value)}")
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOp(Expression):
     """Represents a binary operation."""
     op: str
@@ -171,8 +165,6 @@ class BinaryOp(Expression):
     right: Expression
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating BinaryOp node: {self.op}")
         if not isinstance(self.op, str):
             raise TypeError(f"BinaryOp operator must be a string, got {type(self.op)}")
         if not isinstance(self.left, Expression):
@@ -180,29 +172,25 @@ class BinaryOp(Expression):
         if not isinstance(self.right, Expression):
             raise TypeError(f"BinaryOp right operand must be an Expression, got {type(self.right)}")
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOp(Expression):
     """Represents a unary operation."""
     op: str
     operand: Expression
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating UnaryOp node: {self.op}")
         if not isinstance(self.op, str):
             raise TypeError(f"UnaryOp operator must be a string, got {type(self.op)}")
         if not isinstance(self.operand, Expression):
             raise TypeError(f"UnaryOp operand must be an Expression, got {type(self.operand)}")
 
-@dataclass
+@dataclass(slots=True)
 class FunctionCall(Expression):
     """Represents a function call."""
     function: Expression
     arguments: List[Expression]
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating FunctionCall node: {self.function}")
         if not isinstance(self.function, Expression):
             raise TypeError(f"FunctionCall function must be an Expression, got {type(self.function)}")
         if not isinstance(self.arguments, list):
@@ -211,7 +199,7 @@ class FunctionCall(Expression):
             if not isinstance(arg, Expression):
                 raise TypeError(f"FunctionCall argument must be an Expression, got {type(arg)}")
 
-@dataclass
+@dataclass(slots=True)
 class VariableDecl(Declaration):
     """Represents a variable declaration."""
     name: str
@@ -219,8 +207,6 @@ class VariableDecl(Declaration):
     init: Optional[Expression] = None
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating VariableDecl node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"VariableDecl name must be a string, got {type(self.name)}")
         if not isinstance(self.type, Type):
@@ -228,21 +214,19 @@ class VariableDecl(Declaration):
         if self.init is not None and not isinstance(self.init, Expression):
             raise TypeError(f"VariableDecl init must be an Expression or None, got {type(self.init)}")
 
-@dataclass
+@dataclass(slots=True)
 class Parameter(Declaration):
     """Represents a function parameter."""
     name: str
     type: Type
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating Parameter node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"Parameter name must be a string, got {type(self.name)}")
         if not isinstance(self.type, Type):
             raise TypeError(f"Parameter type must be a Type, got {type(self.type)}")
 
-@dataclass
+@dataclass(slots=True)
 class FunctionDecl(Declaration):
     """Represents a function declaration."""
     name: str
@@ -251,8 +235,6 @@ class FunctionDecl(Declaration):
     body: Optional['CompoundStmt'] = None
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating FunctionDecl node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"FunctionDecl name must be a string, got {type(self.name)}")
         if not isinstance(self.return_type, Type):
@@ -265,43 +247,37 @@ class FunctionDecl(Declaration):
         if self.body is not None and not isinstance(self.body, CompoundStmt):
             raise TypeError(f"FunctionDecl body must be a CompoundStmt or None, got {type(self.body)}")
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStmt(Statement):
     """Represents a return statement."""
     value: Optional[Expression] = None
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating ReturnStmt node")
         if self.value is not None and not isinstance(self.value, Expression):
             raise TypeError(f"ReturnStmt value must be an Expression or None, got {type(self.value)}")
 
-@dataclass
+@dataclass(slots=True)
 class ExpressionStmt(Statement):
     """Represents an expression statement."""
     expr: Expression
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating ExpressionStmt node")
         if not isinstance(self.expr, Expression):
             raise TypeError(f"ExpressionStmt expr must be an Expression, got {type(self.expr)}")
 
-@dataclass
+@dataclass(slots=True)
 class CompoundStmt(Statement):
     """Represents a compound statement (block)."""
     statements: List[Union[Statement, Declaration]]
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating CompoundStmt node")
         if not isinstance(self.statements, list):
             raise TypeError(f"CompoundStmt statements must be a list, got {type(self.statements)}")
         for stmt in self.statements:
             if not isinstance(stmt, (Statement, Declaration)):
                 raise TypeError(f"CompoundStmt statement must be a Statement or Declaration, got {type(stmt)}")
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt(Statement):
     """Represents an if statement."""
     condition: Expression
@@ -309,8 +285,6 @@ class IfStmt(Statement):
     else_branch: Optional[Statement] = None
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating IfStmt node")
         if not isinstance(self.condition, Expression):
             raise TypeError(f"IfStmt condition must be an Expression, got {type(self.condition)}")
         if not isinstance(self.then_branch, Statement):
@@ -318,21 +292,19 @@ class IfStmt(Statement):
         if self.else_branch is not None and not isinstance(self.else_branch, Statement):
             raise TypeError(f"IfStmt else_branch must be a Statement or None, got {type(self.else_branch)}")
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmt(Statement):
     """Represents a while statement."""
     condition: Expression
     body: Statement
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating WhileStmt node")
         if not isinstance(self.condition, Expression):
             raise TypeError(f"WhileStmt condition must be an Expression, got {type(self.condition)}")
         if not isinstance(self.body, Statement):
             raise TypeError(f"WhileStmt body must be a Statement, got {type(self.body)}")
 
-@dataclass
+@dataclass(slots=True)
 class ForStmt(Statement):
     """Represents a for statement."""
     init: Optional[Union[Expression, Declaration]]
@@ -341,8 +313,6 @@ class ForStmt(Statement):
     body: Statement
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating ForStmt node")
         if self.init is not None and not isinstance(self.init, (Expression, Declaration)):
             raise TypeError(f"ForStmt init must be an Expression, Declaration, or None, got {type(self.init)}")
         if self.condition is not None and not isinstance(self.condition, Expression):
@@ -352,29 +322,25 @@ class ForStmt(Statement):
         if not isinstance(self.body, Statement):
             raise TypeError(f"ForStmt body must be a Statement, got {type(self.body)}")
 
-@dataclass
+@dataclass(slots=True)
 class TranslationUnit(Node):
     """Represents a complete C source file."""
     declarations: List[Declaration]
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating TranslationUnit node")
         if not isinstance(self.declarations, list):
             raise TypeError(f"TranslationUnit declarations must be a list, got {type(self.declarations)}")
         for decl in self.declarations:
             if not isinstance(decl, Declaration):
                 raise TypeError(f"TranslationUnit declaration must be a Declaration, got {type(decl)}")
 
-@dataclass
+@dataclass(slots=True)
 class StructDecl(Declaration):
     """Represents a struct declaration."""
     name: str
     fields: List[VariableDecl]
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating StructDecl node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"StructDecl name must be a string, got {type(self.name)}")
         if not isinstance(self.fields, list):
@@ -383,27 +349,23 @@ class StructDecl(Declaration):
             if not isinstance(field, VariableDecl):
                 raise TypeError(f"StructDecl field must be a VariableDecl, got {type(field)}")
 
-@dataclass
+@dataclass(slots=True)
 class MemberAccess(Expression):
     """Represents member access in a struct."""
     base: Expression
     member: str
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating MemberAccess node: {self.member}")
         if not isinstance(self.member, str):
             raise TypeError(f"MemberAccess member must be a string, got {type(self.member)}")
 
-@dataclass
+@dataclass(slots=True)
 class UnionDecl(Declaration):
     """Represents a union declaration."""
     name: str
     fields: List[VariableDecl]
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating UnionDecl node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"UnionDecl name must be a string, got {type(self.name)}")
         if not isinstance(self.fields, list):
@@ -412,15 +374,13 @@ class UnionDecl(Declaration):
             if not isinstance(field, VariableDecl):
                 raise TypeError(f"UnionDecl field must be a VariableDecl, got {type(field)}")
 
-@dataclass
+@dataclass(slots=True)
 class EnumDecl(Declaration):
     """Represents an enum declaration."""
     name: str
     values: List[str]
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating EnumDecl node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"EnumDecl name must be a string, got {type(self.name)}")
         if not isinstance(self.values, list):
@@ -429,21 +389,19 @@ class EnumDecl(Declaration):
             if not isinstance(value, str):
                 raise TypeError(f"EnumDecl value must be a string, got {type(value)}")
 
-@dataclass
+@dataclass(slots=True)
 class TypedefDecl(Declaration):
     """Represents a typedef declaration."""
     name: str
     type: Type
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating TypedefDecl node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"TypedefDecl name must be a string, got {type(self.name)}")
         if not isinstance(self.type, Type):
             raise TypeError(f"TypedefDecl type must be a Type, got {type(self.type)}")
 
-@dataclass
+@dataclass(slots=True)
 class ArrayDecl(Declaration):
     """Represents an array declaration."""
     name: str
@@ -452,8 +410,6 @@ class ArrayDecl(Declaration):
     init: Optional[Expression] = None
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating ArrayDecl node: {self.name}")
         if not isinstance(self.name, str):
             raise TypeError(f"ArrayDecl name must be a string, got {type(self.name)}")
         if not isinstance(self.type, Type):
@@ -463,15 +419,13 @@ class ArrayDecl(Declaration):
         if self.init is not None and not isinstance(self.init, Expression):
             raise TypeError(f"ArrayDecl init must be an Expression or None, got {type(self.init)}")
 
-@dataclass
+@dataclass(slots=True)
 class FunctionPointer(Expression):
     """Represents a function pointer."""
     return_type: Type
     param_types: List[Type]
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating FunctionPointer node")
         if not isinstance(self.return_type, Type):
             raise TypeError(f"FunctionPointer return_type must be a Type, got {type(self.return_type)}")
         if not isinstance(self.param_types, list):
@@ -480,35 +434,31 @@ class FunctionPointer(Expression):
             if not isinstance(param_type, Type):
                 raise TypeError(f"FunctionPointer param_type must be a Type, got {type(param_type)}")
 
-@dataclass
+@dataclass(slots=True)
 class ArrayIndex(Expression):
     """Represents array indexing (a[i])."""
     array: Expression
     index: Expression
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating ArrayIndex node: {self.array}[{self.index}]")
         if not isinstance(self.array, Expression):
             raise TypeError(f"ArrayIndex array must be an Expression, got {type(self.array)}")
         if not isinstance(self.index, Expression):
             raise TypeError(f"ArrayIndex index must be an Expression, got {type(self.index)}")
 
-@dataclass
+@dataclass(slots=True)
 class DoWhileStmt(Statement):
     """Represents a do-while statement."""
     body: Statement
     condition: Expression
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating DoWhileStmt node")
         if not isinstance(self.body, Statement):
             raise TypeError(f"DoWhileStmt body must be a Statement, got {type(self.body)}")
         if not isinstance(self.condition, Expression):
             raise TypeError(f"DoWhileStmt condition must be an Expression, got {type(self.condition)}")
 
-@dataclass
+@dataclass(slots=True)
 class SwitchStmt(Statement):
     """Represents a switch statement."""
     expression: Expression
@@ -516,8 +466,6 @@ class SwitchStmt(Statement):
     default: Optional['CaseStmt'] = None
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating SwitchStmt node")
         if not isinstance(self.expression, Expression):
             raise TypeError(f"SwitchStmt expression must be an Expression, got {type(self.expression)}")
         if not isinstance(self.cases, list):
@@ -525,29 +473,25 @@ class SwitchStmt(Statement):
         if self.default is not None and not isinstance(self.default, CaseStmt):
             raise TypeError(f"SwitchStmt default must be a CaseStmt or None, got {type(self.default)}")
 
-@dataclass
+@dataclass(slots=True)
 class CaseStmt(Statement):
     """Represents a case in a switch statement."""
     value: Optional[Expression]  # None for default
     body: Statement
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating CaseStmt node")
         if self.value is not None and not isinstance(self.value, Expression):
             raise TypeError(f"CaseStmt value must be an Expression or None, got {type(self.value)}")
         if not isinstance(self.body, Statement):
             raise TypeError(f"CaseStmt body must be a Statement, got {type(self.body)}")
 
-@dataclass
+@dataclass(slots=True)
 class StructPointerAccess(Expression):
     """Represents pointer access to a struct member (a->b)."""
     base: Expression
     member: str
 
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating StructPointerAccess node: {self.base}->{self.member}")
         if not isinstance(self.base, Expression):
             raise TypeError(f"StructPointerAccess base must be an Expression, got {type(self.base)}")
         if not isinstance(self.member, str):
@@ -559,28 +503,24 @@ class StorageClass(Enum):
     EXTERN = 'extern'
     REGISTER = 'register'
 
-@dataclass
+@dataclass(slots=True)
 class CastExpr(Expression):
     """Represents an explicit type cast."""
     target_type: Type
     expr: Expression
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating CastExpr node: ({self.target_type}){self.expr}")
         if not isinstance(self.target_type, Type):
             raise TypeError(f"CastExpr target_type must be a Type, got {type(self.target_type)}")
         if not isinstance(self.expr, Expression):
             raise TypeError(f"CastExpr expr must be an Expression, got {type(self.expr)}")
 
-@dataclass
+@dataclass(slots=True)
 class TernaryOp(Expression):
     """Represents a ternary (?:) operator."""
     condition: Expression
     true_expr: Expression
     false_expr: Expression
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating TernaryOp node")
         if not isinstance(self.condition, Expression):
             raise TypeError(f"TernaryOp condition must be an Expression, got {type(self.condition)}")
         if not isinstance(self.true_expr, Expression):
@@ -588,39 +528,33 @@ class TernaryOp(Expression):
         if not isinstance(self.false_expr, Expression):
             raise TypeError(f"TernaryOp false_expr must be an Expression, got {type(self.false_expr)}")
 
-@dataclass
+@dataclass(slots=True)
 class SizeofExpr(Expression):
     """Represents a sizeof expression."""
     expr: Expression
     def _validate(self):
-        super()._validate()
-        self.logger.debug("Validating SizeofExpr node")
         if not isinstance(self.expr, Expression):
             raise TypeError(f"SizeofExpr expr must be an Expression, got {type(self.expr)}")
 
-@dataclass
+@dataclass(slots=True)
 class IncrementOp(Expression):
     """Represents ++ or -- (prefix or postfix)."""
     op: str
     expr: Expression
     is_postfix: bool = False
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating IncrementOp node: {self.op}{self.expr}")
         if not isinstance(self.op, str):
             raise TypeError(f"IncrementOp op must be a string, got {type(self.op)}")
         if not isinstance(self.expr, Expression):
             raise TypeError(f"IncrementOp expr must be an Expression, got {type(self.expr)}")
 
-@dataclass
+@dataclass(slots=True)
 class BitwiseOp(Expression):
     """Represents a bitwise operation (&, |, ^, ~, <<, >>)."""
     op: str
     left: Expression
     right: Optional[Expression] = None
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating BitwiseOp node: {self.op}")
         if not isinstance(self.op, str):
             raise TypeError(f"BitwiseOp op must be a string, got {type(self.op)}")
         if not isinstance(self.left, Expression):
@@ -628,15 +562,13 @@ class BitwiseOp(Expression):
         if self.right is not None and not isinstance(self.right, Expression):
             raise TypeError(f"BitwiseOp right must be an Expression or None, got {type(self.right)}")
 
-@dataclass
+@dataclass(slots=True)
 class AssignmentOp(Expression):
     """Represents a compound assignment (+=, -=, etc.)."""
     op: str
     left: Expression
     right: Expression
     def _validate(self):
-        super()._validate()
-        self.logger.debug(f"Validating AssignmentOp node: {self.op}")
         if not isinstance(self.op, str):
             raise TypeError(f"AssignmentOp op must be a string, got {type(self.op)}")
         if not isinstance(self.left, Expression):
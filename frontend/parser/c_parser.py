@@ -1,10 +1,27 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 import logging
+import time
 from antlr4 import *
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorListener import ConsoleErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 from ..grammar.CParser import CParser as AntlrCParser
 from ..grammar.CLexer import CLexer
 from ..grammar.CListener import CListener
 from ..ast.nodes import *
+from .char_stream import ChunkedCharStream
+
+# Event-by-event trace of the AST builder, emitted only when this logger is
+# enabled for DEBUG. Its level is left to the application's logging config:
+# set 'frontend.parser.trace' to INFO to keep it quiet under a DEBUG root.
+_trace = logging.getLogger('frontend.parser.trace')
+
+# Result of the first CParser.warm_up in this process. The lexer and parser
+# DFA caches are class attributes of the generated recognizers, so one
+# warm-up serves every parser in the process and in processes forked from it.
+_warm_up_stats: Optional[Dict[str, Any]] = None
 
 class ASTBuilder(CListener):
     """Builds AST from ANTLR parse tree."""
@@ -15,6 +32,8 @@ class ASTBuilder(CListener):
         self.node_stack = []
         self.expr_stack = []
         self.logger = logging.getLogger(__name__)
+        # Checked once per parse so disabled tracing costs one attribute test per event
+        self.tracing = _trace.isEnabledFor(logging.DEBUG)
     
     def safe_pop(self, stack):
         if stack:
@@ -22,7 +41,7 @@ class ASTBuilder(CListener):
         return None
     
     def warn(self, msg):
-        print(f"[AI-Compiler WARNING] {msg}")
+        self.logger.warning(msg)
 
     def enterCompilationUnit(self, ctx):
         """Enter a parse tree produced by CParser.compilationUnit."""
@@ -133,7 +152,8 @@ class ASTBuilder(CListener):
     
     def enterCompoundStatement(self, ctx):
         """Enter a parse tree produced by CParser.compoundStatement."""
-        print("=== ENTERING COMPOUND STATEMENT ===")
+        if self.tracing:
+            _trace.debug("=== ENTERING COMPOUND STATEMENT ===")
         compound = CompoundStmt(statements=[])
         if isinstance(self.current_node, FunctionDecl):
             self.current_node.body = compound
@@ -148,14 +168,16 @@ class ASTBuilder(CListener):
                 self.current_node.else_branch = compound
         self.node_stack.append(self.current_node)
         self.current_node = compound
-        print(f"Set current_node to CompoundStmt, node_stack length: {len(self.node_stack)}")    
+        if self.tracing:
+            _trace.debug(f"Set current_node to CompoundStmt, node_stack length: {len(self.node_stack)}")
     def exitCompoundStatement(self, ctx):
         """Exit a parse tree produced by CParser.compoundStatement."""
         self.current_node = self.safe_pop(self.node_stack)
     
     def enterDeclaration(self, ctx):
         """Enter a parse tree produced by CParser.declaration."""
-        print(f"=== ENTERING DECLARATION: {ctx.getText()} ===")
+        if self.tracing:
+            _trace.debug(f"=== ENTERING DECLARATION: {ctx.getText()} ===")
         
         # Get type from declaration specifiers
         type_name = 'int'  # Default to int
@@ -163,7 +185,8 @@ class ASTBuilder(CListener):
         for child in ctx.declarationSpecifiers().getChildren():
             if isinstance(child, AntlrCParser.TypeSpecifierContext):
                 type_spec_text = child.getText()
-                print(f"Found type specifier: {type_spec_text}")
+                if self.tracing:
+                    _trace.debug(f"Found type specifier: {type_spec_text}")
                 # Handle struct declarations
                 if type_spec_text.startswith('struct'):
                     type_name = type_spec_text  # e.g., "structPoint" or "struct Point"
@@ -171,22 +194,27 @@ class ASTBuilder(CListener):
                     type_name = type_spec_text.replace('*', '').strip()
                 pointer_depth = type_spec_text.count('*')
                 break        
-        print(f"Determined type name: {type_name}")
+        if self.tracing:
+            _trace.debug(f"Determined type name: {type_name}")
         
         # Check if there's an initDeclaratorList
         has_init_decl_list = ctx.initDeclaratorList() is not None
-        print(f"Has initDeclaratorList: {has_init_decl_list}")
+        if self.tracing:
+            _trace.debug(f"Has initDeclaratorList: {has_init_decl_list}")
         if ctx.initDeclaratorList():
-            print(f"initDeclaratorList text: {ctx.initDeclaratorList().getText()}")
+            if self.tracing:
+                _trace.debug(f"initDeclaratorList text: {ctx.initDeclaratorList().getText()}")
         
         # Process each declarator
         if ctx.initDeclaratorList():
-            print(f"Found initDeclaratorList with {len(ctx.initDeclaratorList().initDeclarator())} declarators")
+            if self.tracing:
+                _trace.debug(f"Found initDeclaratorList with {len(ctx.initDeclaratorList().initDeclarator())} declarators")
             for init_decl in ctx.initDeclaratorList().initDeclarator():
                 decl = init_decl.declarator()
                 if decl and decl.directDeclarator() and decl.directDeclarator().Identifier():
                     var_name = decl.directDeclarator().Identifier().getText()
-                    print(f"Creating variable: {var_name} of type {type_name}")
+                    if self.tracing:
+                        _trace.debug(f"Creating variable: {var_name} of type {type_name}")
                     var_decl = VariableDecl(
                         name=var_name,
                         type=Type(name=type_name, is_pointer=(pointer_depth > 0), pointer_depth=pointer_depth),
@@ -200,13 +228,16 @@ class ASTBuilder(CListener):
                     
                     if isinstance(self.current_node, CompoundStmt):
                         self.current_node.statements.append(var_decl)
-                        print(f"Added variable declaration: {var_name} of type {type_name} to CompoundStmt")
+                        if self.tracing:
+                            _trace.debug(f"Added variable declaration: {var_name} of type {type_name} to CompoundStmt")
                     else:
-                        print(f"Current node is not CompoundStmt, it's: {type(self.current_node)}")
+                        if self.tracing:
+                            _trace.debug(f"Current node is not CompoundStmt, it's: {type(self.current_node)}")
         else:
             # Handle declarations without initDeclaratorList (like pure struct declarations)
             # This case is handled by struct parsing methods
-            print(f"Declaration without initDeclaratorList: {type_name}")
+            if self.tracing:
+                _trace.debug(f"Declaration without initDeclaratorList: {type_name}")
     
     def enterInitializer(self, ctx):
         """Enter a parse tree produced by CParser.initializer."""
@@ -225,23 +256,28 @@ class ASTBuilder(CListener):
     
     def enterReturnStatement(self, ctx):
         """Enter a parse tree produced by CParser.returnStatement."""
-        print(f"Entering return statement: {ctx.getText()}")
+        if self.tracing:
+            _trace.debug(f"Entering return statement: {ctx.getText()}")
         # Create a new stack frame for the return expression
         self.expr_stack.append([])
     
     def exitReturnStatement(self, ctx):
         """Exit a parse tree produced by CParser.returnStatement."""
-        print(f"Exiting return statement: {ctx.getText()}")
+        if self.tracing:
+            _trace.debug(f"Exiting return statement: {ctx.getText()}")
         if ctx.expression():  # Only process if there's an expression
             expr_list = self.safe_pop(self.expr_stack)
             expr = expr_list[-1] if expr_list and isinstance(expr_list, list) and expr_list else None
-            print(f"Return expression: {expr}")
+            if self.tracing:
+                _trace.debug(f"Return expression: {expr}")
             if expr:
                 return_stmt = ReturnStmt(expr)
                 if isinstance(self.current_node, CompoundStmt):
-                    print(f"Adding return statement to compound: {return_stmt}")
+                    if self.tracing:
+                        _trace.debug(f"Adding return statement to compound: {return_stmt}")
                     self.current_node.statements.append(return_stmt)
-                    print(f"Current compound statements: {self.current_node.statements}")
+                    if self.tracing:
+                        _trace.debug(f"Current compound statements: {self.current_node.statements}")
         else:
             return_stmt = ReturnStmt(None)
             if isinstance(self.current_node, CompoundStmt):
@@ -249,12 +285,14 @@ class ASTBuilder(CListener):
     
     def enterExpression(self, ctx):
         """Enter a parse tree produced by CParser.expression."""
-        print(f"Entering expression: {ctx.getText()}")
+        if self.tracing:
+            _trace.debug(f"Entering expression: {ctx.getText()}")
         self.expr_stack.append([])
     
     def exitExpression(self, ctx):
         """Exit a parse tree produced by CParser.expression."""
-        print(f"Exiting expression: {ctx.getText()}")
+        if self.tracing:
+            _trace.debug(f"Exiting expression: {ctx.getText()}")
         if self.expr_stack:
             if len(ctx.children) > 1:
                 exprs = []
@@ -276,25 +314,30 @@ class ASTBuilder(CListener):
                 else:
                     self.expr_stack[-1].append(expr)
             self.safe_pop(self.expr_stack)
-        print(f"Expression stack after exit: {self.expr_stack}")
+        if self.tracing:
+            _trace.debug(f"Expression stack after exit: {self.expr_stack}")
     
     def enterPrimaryExpression(self, ctx):
         """Enter a parse tree produced by CParser.primaryExpression."""
-        print(f"Entering primary expression: {ctx.getText()}")
-        text = ctx.getText()
+        if self.tracing:
+            _trace.debug(f"Entering primary expression: {ctx.getText()}")
         if ctx.Identifier():
             # Handle identifier
             name = ctx.Identifier().getText()
-            print(f"Found identifier: {name}")
+            if self.tracing:
+                _trace.debug(f"Found identifier: {name}")
             identifier = Identifier(name=name)
-            print(f"Added identifier to stack: {identifier}")
+            if self.tracing:
+                _trace.debug(f"Added identifier to stack: {identifier}")
             if self.expr_stack:
                 self.expr_stack[-1].append(identifier)
-                print(f"Current expression stack: {self.expr_stack}")
+                if self.tracing:
+                    _trace.debug(f"Current expression stack: {self.expr_stack}")
         elif ctx.Constant():
             # Handle constant (both integers and floating-point)
             constant_text = ctx.Constant().getText()
-            print(f"Found constant: {constant_text}")
+            if self.tracing:
+                _trace.debug(f"Found constant: {constant_text}")
               # Try to determine if it's a float or int
             if '.' in constant_text or 'e' in constant_text.lower() or 'f' in constant_text.lower():
                 # It's a floating-point number
@@ -303,42 +346,51 @@ class ASTBuilder(CListener):
                 # Determine precision based on suffix
                 if constant_text.lower().endswith('f'):
                     # Single precision float
-                    print(f"Creating FloatLiteral for: {constant_text}")
+                    if self.tracing:
+                        _trace.debug(f"Creating FloatLiteral for: {constant_text}")
                     literal = FloatLiteral(value=value)
                 else:
                     # Default to double precision for literals without 'f' suffix
-                    print(f"Creating DoubleLiteral for: {constant_text}")
+                    if self.tracing:
+                        _trace.debug(f"Creating DoubleLiteral for: {constant_text}")
                     literal = DoubleLiteral(value=value)
             else:
                 # It's an integer
                 value = int(constant_text)
                 literal = IntegerLiteral(value=value)
             
-            print(f"Added literal to stack: {literal}")
+            if self.tracing:
+                _trace.debug(f"Added literal to stack: {literal}")
             if self.expr_stack:
                 self.expr_stack[-1].append(literal)
-                print(f"Current expression stack: {self.expr_stack}")
+                if self.tracing:
+                    _trace.debug(f"Current expression stack: {self.expr_stack}")
         elif ctx.StringLiteral():
             # Handle string literal
             value = ctx.StringLiteral().getText()
             # Remove quotes
             value = value[1:-1]  # Remove first and last quote
-            print(f"Found string literal: {value}")
+            if self.tracing:
+                _trace.debug(f"Found string literal: {value}")
             # Create a StringLiteral
             literal = StringLiteral(value=value)
-            print(f"Added string literal to stack: {literal}")
+            if self.tracing:
+                _trace.debug(f"Added string literal to stack: {literal}")
             if self.expr_stack:
                 self.expr_stack[-1].append(literal)
-                print(f"Current expression stack: {self.expr_stack}")
+                if self.tracing:
+                    _trace.debug(f"Current expression stack: {self.expr_stack}")
     
     def exitPrimaryExpression(self, ctx):
         """Exit a parse tree produced by CParser.primaryExpression."""
-        print(f"Exiting primary expression: {ctx.getText()}")
-        print(f"Current expression stack: {self.expr_stack}")
+        if self.tracing:
+            _trace.debug(f"Exiting primary expression: {ctx.getText()}")
+            _trace.debug(f"Current expression stack: {self.expr_stack}")
     
     def enterAdditiveExpression(self, ctx):
         """Enter a parse tree produced by CParser.additiveExpression."""
-        print(f"Entering additive expression: {ctx.getText()}")
+        if self.tracing:
+            _trace.debug(f"Entering additive expression: {ctx.getText()}")
         if not self.expr_stack:
             self.expr_stack.append([])
     
@@ -351,7 +403,8 @@ class ASTBuilder(CListener):
                     right = self.expr_stack[-1].pop()
                     left = self.expr_stack[-1].pop()
                     binary_op = BinaryOp(op=op, left=left, right=right)
-                    print(f"Created additive op: {binary_op}")
+                    if self.tracing:
+                        _trace.debug(f"Created additive op: {binary_op}")
                     self.expr_stack[-1].append(binary_op)
     
     def enterMultiplicativeExpression(self, ctx):
@@ -368,7 +421,8 @@ class ASTBuilder(CListener):
                     left = self.expr_stack[-1].pop()
                     # Create binary operation
                     binary_op = BinaryOp(op=op, left=left, right=right)
-                    print(f"Created multiplicative op: {binary_op}")
+                    if self.tracing:
+                        _trace.debug(f"Created multiplicative op: {binary_op}")
                     if len(self.expr_stack) > 1:
                         self.expr_stack[-2].append(binary_op)
                     else:
@@ -436,7 +490,8 @@ class ASTBuilder(CListener):
                         return
                     # For all other functions, including swap, create the FunctionCall node
                     func_call = FunctionCall(function=func, arguments=args)
-                    print(f"Created function call: {func_call}")
+                    if self.tracing:
+                        _trace.debug(f"Created function call: {func_call}")
                     if len(self.expr_stack) > 1:
                         self.expr_stack[-2].append(func_call)
                     else:
@@ -456,7 +511,8 @@ class ASTBuilder(CListener):
                             base=object_expr,
                             member=member_name
                         )
-                        print(f"Created member access: {member_access}")
+                        if self.tracing:
+                            _trace.debug(f"Created member access: {member_access}")
                         
                         if len(self.expr_stack) > 1:
                             self.expr_stack[-2].append(member_access)
@@ -495,25 +551,30 @@ class ASTBuilder(CListener):
 
     def enterJumpStatement(self, ctx):
         """Enter a parse tree produced by CParser.jumpStatement."""
-        print(f"Entering jump statement: {ctx.getText()}")
+        if self.tracing:
+            _trace.debug(f"Entering jump statement: {ctx.getText()}")
         if ctx.getChild(0).getText() == 'return':
             # Create a new stack frame for the return expression
             self.expr_stack.append([])
     
     def exitJumpStatement(self, ctx):
         """Exit a parse tree produced by CParser.jumpStatement."""
-        print(f"Exiting jump statement: {ctx.getText()}")
+        if self.tracing:
+            _trace.debug(f"Exiting jump statement: {ctx.getText()}")
         if ctx.getChild(0).getText() == 'return':
             if ctx.expression():  # Only process if there's an expression
                 expr_list = self.safe_pop(self.expr_stack)
                 expr = expr_list[-1] if expr_list and isinstance(expr_list, list) and expr_list else None
-                print(f"Return expression: {expr}")
+                if self.tracing:
+                    _trace.debug(f"Return expression: {expr}")
                 if expr:
                     return_stmt = ReturnStmt(value=expr)
                     if isinstance(self.current_node, CompoundStmt):
-                        print(f"Adding return statement to compound: {return_stmt}")
+                        if self.tracing:
+                            _trace.debug(f"Adding return statement to compound: {return_stmt}")
                         self.current_node.statements.append(return_stmt)
-                        print(f"Current compound statements: {self.current_node.statements}")
+                        if self.tracing:
+                            _trace.debug(f"Current compound statements: {self.current_node.statements}")
             else:
                 # Handle void return
                 return_stmt = ReturnStmt(value=None)
@@ -529,7 +590,8 @@ class ASTBuilder(CListener):
                     right = self.expr_stack[-1].pop()
                     left = self.expr_stack[-1].pop()
                     binary_op = BinaryOp(op=op, left=left, right=right)
-                    print(f"Created relational op: {binary_op}")
+                    if self.tracing:
+                        _trace.debug(f"Created relational op: {binary_op}")
                     self.expr_stack[-1].append(binary_op)
 
     def enterIfStatement(self, ctx):
@@ -673,7 +735,8 @@ class ASTBuilder(CListener):
             func = exprs[0]
             args = exprs[1:] if len(exprs) > 1 else []
             func_call = FunctionCall(function=func, arguments=args)
-            print(f"Created function call: {func_call}")
+            if self.tracing:
+                _trace.debug(f"Created function call: {func_call}")
             self.expr_stack[-1].append(func_call)
 
     def enterStatement(self, ctx):
@@ -793,21 +856,27 @@ class ASTBuilder(CListener):
                     self.logger.debug(f"Added struct field: {field_name} of type {self.current_struct_type}")
     def enterBlockItem(self, ctx):
         """Enter a parse tree produced by CParser.blockItem."""
-        print(f"=== ENTERING BLOCK ITEM: {ctx.getText()} ===")
+        if self.tracing:
+            _trace.debug(f"=== ENTERING BLOCK ITEM: {ctx.getText()} ===")
         # Block items can be declarations or statements
         if ctx.declaration():
-            print(f"Block item is a DECLARATION: {ctx.declaration().getText()}")
+            if self.tracing:
+                _trace.debug(f"Block item is a DECLARATION: {ctx.declaration().getText()}")
             # Don't manually trigger - let ANTLR's tree walking handle it
         elif ctx.statement():
-            print(f"Block item is a STATEMENT: {ctx.statement().getText()}")
+            if self.tracing:
+                _trace.debug(f"Block item is a STATEMENT: {ctx.statement().getText()}")
         else:
-            print(f"Block item is UNKNOWN type")
+            if self.tracing:
+                _trace.debug(f"Block item is UNKNOWN type")
         
     def enterBlockItemList(self, ctx):
         """Enter a parse tree produced by CParser.blockItemList."""
-        print(f"=== ENTERING BLOCK ITEM LIST ===")
+        if self.tracing:
+            _trace.debug(f"=== ENTERING BLOCK ITEM LIST ===")
         if ctx.blockItem():
-            print(f"Found {len(ctx.blockItem())} block items")
+            if self.tracing:
+                _trace.debug(f"Found {len(ctx.blockItem())} block items")
     
     def enterUnaryExpression(self, ctx):
         """Enter a parse tree produced by CParser.unaryExpression."""
@@ -840,12 +909,14 @@ class ASTBuilder(CListener):
     
     def enterUnaryOperator(self, ctx):
         """Enter a parse tree produced by CParser.unaryOperator."""
-        print(f"Entering unary operator: {ctx.getText()}")
+        if self.tracing:
+            _trace.debug(f"Entering unary operator: {ctx.getText()}")
         # No action needed - just for debugging
     
     def exitUnaryOperator(self, ctx):
         """Exit a parse tree produced by CParser.unaryOperator."""
-        print(f"Exiting unary operator: {ctx.getText()}")
+        if self.tracing:
+            _trace.debug(f"Exiting unary operator: {ctx.getText()}")
         # No action needed - handled in exitUnaryExpression
 
     def exitCastExpression(self, ctx):
@@ -929,17 +1000,35 @@ class CParser:
         """
         self.config = config or {}
         self.logger = logging.getLogger(__name__)
+        # SLL prediction first, full LL only for inputs SLL cannot handle
+        self.two_stage = self.config.get('two_stage_parsing', True)
+        self.parses = 0
+        self.ll_fallbacks = 0
+        # Syntax errors go to the console unless turned off (as during warm-up)
+        self.report_errors = True
     
-    def parse(self, source_code: str) -> TranslationUnit:
-        """Parse C source code and return AST."""
+    def parse(self, source_code: Union[str, Iterable[str]]) -> TranslationUnit:
+        """Parse C source code and return AST.
+
+        source_code may also be an iterable of text chunks (such as
+        Preprocessor.iter_process output), which is lexed lazily.
+        """
         # Create lexer and parser
-        input_stream = InputStream(source_code)
-        lexer = CLexer(input_stream)
+        if isinstance(source_code, str):
+            input_stream = InputStream(source_code)
+            lexer = CLexer(input_stream)
+        else:
+            lexer = CLexer(ChunkedCharStream(source_code))
+            # The stream drops consumed text, so tokens keep their own copy
+            lexer._factory = CommonTokenFactory(copyText=True)
         token_stream = CommonTokenStream(lexer)
         parser = AntlrCParser(token_stream)
+        if not self.report_errors:
+            lexer.removeErrorListeners()
+            parser.removeErrorListeners()
         
         # Parse the input
-        tree = parser.compilationUnit()
+        tree = self._parse_tree(parser)
         
         # Build AST
         ast_builder = ASTBuilder()
@@ -948,6 +1037,85 @@ class CParser:
         
         return ast_builder.ast
     
+    def _parse_tree(self, parser: AntlrCParser):
+        """Run compilationUnit, trying SLL prediction with fail-fast errors first.
+
+        SLL is much cheaper than full LL and gives the same tree for nearly
+        every valid program. If it hits a syntax error (a real one, or an
+        ambiguity only LL resolves), the token stream is rewound and the
+        input is parsed again with LL prediction and normal error recovery
+        and reporting.
+        """
+        self.parses += 1
+        if not self.two_stage:
+            return parser.compilationUnit()
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        parser.removeErrorListeners()
+        try:
+            return parser.compilationUnit()
+        except ParseCancellationException:
+            self.ll_fallbacks += 1
+            self.logger.debug("SLL parse failed, retrying with full LL prediction")
+        parser.reset()  # also rewinds the token stream, which keeps every token
+        if self.report_errors:
+            parser.addErrorListener(ConsoleErrorListener.INSTANCE)
+        parser._errHandler = DefaultErrorStrategy()
+        parser._interp.predictionMode = PredictionMode.LL
+        return parser.compilationUnit()
+    
+    def warm_up(self, sources: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+        """Fill the shared lexer/parser DFA caches by parsing a corpus, once per process.
+
+        Every source is parsed twice: the first pass runs on cold (or
+        partly warmed) prediction caches, the second on the warmed ones, so
+        the two totals show what warm-up saves on the first requests.
+        Syntax errors in the corpus are not reported.
+
+        Args:
+            sources: (name, preprocessed source) pairs
+
+        Returns:
+            Number of sources parsed and cold/warm parse time in milliseconds
+        """
+        global _warm_up_stats
+        if _warm_up_stats is not None:
+            return _warm_up_stats
+        sources = list(sources)
+        parses, ll_fallbacks = self.parses, self.ll_fallbacks
+        timings = []
+        self.report_errors = False
+        try:
+            for _ in range(2):
+                start = time.perf_counter_ns()
+                for name, source in sources:
+                    try:
+                        self.parse(source)
+                    except Exception as e:
+                        self.logger.warning(f"Parser warm-up failed on {name}: {e}")
+                timings.append((time.perf_counter_ns() - start) / 1e6)
+        finally:
+            # Warm-up parses are not traffic
+            self.parses, self.ll_fallbacks = parses, ll_fallbacks
+            self.report_errors = True
+        cold_ms, warm_ms = timings
+        _warm_up_stats = {
+            'sources': len(sources),
+            'cold_ms': round(cold_ms, 3),
+            'warm_ms': round(warm_ms, 3),
+            'speedup': round(cold_ms / warm_ms, 2) if warm_ms else 0,
+        }
+        self.logger.info(f"Parser warmed on {len(sources)} sources: {cold_ms:.1f} ms cold, {warm_ms:.1f} ms warm")
+        return _warm_up_stats
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return how many parses needed the full LL fallback."""
+        return {
+            'parses': self.parses,
+            'll_fallbacks': self.ll_fallbacks,
+            'fallback_rate': round(self.ll_fallbacks / self.parses * 100, 2) if self.parses else 0,
+        }
+    
     def _create_lexer(self, input_stream: InputStream):
         """Create a C lexer for the input stream."""
         # TODO: Implement C lexer creation
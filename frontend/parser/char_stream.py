@@ -0,0 +1,121 @@
+from typing import Dict, Iterable, Iterator, List
+from antlr4.Token import Token
+
+class ChunkedCharStream:
+    """ANTLR CharStream that pulls text chunks from an iterator on demand.
+
+    antlr4.InputStream needs the whole input as one string plus a list with
+    one int per character. This stream only holds the characters from the
+    oldest outstanding mark (the start of the token being lexed) onwards,
+    so peak memory is bounded by the chunk size instead of the input size.
+
+    Tokens must copy their text when they are created (use
+    CommonTokenFactory(copyText=True)): text that has been dropped cannot
+    be returned by getText.
+    """
+
+    __slots__ = ('name', '_chunks', '_text', '_data', '_offset', '_index', '_exhausted',
+                 '_marks', '_next_marker')
+
+    def __init__(self, chunks: Iterable[str], name: str = '<stream>'):
+        """Initialize the stream.
+
+        Args:
+            chunks: Text pieces, concatenated in order to form the input
+            name: Source name reported by the lexer
+        """
+        self.name = name
+        self._chunks: Iterator[str] = iter(chunks)
+        self._text = ''           # retained characters
+        self._data: List[int] = []  # their code points, for LA
+        self._offset = 0          # input index of _text[0]
+        self._index = 0
+        self._exhausted = False
+        self._marks: Dict[int, int] = {}
+        self._next_marker = 0
+
+    def _fill(self, position: int) -> bool:
+        """Load chunks until position is buffered; False if the input ends before it."""
+        while position >= self._offset + len(self._data):
+            if self._exhausted:
+                return False
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._exhausted = True
+                return False
+            if not chunk:
+                continue
+            self._trim()
+            self._text += chunk
+            self._data.extend(map(ord, chunk))
+        return True
+
+    def _trim(self) -> None:
+        """Drop characters before the oldest mark and the previous character (LA(-1))."""
+        floor = min(self._marks.values(), default=self._index) - 1
+        drop = floor - self._offset
+        # Only worth copying once a good part of the buffer is dead
+        if drop > 4096 and drop * 2 > len(self._data):
+            self._text = self._text[drop:]
+            del self._data[:drop]
+            self._offset += drop
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def size(self) -> int:
+        """Characters read so far (the full input length once exhausted)."""
+        return self._offset + len(self._data)
+
+    def reset(self) -> None:
+        self.seek(0)
+
+    def consume(self) -> None:
+        if self._index - self._offset >= len(self._data) and not self._fill(self._index):
+            raise Exception("cannot consume EOF")
+        self._index += 1
+
+    def LA(self, offset: int) -> int:
+        # Called for nearly every character the lexer looks at: keep the buffered path short
+        if offset > 0:
+            position = self._index + offset - 1
+        elif offset < 0:
+            position = self._index + offset  # LA(-1) is the previous character
+        else:
+            return 0  # undefined
+        relative = position - self._offset
+        if 0 <= relative < len(self._data):
+            return self._data[relative]
+        if relative < 0 or not self._fill(position):
+            return Token.EOF
+        return self._data[position - self._offset]
+
+    def LT(self, offset: int) -> int:
+        return self.LA(offset)
+
+    def mark(self) -> int:
+        marker = self._next_marker
+        self._next_marker += 1
+        self._marks[marker] = self._index
+        return marker
+
+    def release(self, marker: int) -> None:
+        self._marks.pop(marker, None)
+
+    def seek(self, index: int) -> None:
+        if index < self._offset:
+            raise ValueError(f"cannot seek to {index}: input before {self._offset} was released")
+        if index > self._index:
+            self._fill(index - 1)
+            index = min(index, self.size)
+        self._index = index
+
+    def getText(self, start: int, stop: int) -> str:
+        if start < self._offset:
+            raise ValueError(f"text at {start} was released; tokens must copy their text")
+        return self._text[start - self._offset:stop - self._offset + 1]
+
+    def __str__(self) -> str:
+        return self._text
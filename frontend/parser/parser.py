@@ -1,23 +1,62 @@
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+import logging
 from .c_parser import CParser
+from .rd_parser import ParseError, RecursiveDescentParser
+
+# Selectable with the frontend_engine config key
+ENGINES = ('antlr', 'rd')
 
 class Parser:
     """Wrapper class for the C parser."""
-    
-    def __init__(self):
-        """Initialize the parser."""
+
+    def __init__(self, engine: str = 'antlr'):
+        """Initialize the parser.
+
+        Args:
+            engine: 'antlr' for the ANTLR-generated parser, or 'rd' for the
+                recursive-descent parser, which hands anything it cannot
+                parse to the ANTLR parser
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown frontend engine {engine!r}; expected one of {', '.join(ENGINES)}")
+        self.logger = logging.getLogger(__name__)
+        self.engine = engine
         self._parser = CParser()
-    
-    def parse(self, source: str) -> Optional[object]:
+        self._rd_parser = RecursiveDescentParser() if engine == 'rd' else None
+        self.rd_parses = 0
+        self.rd_fallbacks = 0
+
+    def parse(self, source: Union[str, Iterable[str]]) -> Optional[object]:
         """Parse the given source code into an AST.
-        
+
         Args:
-            source: The source code to parse
-            
+            source: The source code to parse, or an iterable of chunks of it
+
         Returns:
             The root node of the AST if parsing succeeds, None otherwise
         """
+        if self._rd_parser is not None:
+            if not isinstance(source, str):
+                source = ''.join(source)
+            self.rd_parses += 1
+            try:
+                return self._rd_parser.parse(source)
+            except ParseError as e:
+                self.rd_fallbacks += 1
+                self.logger.debug(f"Recursive-descent parser gave up ({e}); using the ANTLR parser")
         try:
             return self._parser.parse(source)
         except Exception as e:
-            raise RuntimeError(f"Failed to parse source code: {str(e)}") 
\ No newline at end of file
+            raise RuntimeError(f"Failed to parse source code: {str(e)}")
+
+    def warm_up(self, sources: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+        """Warm the shared parser caches on (name, source) pairs (see CParser.warm_up)."""
+        return self._parser.warm_up(sources)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return parse counters (see CParser.stats), plus fallbacks from the recursive-descent parser."""
+        stats = self._parser.stats()
+        if self._rd_parser is not None:
+            stats['rd_parses'] = self.rd_parses
+            stats['rd_fallbacks'] = self.rd_fallbacks
+        return stats
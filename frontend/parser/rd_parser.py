@@ -0,0 +1,506 @@
+from typing import Iterable, List, Optional, Tuple, Union
+import codecs
+import logging
+import re
+
+from ..ast.nodes import *
+
+# One alternative per token class; 'skip' covers whitespace, comments and leftover # lines
+_TOKEN_RE = re.compile(r'''
+    (?P<skip>[ \t\r\n\f\v]+|//[^\n]*|/\*.*?\*/|\#[^\n]*)
+  | (?P<num>(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)[uUlLfF]*)
+  | (?P<char>L?'(?:\\.|[^'\\\n])+')
+  | (?P<str>L?"(?:\\.|[^"\\\n])*")
+  | (?P<id>[A-Za-z_]\w*)
+  | (?P<op>\.\.\.|<<=|>>=|->|\+\+|--|<<|>>|<=|>=|==|!=|&&|\|\||[-+*/%&|^]=|[-+*/%<>=!~&|^?:;,.(){}\[\]])
+  | (?P<bad>.)
+''', re.VERBOSE | re.DOTALL)
+
+_KEYWORDS = frozenset((
+    'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do', 'double', 'else', 'enum',
+    'extern', 'float', 'for', 'goto', 'if', 'inline', 'int', 'long', 'register', 'restrict', 'return',
+    'short', 'signed', 'sizeof', 'static', 'struct', 'switch', 'typedef', 'union', 'unsigned', 'void',
+    'volatile', 'while', '_Bool',
+))
+_TYPE_SPECIFIERS = frozenset(('void', 'char', 'short', 'int', 'long', 'float', 'double', 'signed', 'unsigned', '_Bool'))
+_QUALIFIERS = frozenset(('const', 'volatile', 'restrict'))
+_STORAGE = frozenset(('static', 'extern', 'auto', 'register', 'inline'))
+# Tokens that can start a declaration
+_DECLARATION_START = _TYPE_SPECIFIERS | _QUALIFIERS | _STORAGE | {'struct', 'union', 'enum', 'typedef'}
+
+# Binary operators: precedence (higher binds tighter, all left associative) and node class
+_BINARY = {
+    '||': (4, BinaryOp), '&&': (5, BinaryOp),
+    '|': (6, BitwiseOp), '^': (7, BitwiseOp), '&': (8, BitwiseOp),
+    '==': (9, BinaryOp), '!=': (9, BinaryOp),
+    '<': (10, BinaryOp), '>': (10, BinaryOp), '<=': (10, BinaryOp), '>=': (10, BinaryOp),
+    '<<': (11, BitwiseOp), '>>': (11, BitwiseOp),
+    '+': (12, BinaryOp), '-': (12, BinaryOp),
+    '*': (13, BinaryOp), '/': (13, BinaryOp),
+}
+_ASSIGNMENT = frozenset(('=', '+=', '-=', '*=', '/=', '&=', '|=', '^=', '<<=', '>>='))
+_TERNARY_PRECEDENCE = 2
+_ASSIGNMENT_PRECEDENCE = 1
+_UNARY = frozenset(('&', '*', '+', '-', '~', '!'))
+# Constructs the ANTLR AST builder turns into a different tree (it drops
+# control-flow statements and their bodies, and the IR generator has no %).
+# They are left to the ANTLR parser so both engines compile the same program.
+_ANTLR_DIVERGENT = frozenset(('if', 'while', 'do', 'for', '%', '%='))
+
+class ParseError(Exception):
+    """Raised for input the recursive-descent parser does not accept.
+
+    This covers syntax errors as well as valid C outside the supported
+    subset; callers fall back to the ANTLR parser, which reports errors.
+    """
+
+def _tokenize(source: str) -> Tuple[List[str], List[str], List[int]]:
+    """Split source into parallel lists of token kinds, texts and line numbers.
+
+    Operators and keywords are their own kind; everything else is 'id',
+    'num', 'char' or 'str'. The lists end with an 'eof' token.
+    """
+    kinds: List[str] = []
+    texts: List[str] = []
+    lines: List[int] = []
+    line = 1
+    for match in _TOKEN_RE.finditer(source):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'skip':
+            line += text.count('\n')
+            continue
+        if kind == 'bad':
+            raise ParseError(f"line {line}: unexpected character {text!r}")
+        if kind == 'op' or (kind == 'id' and text in _KEYWORDS):
+            kind = text
+        kinds.append(kind)
+        texts.append(text)
+        lines.append(line)
+    kinds.append('eof')
+    texts.append('')
+    lines.append(line)
+    return kinds, texts, lines
+
+def _number(text: str) -> Literal:
+    """Build the literal node for a numeric constant."""
+    lowered = text.lower()
+    if lowered.startswith('0x'):
+        return IntegerLiteral(value=int(lowered.rstrip('ul'), 16))
+    if '.' in text or 'e' in lowered or lowered.endswith('f'):
+        value = float(lowered.rstrip('fl'))
+        return FloatLiteral(value=value) if lowered.endswith('f') else DoubleLiteral(value=value)
+    digits = lowered.rstrip('ul')
+    return IntegerLiteral(value=int(digits, 8 if len(digits) > 1 and digits[0] == '0' else 10))
+
+def _char(text: str) -> IntegerLiteral:
+    """Character constants have type int in C."""
+    body = text[text.index("'") + 1:-1]
+    value = codecs.decode(body, 'unicode_escape') if '\\' in body else body
+    if len(value) != 1:
+        raise ParseError(f"multi-character constant {text}")
+    return IntegerLiteral(value=ord(value))
+
+class _Parser:
+    """Recursive-descent parser over one token list, with Pratt-style expressions."""
+
+    def __init__(self, source: str):
+        self.kinds, self.texts, self.lines = _tokenize(source)
+        self.pos = 0
+
+    # Token helpers
+
+    def error(self, message: str) -> ParseError:
+        return ParseError(f"line {self.lines[self.pos]}: {message}")
+
+    def expect(self, kind: str) -> str:
+        if self.kinds[self.pos] != kind:
+            found = self.texts[self.pos] or 'end of input'
+            raise self.error(f"expected '{kind}', found '{found}'")
+        text = self.texts[self.pos]
+        self.pos += 1
+        return text
+
+    def accept(self, kind: str) -> bool:
+        if self.kinds[self.pos] == kind:
+            self.pos += 1
+            return True
+        return False
+
+    def unsupported(self, what: str) -> ParseError:
+        return self.error(f"{what} is not supported")
+
+    # Declarations
+
+    def translation_unit(self) -> TranslationUnit:
+        declarations: List[Declaration] = []
+        while self.kinds[self.pos] != 'eof':
+            self.external_declaration(declarations)
+        return TranslationUnit(declarations=declarations)
+
+    def external_declaration(self, declarations: List[Declaration]) -> None:
+        base = self.specifiers(declarations)
+        if self.accept(';'):
+            return
+        name, depth, array_size, parameters = self.declarator()
+        if parameters is not None and self.kinds[self.pos] == '{':
+            return_type = Type(name=base.name, is_const=base.is_const, is_volatile=base.is_volatile,
+                               is_pointer=depth > 0, pointer_depth=depth)
+            declarations.append(FunctionDecl(name=name, return_type=return_type,
+                                             parameters=parameters, body=self.compound()))
+            return
+        # Prototypes and global variables produce no declarations, as with the ANTLR builder
+        while True:
+            if self.accept('='):
+                self.initializer()
+            if not self.accept(','):
+                break
+            self.declarator()
+        self.expect(';')
+
+    def at_declaration(self) -> bool:
+        return self.kinds[self.pos] in _DECLARATION_START
+
+    def specifiers(self, container: List) -> Type:
+        """Parse declaration specifiers into a base Type.
+
+        A struct or union definition among them is appended to container.
+        """
+        words: List[str] = []
+        is_const = is_volatile = False
+        tag = None
+        while True:
+            kind = self.kinds[self.pos]
+            if kind in _TYPE_SPECIFIERS:
+                words.append(kind)
+            elif kind in _QUALIFIERS:
+                is_const = is_const or kind == 'const'
+                is_volatile = is_volatile or kind == 'volatile'
+            elif kind in _STORAGE:
+                pass
+            elif kind in ('struct', 'union') and tag is None and not words:
+                self.pos += 1
+                tag = self.struct_or_union(kind, container)
+                continue
+            elif kind == 'typedef':
+                raise self.unsupported("typedef")
+            elif kind == 'enum':
+                raise self.unsupported("enum")
+            else:
+                break
+            self.pos += 1
+        if tag is not None:
+            name = tag
+        elif not words:
+            raise self.error(f"expected a type, found '{self.texts[self.pos] or 'end of input'}'")
+        else:
+            name = _type_name(words)
+        return Type(name=name, is_const=is_const, is_volatile=is_volatile)
+
+    def struct_or_union(self, keyword: str, container: List) -> str:
+        tag = self.expect('id') if self.kinds[self.pos] == 'id' else None
+        if self.accept('{'):
+            fields: List[VariableDecl] = []
+            while not self.accept('}'):
+                base = self.specifiers(container)
+                while True:
+                    name, depth, _, _ = self.declarator()
+                    fields.append(VariableDecl(name=name, type=Type(name=base.name, is_pointer=depth > 0,
+                                                                    pointer_depth=depth)))
+                    if not self.accept(','):
+                        break
+                self.expect(';')
+            if tag is None:
+                raise self.unsupported(f"anonymous {keyword}")
+            node_class = StructDecl if keyword == 'struct' else UnionDecl
+            container.append(node_class(name=tag, fields=fields))
+        elif tag is None:
+            raise self.error(f"expected {keyword} name")
+        return f"{keyword} {tag}"
+
+    def declarator(self, abstract: bool = False) -> Tuple[str, int, Optional[int], Optional[List[Parameter]]]:
+        """Parse a declarator.
+
+        Returns:
+            (name or '' if abstract, pointer depth, array size or None,
+            parameters if it declares a function, else None)
+        """
+        depth = 0
+        while self.accept('*'):
+            depth += 1
+            while self.kinds[self.pos] in _QUALIFIERS:
+                self.pos += 1
+        if self.kinds[self.pos] == 'id':
+            name = self.texts[self.pos]
+            self.pos += 1
+        elif self.kinds[self.pos] == '(' and not abstract:
+            raise self.unsupported("parenthesized declarator")
+        elif abstract:
+            name = ''
+        else:
+            raise self.error(f"expected a name, found '{self.texts[self.pos] or 'end of input'}'")
+        array_size = None
+        parameters = None
+        if self.accept('['):
+            size = self.conditional() if self.kinds[self.pos] != ']' else None
+            self.expect(']')
+            array_size = size.value if isinstance(size, IntegerLiteral) else 0
+            if self.kinds[self.pos] == '[':
+                raise self.unsupported("multi-dimensional array")
+        elif self.accept('('):
+            parameters = self.parameters()
+        return name, depth, array_size, parameters
+
+    def parameters(self) -> List[Parameter]:
+        parameters: List[Parameter] = []
+        if self.accept(')'):
+            return parameters
+        if self.kinds[self.pos] == 'void' and self.kinds[self.pos + 1] == ')':
+            self.pos += 2
+            return parameters
+        while True:
+            if self.accept('...'):
+                break
+            base = self.specifiers(parameters)
+            name, depth, array_size, _ = self.declarator(abstract=True)
+            if array_size is not None:
+                depth += 1  # array parameters are pointers
+            parameters.append(Parameter(name=name, type=Type(name=base.name, is_const=base.is_const,
+                                                             is_volatile=base.is_volatile,
+                                                             is_pointer=depth > 0, pointer_depth=depth)))
+            if not self.accept(','):
+                break
+        self.expect(')')
+        return parameters
+
+    def local_declaration(self, statements: List) -> None:
+        base = self.specifiers(statements)
+        if self.accept(';'):
+            return
+        while True:
+            statements.append(self.init_declarator(base))
+            if not self.accept(','):
+                break
+        self.expect(';')
+
+    def init_declarator(self, base: Type) -> Declaration:
+        name, depth, array_size, parameters = self.declarator()
+        if parameters is not None:
+            raise self.unsupported("local function declaration")
+        if array_size is not None:
+            if self.kinds[self.pos] == '=':
+                raise self.unsupported("array initializer")
+            return ArrayDecl(name=name, type=Type(name=base.name), size=array_size)
+        init = self.initializer() if self.accept('=') else None
+        return VariableDecl(name=name, type=Type(name=base.name, is_const=base.is_const, is_volatile=base.is_volatile,
+                                                 is_pointer=depth > 0, pointer_depth=depth), init=init)
+
+    def initializer(self) -> Expression:
+        if self.kinds[self.pos] == '{':
+            raise self.unsupported("initializer list")
+        return self.expression(_ASSIGNMENT_PRECEDENCE)
+
+    # Statements
+
+    def compound(self) -> CompoundStmt:
+        self.expect('{')
+        statements: List = []
+        while not self.accept('}'):
+            if self.at_declaration():
+                self.local_declaration(statements)
+            else:
+                statement = self.statement()
+                if statement is not None:
+                    statements.append(statement)
+        return CompoundStmt(statements=statements)
+
+    def statement(self) -> Optional[Statement]:
+        kind = self.kinds[self.pos]
+        if kind == '{':
+            return self.compound()
+        if kind == ';':
+            self.pos += 1
+            return None
+        if kind == 'return':
+            self.pos += 1
+            value = None if self.kinds[self.pos] == ';' else self.full_expression()
+            self.expect(';')
+            return ReturnStmt(value=value)
+        if kind in _ANTLR_DIVERGENT:
+            raise self.unsupported(f"'{kind}'")
+        if kind in ('break', 'continue', 'goto', 'switch', 'case', 'default'):
+            raise self.unsupported(f"'{kind}'")
+        expr = self.full_expression()
+        self.expect(';')
+        return ExpressionStmt(expr=expr)
+
+    # Expressions
+
+    def full_expression(self) -> Expression:
+        expr = self.expression(_ASSIGNMENT_PRECEDENCE)
+        if self.kinds[self.pos] == ',':
+            raise self.unsupported("comma operator")
+        return expr
+
+    def conditional(self) -> Expression:
+        return self.expression(_TERNARY_PRECEDENCE)
+
+    def expression(self, min_precedence: int) -> Expression:
+        """Precedence climbing over binary, conditional and assignment operators."""
+        left = self.unary()
+        kinds = self.kinds
+        while True:
+            kind = kinds[self.pos]
+            if kind in _ANTLR_DIVERGENT:
+                raise self.unsupported(f"'{kind}'")
+            binary = _BINARY.get(kind)
+            if binary is not None:
+                precedence, node_class = binary
+                if precedence < min_precedence:
+                    return left
+                self.pos += 1
+                left = node_class(op=kind, left=left, right=self.expression(precedence + 1))
+            elif kind == '?':
+                if _TERNARY_PRECEDENCE < min_precedence:
+                    return left
+                self.pos += 1
+                true_expr = self.full_expression()
+                self.expect(':')
+                left = TernaryOp(condition=left, true_expr=true_expr, false_expr=self.expression(_TERNARY_PRECEDENCE))
+            elif kind in _ASSIGNMENT:
+                if _ASSIGNMENT_PRECEDENCE < min_precedence:
+                    return left
+                self.pos += 1
+                # Right associative
+                right = self.expression(_ASSIGNMENT_PRECEDENCE)
+                if kind == '=':
+                    left = BinaryOp(op=kind, left=left, right=right)
+                else:
+                    left = AssignmentOp(op=kind, left=left, right=right)
+            else:
+                return left
+
+    def unary(self) -> Expression:
+        kind = self.kinds[self.pos]
+        if kind in _UNARY:
+            self.pos += 1
+            return UnaryOp(op=kind, operand=self.unary())
+        if kind == '++' or kind == '--':
+            self.pos += 1
+            return IncrementOp(op=kind, expr=self.unary(), is_postfix=False)
+        if kind == 'sizeof':
+            self.pos += 1
+            if self.kinds[self.pos] == '(' and self.kinds[self.pos + 1] in _DECLARATION_START:
+                raise self.unsupported("sizeof(type)")
+            return SizeofExpr(expr=self.unary())
+        if kind == '(' and self.kinds[self.pos + 1] in _DECLARATION_START:
+            self.pos += 1
+            base = self.specifiers([])
+            _, depth, _, _ = self.declarator(abstract=True)
+            self.expect(')')
+            target = Type(name=base.name, is_pointer=depth > 0, pointer_depth=depth)
+            return CastExpr(target_type=target, expr=self.unary())
+        return self.postfix(self.primary())
+
+    def postfix(self, expr: Expression) -> Expression:
+        kinds = self.kinds
+        while True:
+            kind = kinds[self.pos]
+            if kind == '(':
+                self.pos += 1
+                arguments: List[Expression] = []
+                if not self.accept(')'):
+                    while True:
+                        arguments.append(self.expression(_ASSIGNMENT_PRECEDENCE))
+                        if not self.accept(','):
+                            break
+                    self.expect(')')
+                if isinstance(expr, Identifier) and expr.name in ('malloc', 'free'):
+                    raise self.unsupported(f"'{expr.name}'")
+                expr = FunctionCall(function=expr, arguments=arguments)
+            elif kind == '[':
+                self.pos += 1
+                index = self.full_expression()
+                self.expect(']')
+                expr = ArrayIndex(array=expr, index=index)
+            elif kind == '.':
+                self.pos += 1
+                expr = MemberAccess(base=expr, member=self.expect('id'))
+            elif kind == '->':
+                self.pos += 1
+                expr = StructPointerAccess(base=expr, member=self.expect('id'))
+            elif kind == '++' or kind == '--':
+                self.pos += 1
+                expr = IncrementOp(op=kind, expr=expr, is_postfix=True)
+            else:
+                return expr
+
+    def primary(self) -> Expression:
+        kind = self.kinds[self.pos]
+        text = self.texts[self.pos]
+        if kind == 'id':
+            self.pos += 1
+            return Identifier(name=text)
+        if kind == 'num':
+            self.pos += 1
+            return _number(text)
+        if kind == 'char':
+            self.pos += 1
+            return _char(text)
+        if kind == 'str':
+            # Adjacent string literals are concatenated (still escaped, like the ANTLR builder)
+            parts = []
+            while self.kinds[self.pos] == 'str':
+                literal = self.texts[self.pos]
+                parts.append(literal[literal.index('"') + 1:-1])
+                self.pos += 1
+            return StringLiteral(value=''.join(parts))
+        if kind == '(':
+            self.pos += 1
+            expr = self.full_expression()
+            self.expect(')')
+            return expr
+        raise self.error(f"expected an expression, found '{text or 'end of input'}'")
+
+def _type_name(words: List[str]) -> str:
+    """Collapse type specifier words (e.g. 'unsigned long int') to one IR type name."""
+    core = [word for word in words if word not in ('signed', 'unsigned')]
+    if 'long' in core and 'double' not in core:
+        return 'long'
+    if 'short' in core:
+        return 'short'
+    if '_Bool' in core:
+        return 'bool'
+    return core[-1] if core else 'int'
+
+class RecursiveDescentParser:
+    """Hand-written C parser that builds frontend.ast nodes directly.
+
+    Tokens come from a single regular expression and declarations and
+    statements are parsed by recursive descent, with expressions handled
+    by precedence climbing, so no parse tree is built and there is no
+    listener pass. It accepts the C subset the rest of the pipeline
+    supports and raises ParseError for anything else; Parser falls back to
+    the ANTLR parser in that case.
+
+    Constructs the ANTLR AST builder represents differently (if, while, do,
+    for and %) also raise ParseError, so whichever engine is selected, a
+    program compiles to the same code. The benchmark.py frontend suite
+    checks this on a shared corpus.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def parse(self, source_code: Union[str, Iterable[str]]) -> TranslationUnit:
+        """Parse C source code and return its AST.
+
+        Args:
+            source_code: Preprocessed source, or an iterable of chunks of it
+
+        Raises:
+            ParseError: On a syntax error or an unsupported construct
+        """
+        if not isinstance(source_code, str):
+            source_code = ''.join(source_code)
+        return _Parser(source_code).translation_unit()
@@ -0,0 +1,132 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import hashlib
+import logging
+import pickle
+import threading
+
+from compile_cache import LRUCache, cache_root, fingerprint, private_directory, read_private, write_private
+from .preprocessor.preprocessor import STDLIB_PATH
+
+# Entries are unpickled, so the directory must be private to the current user
+DEFAULT_PCH_DIR = cache_root() / 'pch'
+
+# Pickled declarations are only valid for the AST classes and AST builder that produced them
+_SOURCES = [Path(__file__).parent / 'ast' / 'nodes.py', Path(__file__).parent / 'parser' / 'c_parser.py',
+            Path(__file__).parent / 'parser' / 'rd_parser.py']
+
+class PrecompiledHeaders:
+    """Declarations of bundled headers, parsed once and cached in memory and on disk.
+
+    The preprocessor hands over the preprocessed text of every covered
+    header instead of emitting it, so the parser only sees user code; the
+    header declarations are unpickled and spliced into the translation
+    unit. Entries are keyed on the preprocessed header text (which reflects
+    the active macros), the parser engine and the AST/parser sources.
+    """
+
+    def __init__(self, parser: Any, cache_dir: Optional[str] = None,
+                 directories: Sequence[str] = (STDLIB_PATH,), maxsize: int = 256):
+        """Initialize the precompiled header store.
+
+        Args:
+            parser: Parser used to build declarations on a miss
+            cache_dir: Directory holding .pch files (created with mode 0700
+                if missing, defaults to DEFAULT_PCH_DIR); entries stay in
+                memory only if it cannot be created or is not private to
+                the current user
+            directories: Header directories whose files are precompiled
+            maxsize: Maximum number of header variants kept in memory
+        """
+        self.logger = logging.getLogger(__name__)
+        self.parser = parser
+        self.directories = {str(Path(directory).resolve()) for directory in directories}
+        self.cache_dir: Optional[Path] = Path(cache_dir) if cache_dir else DEFAULT_PCH_DIR
+        try:
+            private_directory(self.cache_dir)
+        except OSError as e:
+            self.logger.warning(f"Precompiled headers kept in memory only: {e}")
+            self.cache_dir = None
+        digest = hashlib.sha256(getattr(parser, 'engine', '').encode('utf-8'))
+        for source in _SOURCES:
+            digest.update(source.read_bytes())
+        self._version = digest.hexdigest()
+        self._entries = LRUCache(maxsize)
+        self._covered: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def covers(self, path: str) -> bool:
+        """Whether the header at path is precompiled rather than emitted as text."""
+        covered = self._covered.get(path)
+        if covered is None:
+            covered = self._covered[path] = str(Path(path).resolve().parent) in self.directories
+        return covered
+
+    def key(self, text: str) -> str:
+        return fingerprint(self._version, text)
+
+    def declarations(self, headers: Iterable[Tuple[str, str]]) -> List[Any]:
+        """Return fresh declaration nodes for the given headers, in order.
+
+        Args:
+            headers: (path, preprocessed text) pairs collected by the preprocessor
+
+        Returns:
+            Declarations to splice in front of the user's translation unit
+        """
+        declarations: List[Any] = []
+        for path, text in headers:
+            # Unpickling per use hands every compilation its own node objects
+            declarations.extend(pickle.loads(self._load(path, text)))
+        return declarations
+
+    def _load(self, path: str, text: str) -> bytes:
+        key = self.key(text)
+        data = self._entries.get(key)
+        if data is not None:
+            with self._lock:
+                self.hits += 1
+            return data
+
+        file_path = self.cache_dir / f"{key}.pch" if self.cache_dir else None
+        data = None
+        if file_path is not None:
+            try:
+                data = read_private(file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Ignoring precompiled header {file_path}: {e}")
+        if data is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            self.logger.info(f"Precompiling header {path}")
+            unit = self.parser.parse(text)
+            data = pickle.dumps(unit.declarations if unit is not None else [], protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self.misses += 1
+            if file_path is not None:
+                try:
+                    write_private(file_path, data)
+                except OSError as e:
+                    self.logger.warning(f"Failed to write precompiled header {file_path}: {e}")
+        self._entries.put(key, data)
+        return data
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit (of which loaded from disk) and miss counters."""
+        with self._lock:
+            hits = self.hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self._entries.maxsize,
+                'hits': hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round(hits / lookups * 100, 2) if lookups else 0,
+            }
@@ -0,0 +1,199 @@
+from functools import lru_cache
+from typing import List, Tuple
+import re
+
+# Tokens of a fully macro-expanded #if expression
+_TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<number>(?:0[xX][0-9a-fA-F]+|0[bB][01]+|\d+)[uUlL]*)(?![\w.])
+      | (?P<char>[LuU]?'(?:\\.|[^'\\])+')
+      | (?P<ident>[A-Za-z_]\w*)
+      | (?P<op>\|\||&&|==|!=|<=|>=|<<|>>|[-+*/%<>!~&|^?:()])
+    )''', re.VERBOSE)
+
+# Binary operators by precedence (higher binds tighter); all left associative
+_BINARY = {
+    '||': 1, '&&': 2, '|': 3, '^': 4, '&': 5,
+    '==': 6, '!=': 6, '<': 7, '>': 7, '<=': 7, '>=': 7,
+    '<<': 8, '>>': 8, '+': 9, '-': 9, '*': 10, '/': 10, '%': 10,
+}
+
+_ESCAPES = {'n': 10, 't': 9, 'r': 13, '0': 0, 'a': 7, 'b': 8, 'f': 12, 'v': 11,
+            '\\': 92, "'": 39, '"': 34, '?': 63}
+
+# #if arithmetic is done in intmax_t/uintmax_t: signed values wrap to 64-bit
+# two's complement, unsigned ones are reduced modulo 2**64
+_INTMAX_BITS = 64
+_SIGN = 1 << (_INTMAX_BITS - 1)
+_MASK = (1 << _INTMAX_BITS) - 1
+
+# Operators whose result is a signed int whatever their operands are
+_INT_RESULT = frozenset(('==', '!=', '<', '>', '<=', '>=', '&&', '||'))
+
+def _wrap(value: int) -> int:
+    return ((value + _SIGN) & _MASK) - _SIGN
+
+def _convert(value: int, unsigned: bool) -> int:
+    return value & _MASK if unsigned else _wrap(value)
+
+class ExpressionError(ValueError):
+    """Raised for malformed #if expressions."""
+
+def _char_value(literal: str) -> int:
+    body = literal[literal.index("'") + 1:-1]
+    if not body.startswith('\\'):
+        return ord(body[0])
+    escape = body[1:]
+    if escape[0] in 'xX':
+        return int(escape[1:], 16)
+    if escape[0] in '01234567' and len(escape) > 1:
+        return int(escape, 8)
+    if escape[0] not in _ESCAPES:
+        raise ExpressionError(f"unknown escape sequence in {literal}")
+    return _ESCAPES[escape[0]]
+
+def _tokenize(text: str) -> List[Tuple[str, object]]:
+    tokens: List[Tuple[str, object]] = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        match = _TOKEN_RE.match(text, pos)
+        if match is None:
+            raise ExpressionError(f"unexpected {text[pos:].strip()!r}")
+        pos = match.end()
+        if match.group('number'):
+            number = match.group('number')
+            digits = number.rstrip('uUlL')
+            if digits[:2] in ('0x', '0X', '0b', '0B'):
+                value = int(digits, 0)
+            else:
+                value = int(digits, 8 if len(digits) > 1 and digits[0] == '0' else 10)
+            # A u/U suffix, or a constant too large for intmax_t, makes it uintmax_t
+            tokens.append(('num', (value, 'u' in number.lower() or value >= _SIGN)))
+        elif match.group('char'):
+            tokens.append(('num', (_char_value(match.group('char')), False)))
+        elif match.group('ident'):
+            # Identifiers left after macro expansion evaluate to 0
+            tokens.append(('num', (0, False)))
+        else:
+            tokens.append(('op', match.group('op')))
+    return tokens
+
+class _Parser:
+    """Precedence-climbing parser producing a small tuple tree.
+
+    Every node is ``(op, unsigned, *operands)``; the type is fixed while
+    parsing so ?: can convert to the common type of both arms without
+    evaluating the one not taken.
+    """
+
+    def __init__(self, tokens: List[Tuple[str, object]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> Tuple[str, object]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ('end', None)
+
+    def take(self, op: str) -> None:
+        if self.peek() != ('op', op):
+            raise ExpressionError(f"expected '{op}'")
+        self.pos += 1
+
+    def conditional(self) -> tuple:
+        condition = self.binary(1)
+        if self.peek() != ('op', '?'):
+            return condition
+        self.pos += 1
+        if_true = self.conditional()
+        self.take(':')
+        if_false = self.conditional()
+        return ('?', if_true[1] or if_false[1], condition, if_true, if_false)
+
+    def binary(self, min_precedence: int) -> tuple:
+        left = self.unary()
+        while True:
+            kind, op = self.peek()
+            precedence = _BINARY.get(op) if kind == 'op' else None
+            if precedence is None or precedence < min_precedence:
+                return left
+            self.pos += 1
+            right = self.binary(precedence + 1)
+            if op in _INT_RESULT:
+                unsigned = False
+            elif op in ('<<', '>>'):
+                unsigned = left[1]
+            else:
+                unsigned = left[1] or right[1]
+            left = (op, unsigned, left, right)
+
+    def unary(self) -> tuple:
+        kind, value = self.peek()
+        if kind == 'num':
+            self.pos += 1
+            return ('num', value[1], value[0])
+        if kind == 'op' and value in ('-', '+', '!', '~'):
+            self.pos += 1
+            operand = self.unary()
+            return ('u' + value, value != '!' and operand[1], operand)
+        if kind == 'op' and value == '(':
+            self.pos += 1
+            inner = self.conditional()
+            self.take(')')
+            return inner
+        raise ExpressionError("expected a value" if kind == 'end' else f"unexpected '{value}'")
+
+def _eval(node: tuple) -> int:
+    op, unsigned = node[0], node[1]
+    if op == 'num':
+        return _convert(node[2], unsigned)
+    if op == '?':
+        return _convert(_eval(node[3]) if _eval(node[2]) else _eval(node[4]), unsigned)
+    if op == '&&':
+        return int(bool(_eval(node[2])) and bool(_eval(node[3])))
+    if op == '||':
+        return int(bool(_eval(node[2])) or bool(_eval(node[3])))
+    if op[0] == 'u' and len(node) == 3:
+        value = _eval(node[2])
+        return _convert({'u-': -value, 'u+': value, 'u!': int(not value), 'u~': ~value}[op], unsigned)
+    left, right = _eval(node[2]), _eval(node[3])
+    if op not in ('<<', '>>') and (node[2][1] or node[3][1]):
+        # Usual arithmetic conversions: a signed operand meeting an unsigned
+        # one is converted to uintmax_t, so -1 > 0u holds
+        left, right = left & _MASK, right & _MASK
+    if op in ('/', '%'):
+        if right == 0:
+            raise ExpressionError("division by zero")
+        # C truncates toward zero
+        quotient = abs(left) // abs(right) * (1 if (left < 0) == (right < 0) else -1)
+        return _convert(quotient if op == '/' else left - quotient * right, unsigned)
+    if op in ('<<', '>>'):
+        if not 0 <= right < _INTMAX_BITS:
+            raise ExpressionError(f"shift count {right} out of range 0..{_INTMAX_BITS - 1}")
+        return _convert(left << right, unsigned) if op == '<<' else left >> right
+    return _convert({
+        '+': left + right, '-': left - right, '*': left * right,
+        '<': int(left < right), '>': int(left > right), '<=': int(left <= right), '>=': int(left >= right),
+        '==': int(left == right), '!=': int(left != right),
+        '&': left & right, '^': left ^ right, '|': left | right,
+    }[op], unsigned)
+
+@lru_cache(maxsize=4096)
+def evaluate(expression: str) -> int:
+    """Evaluate a macro-expanded #if expression (defined() already replaced).
+
+    Supports integer and character constants and every C operator allowed
+    in preprocessor conditions, with short-circuit && / || / ?:.
+    Arithmetic is done in intmax_t, or in uintmax_t once a u/U-suffixed
+    (or out-of-range) constant takes part, following C's usual arithmetic
+    conversions. Remaining identifiers evaluate to 0. Results are cached on
+    the text.
+
+    Raises:
+        ExpressionError: If the expression is malformed, divides by zero or
+            shifts by a count outside 0..63
+    """
+    parser = _Parser(_tokenize(expression))
+    tree = parser.conditional()
+    if parser.pos != len(parser.tokens):
+        raise ExpressionError(f"unexpected '{parser.peek()[1]}'")
+    return _eval(tree)
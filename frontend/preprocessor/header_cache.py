@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, Hashable, Optional, Tuple
+import os
+
+from compile_cache import LRUCache
+from .macros import Macro
+
+@dataclass(frozen=True)
+class CachedHeader:
+    """The result of preprocessing one header under one macro set."""
+    output: str
+    # Macro definitions (name, macro or None for #undef) the header made, replayed on a hit
+    changes: Tuple[Tuple[str, Optional[Macro]], ...]
+    # (path, mtime_ns) of the header followed by every header it included
+    dependencies: Tuple[Tuple[str, int], ...]
+
+class HeaderCache:
+    """Process-wide cache of include resolution and preprocessed headers.
+
+    Results are keyed on the header path, its modification time and the
+    state hash of the macro set active at the #include, so an edited header
+    or a different set of definitions is a miss. The bundled stdlib headers
+    are preloaded by Preprocessor.preload_headers.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of preprocessed headers kept
+        """
+        self.headers = LRUCache(maxsize)
+        self.paths = LRUCache(maxsize * 4)
+        # (path, mtime_ns) -> (has #pragma once, include guard macro or None)
+        self.guards = LRUCache(maxsize * 4)
+
+    def resolve(self, key: Hashable) -> Optional[str]:
+        """Return the header path previously resolved for key, if it still exists."""
+        path = self.paths.get(key)
+        if path is not None and not os.path.exists(path):
+            return None
+        return path
+
+    def remember_path(self, key: Hashable, path: str) -> None:
+        self.paths.put(key, path)
+
+    def guard(self, path: str, mtime: int) -> Optional[Tuple[bool, Optional[str]]]:
+        """Return the remembered include-guard analysis of a header version."""
+        return self.guards.get((path, mtime))
+
+    def remember_guard(self, path: str, mtime: int, info: Tuple[bool, Optional[str]]) -> None:
+        self.guards.put((path, mtime), info)
+
+    def lookup(self, path: str, macro_state: int, once_files: Collection[str]) -> Optional[CachedHeader]:
+        """Return the cached result for including path with the given macro set.
+
+        Args:
+            path: Resolved header path
+            macro_state: MacroTable.state at the #include
+            once_files: #pragma once headers already entered in this translation
+                unit; an entry that inlined one of them is not reusable
+
+        Returns:
+            The cached header, or None on a miss or a stale entry
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self.headers.get((path, mtime, macro_state))
+        if cached is None:
+            return None
+        for dependency, dependency_mtime in cached.dependencies[1:]:
+            if dependency in once_files or _mtime(dependency) != dependency_mtime:
+                return None
+        return cached
+
+    def store(self, dependencies: Collection[Tuple[str, int]], macro_state: int, output: str,
+              changes: Collection[Tuple[str, Optional[Macro]]]) -> None:
+        """Cache the result of including a header under macro_state.
+
+        Args:
+            dependencies: (path, mtime_ns taken before reading) of the header
+                followed by every header it included
+            macro_state: MacroTable.state at the #include
+            output: Preprocessed text
+            changes: MacroTable journal entries made while preprocessing it
+        """
+        dependencies = tuple(dependencies)
+        path, mtime = dependencies[0]
+        self.headers.put((path, mtime, macro_state), CachedHeader(output, tuple(changes), dependencies))
+
+    def clear(self) -> None:
+        self.headers.clear()
+        self.paths.clear()
+        self.guards.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for the preprocessed-header cache."""
+        return {**self.headers.stats(), 'resolved_paths': len(self.paths)}
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+# Shared by every Preprocessor in the process
+header_cache = HeaderCache()
@@ -0,0 +1,302 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+import re
+
+# One pass over a line finds every token that can matter for expansion:
+# literals and pp-numbers are skipped whole, identifiers are looked up.
+_TOKEN_RE = re.compile(r'''
+    (?P<literal>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')
+  | (?P<comment>//.*|/\*.*?\*/)
+  | (?P<number>\.?\d(?:[eEpP][+-]|[\w.])*)
+  | (?P<ident>[A-Za-z_]\w*)
+''', re.VERBOSE)
+
+# Replacement-list tokens that matter for substitution
+_BODY_RE = re.compile(r'''
+    (?P<paste>\#\#)
+  | \#\s*(?P<stringize>[A-Za-z_]\w*)
+  | (?P<literal>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')
+  | (?P<ident>[A-Za-z_]\w*)
+''', re.VERBOSE)
+
+_DEFINE_RE = re.compile(r'([A-Za-z_]\w*)(\([^)]*\))?\s*(.*)', re.DOTALL)
+
+class Macro:
+    """An object-like or function-like macro definition."""
+
+    __slots__ = ('name', 'body', 'params', 'variadic', 'dynamic', 'signature', '_pieces')
+
+    def __init__(self, name: str, body: str = '', params: Optional[List[str]] = None,
+                 dynamic: Optional[Callable[[], str]] = None):
+        """Initialize the macro.
+
+        Args:
+            name: Macro name
+            body: Replacement list
+            params: Parameter names for a function-like macro (None for
+                object-like); a trailing '...' makes it variadic
+            dynamic: For object-like macros such as __LINE__, a callable
+                producing the replacement at each use
+        """
+        self.name = name
+        self.body = body.strip()
+        self.dynamic = dynamic
+        self.variadic = bool(params) and params[-1] == '...'
+        if self.variadic:
+            params = params[:-1] + ['__VA_ARGS__']
+        self.params = params
+        self._pieces = self._compile() if params is not None else None
+        # Identifies the definition; dynamic macros are identified by name only
+        self.signature = hash((name, 'dynamic') if dynamic is not None
+                              else (name, self.body, None if params is None else tuple(params)))
+
+    def _compile(self) -> List[Tuple[str, object]]:
+        """Split the body into text, parameter, stringize and paste pieces once."""
+        index = {name: i for i, name in enumerate(self.params)}
+        pieces: List[Tuple[str, object]] = []
+        pos = 0
+        for match in _BODY_RE.finditer(self.body):
+            pieces.append(('text', self.body[pos:match.start()]))
+            pos = match.end()
+            if match.group('paste'):
+                pieces.append(('paste', None))
+            elif match.group('stringize') in index:
+                pieces.append(('stringize', index[match.group('stringize')]))
+            elif match.group('ident') in index:
+                pieces.append(('param', index[match.group('ident')]))
+            else:
+                pieces.append(('text', match.group()))
+        pieces.append(('text', self.body[pos:]))
+
+        # Operands of ## use the unexpanded argument and lose surrounding whitespace
+        for i, (kind, _) in enumerate(pieces):
+            if kind != 'paste':
+                continue
+            for step in (-1, 1):
+                j = i + step
+                while 0 <= j < len(pieces) and pieces[j][0] == 'text' and not pieces[j][1].strip():
+                    pieces[j] = ('text', '')
+                    j += step
+                if 0 <= j < len(pieces):
+                    kind_j, value_j = pieces[j]
+                    if kind_j == 'text':
+                        pieces[j] = ('text', value_j.rstrip() if step < 0 else value_j.lstrip())
+                    elif kind_j == 'param':
+                        pieces[j] = ('raw', value_j)
+        return [piece for piece in pieces if piece[0] != 'paste' and piece != ('text', '')]
+
+    def substitute(self, args: List[str], expanded_args: List[str]) -> str:
+        """Build the replacement text for one invocation.
+
+        Args:
+            args: Arguments as written
+            expanded_args: Fully macro-expanded arguments
+
+        Returns:
+            Replacement text, ready to be rescanned
+        """
+        parts = []
+        for kind, value in self._pieces:
+            if kind == 'text':
+                parts.append(value)
+            elif kind == 'param':
+                parts.append(expanded_args[value])
+            elif kind == 'raw':
+                parts.append(args[value])
+            else:
+                parts.append('"' + args[value].replace('\\', '\\\\').replace('"', '\\"') + '"')
+        return ''.join(parts)
+
+class MacroTable:
+    """Macro definitions plus a single-pass expander.
+
+    Each line is scanned once by one tokenizer regex; identifiers are
+    looked up in a dict, so the per-line cost does not depend on how many
+    macros are defined. Replacements are spliced back into the input and
+    rescanned, with a macro hidden while its own expansion is being scanned.
+
+    The table also keeps a hash of the current definition set (state),
+    updated incrementally, and a journal of every define/undef (changes),
+    so the effect of preprocessing a header can be cached and replayed.
+    """
+
+    def __init__(self, macros: Optional[Mapping[str, str]] = None):
+        self.macros: Dict[str, Macro] = {}
+        self.state = 0
+        self.changes: List[Tuple[str, Optional[Macro]]] = []
+        # Number of dynamic macro expansions; text expanded while it grows depends on more than state
+        self.dynamic_expansions = 0
+        if macros:
+            self.update(macros)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.macros
+
+    def __len__(self) -> int:
+        return len(self.macros)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.macros)
+
+    def get(self, name: str) -> Optional[Macro]:
+        return self.macros.get(name)
+
+    def define(self, name: str, body: str = '', params: Optional[List[str]] = None) -> None:
+        """Define (or redefine) a macro."""
+        self._set(name, Macro(name, body, params))
+
+    def define_dynamic(self, name: str, producer: Callable[[], str]) -> None:
+        """Define an object-like macro whose replacement is computed at each use."""
+        self._set(name, Macro(name, dynamic=producer))
+
+    def _set(self, name: str, macro: Optional[Macro]) -> None:
+        old = self.macros.pop(name, None)
+        if old is not None:
+            self.state ^= old.signature
+        if macro is not None:
+            self.macros[name] = macro
+            self.state ^= macro.signature
+        self.changes.append((name, macro))
+
+    def apply(self, changes: Iterable[Tuple[str, Optional[Macro]]]) -> None:
+        """Replay journal entries (name, macro or None for #undef) recorded from another table."""
+        for name, macro in changes:
+            self._set(name, macro)
+
+    def define_directive(self, text: str) -> str:
+        """Define a macro from the text following '#define'.
+
+        A '(' directly after the name makes it function-like, as in C.
+
+        Returns:
+            The macro name
+        """
+        match = _DEFINE_RE.match(text.strip())
+        if not match:
+            raise ValueError(f"Invalid #define: {text.strip()}")
+        name, params, body = match.groups()
+        if params is not None:
+            params = [param.strip() for param in params[1:-1].split(',') if param.strip()]
+        self.define(name, body, params)
+        return name
+
+    def undef(self, name: str) -> None:
+        """Remove a macro if it is defined."""
+        if name in self.macros:
+            self._set(name, None)
+
+    def update(self, macros: Mapping[str, str]) -> None:
+        """Define object-like macros from a name -> replacement mapping."""
+        for name, body in macros.items():
+            self.define(name, str(body))
+
+    def clear(self) -> None:
+        self.macros.clear()
+        self.state = 0
+        self.changes = []
+
+    def expand(self, text: str, hidden: Iterable[str] = ()) -> str:
+        """Expand every macro invocation in text.
+
+        Args:
+            text: Source text (normally one line)
+            hidden: Macro names that must not be expanded (used for arguments
+                expanded inside another macro's expansion)
+
+        Returns:
+            Text with macros expanded
+        """
+        macros = self.macros
+        if not macros:
+            return text
+        # Active expansions: (macro name, offset in text where its replacement ends)
+        active = [(name, len(text)) for name in hidden]
+        out = []
+        flushed = 0  # text before this offset is already in out
+        pos = 0
+        while True:
+            match = _TOKEN_RE.search(text, pos)
+            if match is None:
+                break
+            pos = match.end()
+            name = match.group('ident')
+            macro = macros.get(name) if name else None
+            if macro is None:
+                continue
+            start = match.start()
+            if active:
+                active = [entry for entry in active if entry[1] > start]
+                if any(entry[0] == name for entry in active):
+                    continue
+
+            end = pos
+            if macro.params is None:
+                if macro.dynamic is None:
+                    replacement = macro.body
+                else:
+                    replacement = macro.dynamic()
+                    self.dynamic_expansions += 1
+            else:
+                invocation = _collect_args(text, end)
+                if invocation is None:
+                    # A function-like macro name without arguments is left alone
+                    continue
+                args, end = invocation
+                args = self._bind_args(macro, args)
+                names = [entry[0] for entry in active]
+                replacement = macro.substitute(args, [self.expand(arg, names) for arg in args])
+
+            out.append(text[flushed:start])
+            # Splice the replacement in front of the rest and rescan it
+            active = [(entry_name, len(replacement) + max(limit - end, 0)) for entry_name, limit in active]
+            active.append((name, len(replacement)))
+            text = replacement + text[end:]
+            flushed = pos = 0
+        out.append(text[flushed:])
+        return ''.join(out)
+
+    @staticmethod
+    def _bind_args(macro: Macro, args: List[str]) -> List[str]:
+        count = len(macro.params)
+        if args == [''] and count == 0:
+            return []
+        if macro.variadic and len(args) >= count - 1:
+            fixed = args[:count - 1]
+            return fixed + [', '.join(args[count - 1:]).strip()]
+        if len(args) != count:
+            raise ValueError(f"Macro {macro.name} expects {count} argument(s), got {len(args)}")
+        return args
+
+def _collect_args(text: str, pos: int) -> Optional[Tuple[List[str], int]]:
+    """Parse a parenthesized, comma separated argument list starting at pos.
+
+    Returns:
+        (stripped arguments, offset after the closing parenthesis), or None
+        if no complete argument list follows
+    """
+    length = len(text)
+    while pos < length and text[pos] in ' \t':
+        pos += 1
+    if pos >= length or text[pos] != '(':
+        return None
+    depth = 0
+    args = []
+    arg_start = pos + 1
+    i = pos
+    while i < length:
+        char = text[i]
+        if char in '"\'':
+            i += 1
+            while i < length and text[i] != char:
+                i += 2 if text[i] == '\\' else 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                args.append(text[arg_start:i].strip())
+                return args, i + 1
+        elif char == ',' and depth == 1:
+            args.append(text[arg_start:i].strip())
+            arg_start = i + 1
+        i += 1
+    return None
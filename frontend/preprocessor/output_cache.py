@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+import os
+
+from compile_cache import LRUCache
+from .macros import Macro
+
+@dataclass(frozen=True)
+class CachedOutput:
+    """The result of preprocessing one translation unit."""
+    output: str
+    # (path, preprocessed text) of the headers handed to the precompiled header store
+    precompiled_headers: Tuple[Tuple[str, str], ...]
+    # Macro definitions made after the predefined set, replayed on a hit
+    changes: Tuple[Tuple[str, Optional[Macro]], ...]
+    # (path, mtime_ns) of every header the unit included
+    dependencies: Tuple[Tuple[str, int], ...]
+
+class OutputCache:
+    """Process-wide cache of fully preprocessed translation units.
+
+    Entries are keyed on everything the output is derived from besides the
+    headers (see Preprocessor.output_key): the source text, its file name,
+    the include paths and the predefined macros. The headers a unit
+    included are recorded with their modification times, and an entry is
+    dropped as soon as one of them changes or disappears.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of preprocessed units kept
+        """
+        self.entries = LRUCache(maxsize)
+        self.stale = 0
+
+    def lookup(self, key: Hashable) -> Optional[CachedOutput]:
+        """Return the cached unit for key if none of its headers changed."""
+        cached = self.entries.get(key)
+        if cached is None:
+            return None
+        for path, mtime in cached.dependencies:
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                self.stale += 1
+                return None
+        return cached
+
+    def store(self, key: Hashable, entry: CachedOutput) -> None:
+        self.entries.put(key, entry)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for the preprocessed-output cache (stale entries count as misses)."""
+        stats = self.entries.stats()
+        stats['hits'] -= self.stale
+        stats['misses'] += self.stale
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups * 100, 2) if lookups else 0
+        stats['stale'] = self.stale
+        return stats
+
+# Shared by every Preprocessor in the process
+output_cache = OutputCache()
@@ -1,160 +1,610 @@
+import hashlib
+import logging
+import os
 import re
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from .expression import ExpressionError, evaluate
+from .header_cache import header_cache
+from .macros import MacroTable
+from .output_cache import CachedOutput, output_cache
+
+STDLIB_PATH = str(Path(__file__).parent.parent / 'stdlib')
+
+# Directive name and arguments of a line whose first non-blank character is '#'
+_DIRECTIVE_RE = re.compile(r'#\s*(\w*)\s*(.*)', re.DOTALL)
+_COMMENT_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|(//.*|/\*.*?\*/)')
+_DEFINED_RE = re.compile(r'\bdefined\s*(?:\(\s*(\w+)\s*\)|(\w+))')
+# Same as _COMMENT_RE, but block comments may span lines
+_ALL_COMMENTS_RE = re.compile(r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|(//[^\n]*|/\*.*?\*/)', re.DOTALL)
+_GUARD_OPEN_RE = re.compile(r'#\s*(?:ifndef\s+(\w+)|if\s*!\s*defined\s*(?:\(\s*(\w+)\s*\)|\s(\w+)))\s*$')
+_PRAGMA_ONCE_RE = re.compile(r'#\s*pragma\s+once\b')
+
+# Unguarded headers may be included repeatedly; this bounds include cycles
+MAX_INCLUDE_DEPTH = 100
+_CONDITION_CACHE_SIZE = 4096
+# Output lines handed over at a time by iter_process
+_BATCH_LINES = 1024
+
+# Directives that must be tracked even inside skipped conditional blocks
+_CONDITIONAL_DIRECTIVES = frozenset(('if', 'ifdef', 'ifndef', 'elif', 'else', 'endif'))
+
+class PreprocessorError(Exception):
+    """Raised for #error directives, missing headers and unbalanced conditionals."""
+
+class _Conditional:
+    """One level of #if nesting."""
+
+    __slots__ = ('parent_active', 'taken', 'active', 'seen_else')
+
+    def __init__(self, parent_active: bool, condition: bool):
+        self.parent_active = parent_active
+        self.active = parent_active and condition
+        self.taken = self.active
+        self.seen_else = False
 
 class Preprocessor:
-    """Handles C preprocessor directives."""
-    
-    def __init__(self, include_paths: Optional[List[str]] = None):
+    """Handles C preprocessor directives in a single pass over the source.
+
+    Directives are dispatched on their name through a table; every other
+    line goes straight to the macro expander. Plugins extend the
+    preprocessor through hooks (extra directives and predefined macros)
+    instead of running extra passes over the text.
+    """
+
+    def __init__(self, include_paths: Optional[List[str]] = None, macros: Optional[Dict[str, str]] = None):
         """Initialize the preprocessor.
-        
+
         Args:
             include_paths: List of paths to search for header files
+            macros: Predefined macros (name -> replacement) for every translation unit
+        """
+        self.logger = logging.getLogger(__name__)
+        self.include_paths = list(include_paths or [])
+        self.include_paths.append(STDLIB_PATH)
+        self.header_cache = header_cache
+        # Whole translation units, for sources preprocessed again unchanged (None disables)
+        self.output_cache = output_cache
+        # PrecompiledHeaders (or None): covered headers are collected, not emitted
+        self.precompiled = None
+        self.precompiled_headers: List[Tuple[str, str]] = []
+        self.predefined: Dict[str, Any] = self._builtin_macros()
+        self.predefined.update(macros or {})
+        self.macros = MacroTable()
+        self.directives: Dict[str, Callable[[str], Optional[str]]] = {
+            'include': self._handle_include,
+            'define': self._handle_define,
+            'undef': self._handle_undef,
+            'ifdef': self._handle_ifdef,
+            'ifndef': self._handle_ifndef,
+            'if': self._handle_if,
+            'elif': self._handle_elif,
+            'else': self._handle_else,
+            'endif': self._handle_endif,
+            'pragma': self._handle_pragma,
+            'error': self._handle_error,
+            'warning': self._handle_warning,
+        }
+        self._conditionals: List[_Conditional] = []
+        self._processed_files: List[str] = []
+        self._mtimes: Dict[str, int] = {}
+        # Headers that must not be entered again in this translation unit:
+        # #pragma once files, and include-guarded files with their guard macro
+        self._once: Set[str] = set()
+        self._guards: Dict[str, str] = {}
+        self._once_skips = 0
+        self._plugin_directive_calls = 0
+        self._include_depth = 0
+        # (#if expression, macro state) -> result; valid across translation units
+        self._conditions: Dict[Tuple[str, int], bool] = {}
+        self._file = '<source>'
+        self._line = 0
+
+    def _builtin_macros(self) -> Dict[str, Any]:
+        return {
+            '__FILE__': lambda: '"' + self._file.replace('\\', '\\\\') + '"',
+            '__LINE__': lambda: str(self._line),
+            '__DATE__': lambda: time.strftime('"%b %d %Y"'),
+            '__TIME__': lambda: time.strftime('"%H:%M:%S"'),
+            '__STDC__': '1',
+            '__STDC_VERSION__': '201112L',
+            '__STDC_HOSTED__': '1',
+        }
+
+    def use_plugins(self, plugins: Iterable[Any]) -> None:
+        """Install the preprocessor hooks of frontend plugins.
+
+        Args:
+            plugins: Plugins providing get_directives() (name -> handler taking
+                this preprocessor and the directive arguments, returning output
+                text or None) and get_macros() (name -> text or callable)
+        """
+        for plugin in plugins:
+            for name, handler in plugin.get_directives().items():
+                self.directives[name] = lambda args, handler=handler: self._run_plugin_directive(handler, args)
+            self.predefined.update(plugin.get_macros())
+
+    def _run_plugin_directive(self, handler: Callable[[Any, str], Optional[str]], args: str) -> Optional[str]:
+        # Plugin handlers may depend on anything, so their output is never cached
+        self._plugin_directive_calls += 1
+        return handler(self, args)
+
+    def reset(self, macros: Optional[Dict[str, str]] = None) -> None:
+        """Start a new translation unit: predefined macros only, no open conditionals.
+
+        Args:
+            macros: Extra predefined macros for this translation unit
         """
-        self.include_paths = include_paths or []
-        self.include_paths.append(str(Path(__file__).parent.parent / 'stdlib'))
-        self.macros: Dict[str, str] = {}
-          # Regular expressions for preprocessor directives
-        self.include_regex = re.compile(r'#include\s*[<"]([^>"]+)[>"]')
-        self.define_regex = re.compile(r'#define\s+(\w+)(?:\s+(.+))?')
-        self.ifdef_regex = re.compile(r'#ifdef\s+(\w+)')
-        self.ifndef_regex = re.compile(r'#ifndef\s+(\w+)')
-        self.else_regex = re.compile(r'#else')
-        self.endif_regex = re.compile(r'#endif')
-        
-    def find_header(self, header_name: str) -> Optional[str]:
+        self.macros.clear()
+        for name, value in {**self.predefined, **(macros or {})}.items():
+            if callable(value):
+                self.macros.define_dynamic(name, value)
+            else:
+                self.macros.define(name, str(value))
+        self._conditionals = []
+        self._processed_files = []
+        self._mtimes = {}
+        self._once = set()
+        self._guards = {}
+        self._include_depth = 0
+        self.precompiled_headers = []
+
+    def preload_headers(self, directory: str = STDLIB_PATH) -> int:
+        """Preprocess every header in directory into the shared header cache.
+
+        Each header is processed as the first include of a fresh translation
+        unit, which is the macro set a typical program includes it under.
+
+        Returns:
+            Number of headers preloaded
+        """
+        count = 0
+        for header in sorted(Path(directory).glob('*.h')):
+            self.reset()
+            self.process(f'#include <{header.name}>')
+            if self.precompiled is not None:
+                self.precompiled.declarations(self.precompiled_headers)
+            count += 1
+        self.reset()
+        return count
+
+    @property
+    def active(self) -> bool:
+        """Whether lines at the current position are emitted."""
+        return not self._conditionals or self._conditionals[-1].active
+
+    def find_header(self, header_name: str, quoted: bool = False) -> Optional[str]:
         """Find a header file in the include paths.
-        
+
         Args:
             header_name: Name of the header file
-            
+            quoted: Search the including file's directory first ("..." includes)
+
         Returns:
             Full path to the header file if found, None otherwise
         """
-        for path in self.include_paths:
+        search = self.include_paths
+        if quoted and self._file not in ('<source>', ''):
+            search = [str(Path(self._file).parent)] + search
+        key = (header_name, tuple(search))
+        cached = self.header_cache.resolve(key)
+        if cached is not None:
+            return cached
+        for path in search:
             header_path = Path(path) / header_name
             if header_path.exists():
+                self.header_cache.remember_path(key, str(header_path))
                 return str(header_path)
         return None
-    
+
     def process_include(self, match: re.Match, processed_files: List[str]) -> str:
         """Process an #include directive.
-        
+
         Args:
-            match: Regex match object for the include directive
-            processed_files: List of already processed files to avoid cycles
-            
+            match: Regex match object for the include directive; group 1 is
+                the header name, group 0 the full '<...>' or '"..."' spelling
+            processed_files: Headers entered so far in this translation unit, in order
+
         Returns:
-            The contents of the included file
+            The contents of the included file (empty for a precompiled header,
+            whose text is collected in precompiled_headers instead)
         """
         header_name = match.group(1)
-        header_path = self.find_header(header_name)
-        
+        header_path = self.find_header(header_name, quoted=match.group(0).startswith('"'))
+
         if not header_path:
-            raise FileNotFoundError(f"Header file not found: {header_name}")
-            
-        if header_path in processed_files:
-            return "// Header already included\n"
-            
+            raise PreprocessorError(f"Header file not found: {header_name}")
+
+        # A guarded or #pragma once header is skipped without being opened
+        if header_path in self._once:
+            self._once_skips += 1
+            return ''
+        guard = self._guards.get(header_path)
+        if guard is not None and guard in self.macros:
+            return ''
+        if self._include_depth >= MAX_INCLUDE_DEPTH:
+            raise PreprocessorError(f"{self._file}:{self._line}: #include nested too deeply ({header_name})")
+
+        self._include_depth += 1
+        try:
+            output = self._include(header_path, processed_files)
+        finally:
+            self._include_depth -= 1
+        if self.precompiled is not None and self.precompiled.covers(header_path):
+            self.precompiled_headers.append((header_path, output))
+            return ''
+        return output
+
+    def _include(self, header_path: str, processed_files: List[str]) -> str:
+        """Preprocess a header, or replay its cached result."""
+        macro_state = self.macros.state
+        cached = self.header_cache.lookup(header_path, macro_state, self._once)
+        if cached is not None:
+            for path, mtime in cached.dependencies:
+                processed_files.append(path)
+                self._mtimes[path] = mtime
+                self._note_guard(path, mtime)
+            self.macros.apply(cached.changes)
+            return cached.output
+
         processed_files.append(header_path)
-        
+        first_nested = len(processed_files)
+        first_change = len(self.macros.changes)
+        once_skips = self._once_skips
+        mtime = self._mtimes[header_path] = os.stat(header_path).st_mtime_ns
+
         with open(header_path, 'r') as f:
             content = f.read()
-            
-        return self.process(content, processed_files)
-    
+
+        output = self.process(content, processed_files, filename=header_path)
+        self._note_guard(header_path, mtime, content)
+        # Output that depends on #pragma once files entered earlier is not reusable
+        if self._once_skips == once_skips:
+            self.header_cache.store(
+                [(path, self._mtimes[path]) for path in [header_path] + processed_files[first_nested:]],
+                macro_state, output, self.macros.changes[first_change:])
+        return output
+
+    def _note_guard(self, path: str, mtime: int, content: Optional[str] = None) -> None:
+        """Remember whether a header just entered is #pragma once or include-guarded."""
+        info = self.header_cache.guard(path, mtime)
+        if info is None:
+            if content is None:
+                with open(path, 'r') as f:
+                    content = f.read()
+            info = detect_include_guard(content)
+            self.header_cache.remember_guard(path, mtime, info)
+        once, guard = info
+        if once:
+            self._once.add(path)
+        elif guard is not None:
+            self._guards[path] = guard
+
     def process_define(self, match: re.Match) -> str:
         """Process a #define directive.
-        
+
         Args:
-            match: Regex match object for the define directive
-            
+            match: Regex match object; group 1 is the text after '#define'
+
         Returns:
             Empty string (defines are handled during preprocessing)
         """
-        name = match.group(1)
-        value = match.group(2) or ''
-        self.macros[name] = value
+        self.macros.define_directive(match.group(1))
         return ''
-    
+
     def expand_macros(self, line: str) -> str:
         """Expand macros in a line of code.
-        
+
         Args:
             line: Line of code
-            
+
         Returns:
             Line with macros expanded
         """
-        for name, value in self.macros.items():
-            line = re.sub(rf'\b{name}\b', value, line)
-        return line
-    
-    def process(self, source: str, processed_files: Optional[List[str]] = None) -> str:
+        return self.macros.expand(line)
+
+    def process(self, source: Union[str, Iterable[str]], processed_files: Optional[List[str]] = None,
+                filename: str = '<source>', macros: Optional[Dict[str, str]] = None) -> str:
         """Process source code and handle preprocessor directives.
-        
+
         Args:
-            source: Source code to process
-            processed_files: List of already processed files
-              Returns:
+            source: Source code to process, or an iterable of its lines
+            processed_files: Headers entered so far; None starts a new
+                translation unit (macros are reset to the predefined set)
+            filename: Name reported by __FILE__ and used for "..." includes
+            macros: Extra predefined macros for a new translation unit
+
+        Returns:
             Processed source code
         """
+        key = None
+        if processed_files is None and isinstance(source, str) and self.output_cache is not None:
+            key = self.output_key(source, filename, macros)
+            cached = self.output_cache.lookup(key)
+            if cached is not None:
+                self.reset(macros)
+                self.macros.apply(cached.changes)
+                self._processed_files = [path for path, _ in cached.dependencies]
+                self._mtimes = dict(cached.dependencies)
+                self.precompiled_headers = list(cached.precompiled_headers)
+                return cached.output
+
+        result: List[str] = []
+        if key is None:
+            for batch in self._iter_batches(source, processed_files, filename, macros, _BATCH_LINES):
+                result.extend(batch)
+            return '\n'.join(result)
+
+        self.reset(macros)
+        first_change = len(self.macros.changes)
+        dynamic_expansions = self.macros.dynamic_expansions
+        plugin_directive_calls = self._plugin_directive_calls
+        for batch in self._iter_batches(source, self._processed_files, filename, None, _BATCH_LINES):
+            result.extend(batch)
+        output = '\n'.join(result)
+        # __DATE__, __TIME__ and plugin directives make the output vary between runs
+        if (self.macros.dynamic_expansions == dynamic_expansions
+                and self._plugin_directive_calls == plugin_directive_calls):
+            self.output_cache.store(key, CachedOutput(
+                output, tuple(self.precompiled_headers), tuple(self.macros.changes[first_change:]),
+                tuple(self._mtimes.items())))
+        return output
+
+    def output_key(self, source: str, filename: str = '<source>',
+                   macros: Optional[Dict[str, str]] = None) -> Tuple[Any, ...]:
+        """Key of a translation unit in the output cache.
+
+        Covers the source text, its file name (for __FILE__ and "..."
+        includes), the include paths, the predefined macros and directives
+        (including those added by plugins) and whether bundled headers are
+        precompiled. The included headers are validated separately.
+        """
+        predefined = {**self.predefined, **(macros or {})}
+        return (
+            hashlib.sha256(source.encode('utf-8')).hexdigest(),
+            filename,
+            tuple(self.include_paths),
+            tuple(sorted((name, None if callable(value) else str(value)) for name, value in predefined.items())),
+            tuple(sorted(self.directives)),
+            tuple(sorted(self.precompiled.directories)) if self.precompiled is not None else None,
+        )
+
+    def iter_process(self, source: Union[str, Iterable[str]], processed_files: Optional[List[str]] = None,
+                     filename: str = '<source>', macros: Optional[Dict[str, str]] = None,
+                     batch_lines: int = _BATCH_LINES) -> Iterator[str]:
+        """Process source code lazily, yielding the output in chunks.
+
+        Concatenating the chunks gives exactly the result of process(), but
+        neither the input lines nor the output are ever held in full: pass
+        an open file as source and feed the chunks to the lexer (see
+        ChunkedCharStream) to keep peak memory independent of input size.
+
+        Args:
+            source: Source code, or an iterable of its lines
+            processed_files: As for process()
+            filename: As for process()
+            macros: As for process()
+            batch_lines: Output lines per chunk
+
+        Yields:
+            Consecutive pieces of the processed source
+        """
+        separator = ''
+        for batch in self._iter_batches(source, processed_files, filename, macros, batch_lines):
+            yield separator + '\n'.join(batch)
+            separator = '\n'
+
+    def _iter_batches(self, source: Union[str, Iterable[str]], processed_files: Optional[List[str]],
+                      filename: str, macros: Optional[Dict[str, str]], batch_lines: int) -> Iterator[List[str]]:
         if processed_files is None:
-            processed_files = []
-            
-        lines = source.split('\n')
-        result = []
-        conditional_stack = []  # Stack to handle nested conditionals
-        
-        for line in lines:
-            # Handle #include
-            include_match = self.include_regex.match(line)
-            if include_match:
-                if not conditional_stack or conditional_stack[-1]:
-                    result.append(self.process_include(include_match, processed_files))
-                continue
-                
-            # Handle #define
-            define_match = self.define_regex.match(line)
-            if define_match:
-                if not conditional_stack or conditional_stack[-1]:
-                    result.append(self.process_define(define_match))
-                continue
-                
-            # Handle #ifdef
-            ifdef_match = self.ifdef_regex.match(line)
-            if ifdef_match:
-                macro_name = ifdef_match.group(1)
-                condition_met = macro_name in self.macros
-                conditional_stack.append(condition_met)
-                continue
-                
-            # Handle #ifndef
-            ifndef_match = self.ifndef_regex.match(line)
-            if ifndef_match:
-                macro_name = ifndef_match.group(1)
-                condition_met = macro_name not in self.macros
-                conditional_stack.append(condition_met)
-                continue
-                
-            # Handle #else
-            if self.else_regex.match(line):
-                if conditional_stack:
-                    conditional_stack[-1] = not conditional_stack[-1]
-                continue
-                
-            # Handle #endif
-            if self.endif_regex.match(line):
-                if conditional_stack:
-                    conditional_stack.pop()
+            self.reset(macros)
+            processed_files = self._processed_files
+        self._processed_files = processed_files
+
+        saved_position = (self._file, self._line)
+        depth = len(self._conditionals)
+        self._file = filename
+        try:
+            yield from self._process_lines(_split_lines(source), batch_lines)
+        finally:
+            self._file, self._line = saved_position
+        if len(self._conditionals) != depth:
+            raise PreprocessorError(f"Unterminated conditional directive in {filename}")
+
+    def _process_lines(self, lines: Iterable[str], batch_lines: int) -> Iterator[List[str]]:
+        directives = self.directives
+        conditionals = self._conditionals
+        expand = self.macros.expand
+        batch: List[str] = []
+        emit = batch.append
+        active = self.active
+        pending = ''
+        for line_number, line in enumerate(lines, 1):
+            # Splice backslash-continued lines
+            if pending:
+                line = pending + line
+                pending = ''
+            if line.endswith('\\'):
+                pending = line[:-1]
                 continue
-                
-            # Skip lines if inside a false conditional block
-            if conditional_stack and not conditional_stack[-1]:
+
+            stripped = line.lstrip()
+            if not stripped.startswith('#'):
+                # Ordinary lines: one tokenizer pass in the macro expander, or nothing when skipped
+                if active:
+                    self._line = line_number
+                    emit(expand(line))
+                    if len(batch) >= batch_lines:
+                        yield batch
+                        batch = []
+                        emit = batch.append
                 continue
-                
-            # Expand macros in the line
-            processed_line = self.expand_macros(line)
-            result.append(processed_line)
-            
-        return '\n'.join(result) 
\ No newline at end of file
+
+            self._line = line_number
+            name, args = _DIRECTIVE_RE.match(stripped).groups()
+            if name in _CONDITIONAL_DIRECTIVES:
+                directives[name](_strip_comments(args).strip())
+                active = not conditionals or conditionals[-1].active
+            elif name and active:
+                handler = directives.get(name)
+                if handler is None:
+                    self.logger.warning(f"{self._file}:{line_number}: unknown directive #{name}")
+                    continue
+                output = handler(_strip_comments(args).strip())
+                if output is not None:
+                    emit(output)
+        if batch:
+            yield batch
+
+    def _handle_include(self, args: str) -> str:
+        match = re.match(r'[<"]([^>"]+)[>"]', args)
+        if not match:
+            raise PreprocessorError(f"{self._file}:{self._line}: malformed #include {args}")
+        return self.process_include(match, self._processed_files)
+
+    def _handle_define(self, args: str) -> None:
+        self.macros.define_directive(args)
+
+    def _handle_undef(self, args: str) -> None:
+        self.macros.undef(args.split()[0] if args else '')
+
+    def _handle_ifdef(self, args: str) -> None:
+        self._conditionals.append(_Conditional(self.active, args.split()[0] in self.macros if args else False))
+
+    def _handle_ifndef(self, args: str) -> None:
+        self._conditionals.append(_Conditional(self.active, args.split()[0] not in self.macros if args else True))
+
+    def _handle_if(self, args: str) -> None:
+        parent_active = self.active
+        # Conditions inside skipped blocks are never evaluated
+        self._conditionals.append(_Conditional(parent_active, parent_active and self.evaluate_condition(args)))
+
+    def _handle_elif(self, args: str) -> None:
+        conditional = self._top('elif')
+        if conditional.seen_else:
+            raise PreprocessorError(f"{self._file}:{self._line}: #elif after #else")
+        if conditional.taken or not conditional.parent_active:
+            conditional.active = False
+        else:
+            conditional.active = self.evaluate_condition(args)
+            conditional.taken = conditional.active
+
+    def _handle_else(self, args: str) -> None:
+        conditional = self._top('else')
+        if conditional.seen_else:
+            raise PreprocessorError(f"{self._file}:{self._line}: duplicate #else")
+        conditional.seen_else = True
+        conditional.active = conditional.parent_active and not conditional.taken
+        conditional.taken = True
+
+    def _handle_endif(self, args: str) -> None:
+        self._top('endif')
+        self._conditionals.pop()
+
+    def _top(self, directive: str) -> _Conditional:
+        if not self._conditionals:
+            raise PreprocessorError(f"{self._file}:{self._line}: #{directive} without #if")
+        return self._conditionals[-1]
+
+    def _handle_pragma(self, args: str) -> None:
+        if _PRAGMA_ONCE_RE.match('#pragma ' + args):
+            self._once.add(self._file)
+            return
+        self.logger.info(f"Pragma directive: {args}")
+
+    def _handle_error(self, args: str) -> None:
+        raise PreprocessorError(f"{self._file}:{self._line}: #error {args}")
+
+    def _handle_warning(self, args: str) -> None:
+        self.logger.warning(f"{self._file}:{self._line}: #warning {args}")
+
+    def evaluate_condition(self, expression: str) -> bool:
+        """Evaluate the controlling expression of #if/#elif.
+
+        defined X / defined(X) is resolved first, then macros are expanded
+        and the result is evaluated as a C integer constant expression.
+        Results are cached on the expression and the macro set, so a
+        condition repeated under the same definitions (typical for headers
+        and configuration checks) costs a dictionary lookup.
+
+        Raises:
+            PreprocessorError: If the expression is malformed
+        """
+        key = (expression, self.macros.state)
+        cached = self._conditions.get(key)
+        if cached is not None:
+            return cached
+        macros = self.macros
+        dynamic_expansions = macros.dynamic_expansions
+        expanded = macros.expand(_DEFINED_RE.sub(
+            lambda m: '1' if (m.group(1) or m.group(2)) in macros else '0', expression))
+        try:
+            result = evaluate(expanded) != 0
+        except ExpressionError as e:
+            raise PreprocessorError(f"{self._file}:{self._line}: invalid #if expression {expression!r}: {e}") from None
+        # Conditions using __LINE__ and similar vary with position
+        if macros.dynamic_expansions == dynamic_expansions:
+            if len(self._conditions) >= _CONDITION_CACHE_SIZE:
+                self._conditions.clear()
+            self._conditions[key] = result
+        return result
+
+def _split_lines(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Yield the lines of a string without copying it into a list, or strip
+    the line terminators of an iterable of lines (such as an open file)."""
+    if not isinstance(source, str):
+        # Like str.split('\n'): text ending in a newline has a final empty line
+        terminated = True
+        for line in source:
+            terminated = line.endswith('\n')
+            yield line[:-1] if terminated else line
+        if terminated:
+            yield ''
+        return
+    start = 0
+    while True:
+        end = source.find('\n', start)
+        if end < 0:
+            yield source[start:]
+            return
+        yield source[start:end]
+        start = end + 1
+
+def _strip_comments(text: str) -> str:
+    """Remove comments from directive arguments, leaving string literals intact."""
+    if '/' not in text:
+        return text
+    return _COMMENT_RE.sub(lambda m: ' ' if m.group(1) else m.group(0), text)
+
+def detect_include_guard(text: str) -> Tuple[bool, Optional[str]]:
+    """Find how a header protects itself against repeated inclusion.
+
+    Recognizes #pragma once and the guard idiom: the first directive is
+    #ifndef X (or #if !defined X) and its #endif, without #else/#elif, is
+    the last thing in the file.
+
+    Returns:
+        (has #pragma once, guard macro name or None)
+    """
+    lines = [line.strip() for line in _ALL_COMMENTS_RE.sub(
+        lambda m: ' ' if m.group(1) else m.group(0), text).split('\n')]
+    lines = [line for line in lines if line]
+    once = any(_PRAGMA_ONCE_RE.match(line) for line in lines if line.startswith('#'))
+    match = _GUARD_OPEN_RE.match(lines[0]) if lines else None
+    if match is None:
+        return once, None
+    depth = 0
+    for index, line in enumerate(lines):
+        if not line.startswith('#'):
+            continue
+        name = _DIRECTIVE_RE.match(line).group(1)
+        if name in ('if', 'ifdef', 'ifndef'):
+            depth += 1
+        elif name in ('else', 'elif') and depth == 1:
+            return once, None
+        elif name == 'endif':
+            depth -= 1
+            if depth == 0:
+                return once, (match.group(1) or match.group(2) or match.group(3)) if index == len(lines) - 1 else None
+    return once, None
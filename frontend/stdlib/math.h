@@ -1,3 +1,6 @@
+#ifndef _MATH_H
+#define _MATH_H
+
 // Mathematical functions
 double sin(double x);
 double cos(double x);
@@ -25,3 +28,5 @@ double fmod(double x, double y);
 // Constants
 #define M_PI 3.14159265358979323846
 #define M_E 2.7182818284590452354
+
+#endif
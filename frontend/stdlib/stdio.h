@@ -1,3 +1,6 @@
+#ifndef _STDIO_H
+#define _STDIO_H
+
 // Standard I/O functions - simplified for parser compatibility
 int printf(char *format);
 int scanf(char *format);
@@ -11,4 +14,5 @@ int fclose(int stream);
 int fprintf(int stream, char *format);
 int fscanf(int stream, char *format);
 int fgetc(int stream);
-int fputc(int c, int stream);
\ No newline at end of file
+int fputc(int c, int stream);
+#endif
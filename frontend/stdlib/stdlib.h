@@ -1,3 +1,6 @@
+#ifndef _STDLIB_H
+#define _STDLIB_H
+
 // Standard library functions - simplified for parser compatibility
 int malloc(unsigned long size);
 void free(int ptr);
@@ -24,3 +27,5 @@ char *getenv(char *name);
 #define NULL 0
 #define EXIT_SUCCESS 0
 #define EXIT_FAILURE 1
+
+#endif
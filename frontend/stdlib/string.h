@@ -1,3 +1,6 @@
+#ifndef _STRING_H
+#define _STRING_H
+
 // String manipulation functions - simplified for parser compatibility
 unsigned long strlen(char *str);
 char *strcpy(char *dest, char *src);
@@ -16,3 +19,5 @@ int memmove(int dest, int src, unsigned long n);
 int memcmp(int ptr1, int ptr2, unsigned long n);
 int memset(int ptr, int value, unsigned long n);
 int memchr(int ptr, int value, unsigned long n);
+
+#endif
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import math
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_STATUS_MESSAGES = {
+    'crashed': "Program crashed",
+    'timed_out': "Time limit exceeded",
+    'memory_exceeded': "Memory limit exceeded",
+    'output_exceeded': "Output limit exceeded",
+}
+
+@dataclass
+class ExecutionLimits:
+    """Resource limits for one program run; 0 means unlimited."""
+    cpu_time: float = 0.0
+    wall_time: float = 0.0
+    memory: int = 0
+    output: int = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['ExecutionLimits']:
+        """Build limits from cpu_time_limit / wall_time_limit (seconds),
+        memory_limit_mb and output_limit_kb; returns None when none are set."""
+        limits = cls(
+            cpu_time=float(config.get('cpu_time_limit') or 0),
+            wall_time=float(config.get('wall_time_limit') or 0),
+            memory=int(float(config.get('memory_limit_mb') or 0) * 1024 * 1024),
+            output=int(float(config.get('output_limit_kb') or 0) * 1024),
+        )
+        return limits if limits.enabled else None
+
+    @property
+    def enabled(self) -> bool:
+        return any((self.cpu_time, self.wall_time, self.memory, self.output))
+
+    def apply_rlimits(self, address_space: int) -> None:
+        """Install kernel limits in the (forked) process about to run the program.
+
+        Args:
+            address_space: Current virtual memory size of the process; the
+                address-space backstop is set relative to it
+        """
+        if resource is None:
+            return
+        if self.cpu_time:
+            seconds = math.ceil(self.cpu_time)
+            # SIGXCPU at the soft limit, SIGKILL one second later
+            resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+        if self.memory and address_space:
+            # Backstop against allocations outrunning the RSS watchdog
+            limit = address_space + 2 * self.memory
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+@dataclass
+class ExecutionResult:
+    """Outcome of running a program's main function once."""
+    exit_code: int
+    output: str
+    wall_time: float
+    status: str = 'ok'
+    cpu_time: Optional[float] = None
+    peak_memory: Optional[int] = None
+    jit_time: float = 0.0
+    fork_latency: float = 0.0
+    worker_pid: Optional[int] = None
+
+    @property
+    def error(self) -> Optional[str]:
+        """Human readable failure reason, or None for a normal exit."""
+        if self.status == 'ok':
+            return None
+        return f"{_STATUS_MESSAGES.get(self.status, self.status)} (exit code {self.exit_code})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'status': self.status,
+            'exit_code': self.exit_code,
+            'output': self.output,
+            'wall_time_ms': round(self.wall_time * 1000, 3),
+            'cpu_time_ms': None if self.cpu_time is None else round(self.cpu_time * 1000, 3),
+            'peak_memory_kb': None if self.peak_memory is None else self.peak_memory // 1024,
+            'jit_time_ms': round(self.jit_time * 1000, 3),
+            'fork_latency_ms': round(self.fork_latency * 1000, 3),
+            'worker_pid': self.worker_pid,
+        }
+
+def process_memory(pid: int) -> Tuple[int, int]:
+    """Return (virtual size, resident size) of a process in bytes, or (0, 0) if unknown."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            fields = f.read().split()
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        return int(fields[0]) * page_size, int(fields[1]) * page_size
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0, 0
+
+def max_rss_bytes(rusage: Any) -> int:
+    """ru_maxrss in bytes (Linux reports KiB, macOS bytes)."""
+    return rusage.ru_maxrss if sys.platform == 'darwin' else rusage.ru_maxrss * 1024
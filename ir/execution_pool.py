@@ -0,0 +1,293 @@
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple
+import atexit
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from llvmlite import binding as llvm
+from .execution import ExecutionLimits, ExecutionResult
+from .ir_executor import IRExecutor
+
+# Run once in the parent before forking so children inherit a JIT that has
+# already generated code and resolved its libc symbols
+_WARMUP_IR = """
+define i32 @"main"()
+{
+entry:
+  ret i32 0
+}
+"""
+
+class _Worker:
+    """Parent-side handle of a forked execution child."""
+
+    def __init__(self, pid: int, conn: Connection, fork_latency: float):
+        self.pid = pid
+        self.conn = conn
+        self.fork_latency = fork_latency
+        self.runs = 0
+
+class ExecutionPool:
+    """Runs JIT'd programs in children forked from a warmed-up parent.
+
+    The parent owns a fully initialized IRExecutor (LLVM targets, MCJIT
+    engines, libc symbols). Children are forked from it copy-on-write, so
+    they start with all of that state for the cost of a fork, and a program
+    that crashes only takes down its child. Each child serves up to
+    max_runs_per_child requests before it is replaced by a fresh fork.
+
+    Only available where os.fork exists. Forking happens on the calling
+    thread, which must not race other threads using LLVM: pass the lock
+    that guards compilation as fork_lock and every fork takes it.
+    """
+
+    def __init__(self, executor: IRExecutor, max_workers: int = 4, max_runs_per_child: int = 100,
+                 prestart: bool = True, fork_lock: Optional[threading.RLock] = None):
+        """Initialize the pool.
+
+        Args:
+            executor: Warmed executor inherited by every child
+            max_workers: Maximum number of concurrently running children
+            max_runs_per_child: Requests served by a child before it is recycled
+            prestart: Fork max_workers children immediately
+            fork_lock: Lock held by other threads while they use LLVM
+        """
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("ExecutionPool requires os.fork")
+        self.logger = logging.getLogger(__name__)
+        self.executor = executor
+        self.max_workers = max(1, max_workers)
+        self.max_runs_per_child = max(1, max_runs_per_child)
+        self._lock = threading.Lock()
+        self._fork_lock = fork_lock if fork_lock is not None else threading.RLock()
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._idle: List[_Worker] = []
+        self._workers: Dict[int, _Worker] = {}
+        self._closed = False
+        self.forks = 0
+        self.fork_time = 0.0
+        self.runs = 0
+        self.crashes = 0
+        self.recycled = 0
+
+        try:
+            executor.execute(_WARMUP_IR)
+        except Exception as e:
+            self.logger.warning(f"Execution pool warm-up failed: {e}")
+        if prestart:
+            for _ in range(self.max_workers):
+                self._idle.append(self._spawn())
+        atexit.register(self.shutdown)
+
+    def _spawn(self) -> _Worker:
+        """Fork a new child and return its handle."""
+        parent_conn, child_conn = multiprocessing.Pipe()
+        with self._fork_lock:
+            start = time.perf_counter()
+            pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                parent_conn.close()
+                self._child_main(child_conn)
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+        fork_latency = time.perf_counter() - start
+        child_conn.close()
+        worker = _Worker(pid, parent_conn, fork_latency)
+        with self._lock:
+            self._workers[pid] = worker
+            self.forks += 1
+            self.fork_time += fork_latency
+        self.logger.debug(f"Forked execution child {pid} in {fork_latency * 1000:.3f} ms")
+        return worker
+
+    def _child_main(self, conn: Connection) -> None:
+        """Serve execution requests until the parent closes the connection."""
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        # Locks held by other parent threads at fork time are never released here
+        IRExecutor._io_lock = threading.Lock()
+        for worker in self._workers.values():
+            worker.conn.close()
+        while True:
+            try:
+                request = conn.recv()
+            except (EOFError, OSError):
+                return
+            if request is None:
+                return
+            bitcode, inputs, optimization_level, limits = request
+            try:
+                module = llvm.parse_bitcode(bitcode)
+                for result in self.executor.iter_cases(module, inputs, optimization_level, limits):
+                    conn.send(('result', result))
+            except Exception as e:
+                conn.send(('error', str(e)))
+
+    def _acquire(self) -> Tuple[_Worker, float]:
+        """Take an idle child, forking one if needed; returns (worker, fork latency paid)."""
+        self._slots.acquire()
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise RuntimeError("Execution pool is shut down")
+            if self._idle:
+                return self._idle.pop(), 0.0
+        try:
+            worker = self._spawn()
+            return worker, worker.fork_latency
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, worker: _Worker, reusable: bool) -> None:
+        try:
+            if reusable and worker.runs < self.max_runs_per_child and not self._closed:
+                with self._lock:
+                    self._idle.append(worker)
+            else:
+                if reusable:
+                    with self._lock:
+                        self.recycled += 1
+                self._retire(worker)
+        finally:
+            self._slots.release()
+
+    def _retire(self, worker: _Worker) -> int:
+        """Stop a child and reap it, returning its wait status."""
+        try:
+            worker.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        worker.conn.close()
+        try:
+            _, wait_status = os.waitpid(worker.pid, 0)
+        except ChildProcessError:
+            wait_status = 0
+        with self._lock:
+            self._workers.pop(worker.pid, None)
+        return wait_status
+
+    def execute(self, bitcode: bytes, stdin_data: str | bytes | None = None,
+                optimization_level: int = 0, limits: Optional[ExecutionLimits] = None) -> ExecutionResult:
+        """Run a program once in a child.
+
+        Args:
+            bitcode: Optimized module as LLVM bitcode
+            stdin_data: Optional string/bytes fed to the program's stdin
+            optimization_level: Codegen optimization level (0-3)
+            limits: Optional resource limits (see IRExecutor.run_cases)
+
+        Returns:
+            ExecutionResult for the run
+        """
+        return self.run_cases(bitcode, [stdin_data], optimization_level, limits)[0]
+
+    def run_cases(self, bitcode: bytes, inputs: List[str | bytes | None],
+                  optimization_level: int = 0, limits: Optional[ExecutionLimits] = None) -> List[ExecutionResult]:
+        """Run a program against each input, JIT-compiling it once per child.
+
+        The inputs are split into contiguous chunks, one per idle child, and
+        the chunks run in parallel. A case that crashes its child is
+        reported with status 'crashed' and a negative exit code (the signal
+        number); the remaining cases of its chunk continue in a fresh child.
+
+        Args:
+            bitcode: Optimized module as LLVM bitcode
+            inputs: Stdin contents, one per run
+            optimization_level: Codegen optimization level (0-3)
+            limits: Optional resource limits; the child runs each case in its
+                own forked grandchild and acts as its watchdog
+
+        Returns:
+            One ExecutionResult per input, in input order
+        """
+        with self._lock:
+            children = min(len(inputs), max(1, len(self._idle)))
+        if children <= 1:
+            return self._run_chunk(bitcode, inputs, optimization_level, limits)
+        chunk_size = -(-len(inputs) // children)
+        chunks = [inputs[i:i + chunk_size] for i in range(0, len(inputs), chunk_size)]
+        chunk_results: List[Optional[List[ExecutionResult]]] = [None] * len(chunks)
+        errors: List[BaseException] = []
+
+        def run(index: int) -> None:
+            try:
+                chunk_results[index] = self._run_chunk(bitcode, chunks[index], optimization_level, limits)
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(index,), daemon=True) for index in range(1, len(chunks))]
+        for thread in threads:
+            thread.start()
+        run(0)
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return [result for chunk in chunk_results for result in chunk]
+
+    def _run_chunk(self, bitcode: bytes, inputs: List[str | bytes | None], optimization_level: int,
+                   limits: Optional[ExecutionLimits]) -> List[ExecutionResult]:
+        """Run inputs one after another, JIT-compiling once per child used."""
+        results: List[ExecutionResult] = []
+        while len(results) < len(inputs):
+            pending = inputs[len(results):]
+            worker, fork_latency = self._acquire()
+            worker.runs += 1
+            reusable = False
+            try:
+                worker.conn.send((bitcode, pending, optimization_level, limits))
+                for _ in pending:
+                    kind, payload = worker.conn.recv()
+                    if kind == 'error':
+                        reusable = True
+                        raise RuntimeError(payload)
+                    payload.fork_latency = fork_latency
+                    payload.worker_pid = worker.pid
+                    results.append(payload)
+                    fork_latency = 0.0
+                reusable = True
+            except (EOFError, OSError):
+                pid = worker.pid
+                exit_code = os.waitstatus_to_exitcode(self._retire(worker))
+                worker = None
+                with self._lock:
+                    self.crashes += 1
+                self.logger.warning(f"Execution child {pid} crashed with exit code {exit_code}")
+                results.append(ExecutionResult(exit_code, '', 0.0, 'crashed', fork_latency=fork_latency, worker_pid=pid))
+            finally:
+                if worker is not None:
+                    self._release(worker, reusable)
+                else:
+                    self._slots.release()
+        with self._lock:
+            self.runs += len(results)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Return fork, run and recycling counters."""
+        with self._lock:
+            return {
+                'children': len(self._workers),
+                'idle_children': len(self._idle),
+                'runs': self.runs,
+                'forks': self.forks,
+                'fork_time_ms': round(self.fork_time * 1000, 3),
+                'avg_fork_ms': round(self.fork_time / self.forks * 1000, 3) if self.forks else 0,
+                'crashes': self.crashes,
+                'recycled': self.recycled,
+            }
+
+    def shutdown(self) -> None:
+        """Stop all idle children; busy children are retired when they finish."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._retire(worker)
@@ -1,26 +1,68 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from llvmlite import ir
 from llvmlite import binding as llvm
 import ctypes
+import logging
 import os
+import select
+import signal
 import sys
-import tempfile
+import threading
+import time
 if os.name == "nt":
     import ctypes.wintypes as wintypes
+    import msvcrt
+from .execution import ExecutionLimits, ExecutionResult, max_rss_bytes, process_memory
+from .object_cache import ObjectCache
+
+# Largest stdin payload written synchronously; bigger inputs are fed by a
+# writer thread so a program that never reads stdin cannot deadlock us.
+_PIPE_WRITE_INLINE = 4096
+
+# How often the watchdog checks wall time and memory of a limited run
+_WATCHDOG_INTERVAL = 0.01
 
 class IRExecutor:
     """Executes LLVM IR code and returns the result."""
 
-    def __init__(self):
-        """Initialize the LLVM execution engine."""
+    # JIT'd programs write to the process-wide fds 0/1, so redirection is
+    # serialized across all executors in the process.
+    _io_lock = threading.Lock()
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize the LLVM execution engine.
+
+        Args:
+            config: Configuration dictionary; object_cache_enabled,
+                object_cache_dir and object_cache_max_mb control the
+                persistent machine-code cache
+        """
+        self.config = config or {}
+        self.logger = logging.getLogger(__name__)
         # Initialize LLVM
         llvm.initialize()
         llvm.initialize_native_target()
         llvm.initialize_native_asmprinter()
 
-        # Create execution engine
+        # Create execution engine; its codegen level matches -O0, engines for
+        # other optimization levels are created on demand by _engine_for()
         self.target = llvm.Target.from_default_triple()
-        self.target_machine = self.target.create_target_machine()
+        self.target_machine = self.target.create_target_machine(opt=0)
         self.engine = llvm.create_mcjit_compiler(llvm.parse_assembly(""), self.target_machine)
+        self._engines = {0: self.engine}
+
+        # Persistent machine code cache: repeated programs skip native codegen
+        self.object_cache = None
+        if self.config.get('object_cache_enabled', True):
+            try:
+                self.object_cache = ObjectCache(
+                    self.config.get('object_cache_dir'),
+                    max_bytes=int(self.config.get('object_cache_max_mb', 256)) * 1024 * 1024,
+                )
+                self.object_cache.attach(self.engine, self.target_machine, 0)
+            except OSError as e:
+                self.logger.warning(f"Object cache disabled: {e}")
+                self.object_cache = None
 
         # Set the data layout
         self.data_layout = self.target_machine.target_data
@@ -53,285 +95,415 @@ class IRExecutor:
                         llvm.add_symbol("scanf", scanf_addr)
                 except Exception:
                     pass
+                # Library calls the optimizer may rewrite printf into
+                for name in ("puts", "putchar"):
+                    try:
+                        addr = ctypes.cast(getattr(self.libc, name), ctypes.c_void_p).value
+                        if addr:
+                            llvm.add_symbol(name, addr)
+                    except Exception:
+                        pass
         except Exception:
             # Non-fatal: execution may still work if the platform resolves symbols implicitly
             pass
     
-    def execute(self, ir_code: str, stdin_data: str | bytes | None = None):
+    def _engine_for(self, optimization_level: int):
+        """Return an MCJIT engine whose native codegen runs at the given level.
+
+        Callers pass a level already clamped by IROptimizer.clamp_level.
+        """
+        level = max(0, min(3, optimization_level))
+        engine = self._engines.get(level)
+        if engine is None:
+            target_machine = self.target.create_target_machine(opt=level)
+            engine = llvm.create_mcjit_compiler(llvm.parse_assembly(""), target_machine)
+            if self.object_cache is not None:
+                self.object_cache.attach(engine, target_machine, level)
+            self._engines[level] = engine
+        return engine
+
+    def execute(self, ir_code: str | llvm.ModuleRef, stdin_data: str | bytes | None = None, optimization_level: int = 0):
         """Execute LLVM IR code, capturing stdout and providing optional stdin.
 
+        Stdout and stdin are connected to in-memory pipes for the duration of
+        the run; no temporary files are created. IR-level optimization is done
+        beforehand by IROptimizer; optimization_level here selects the native
+        codegen level.
+
         Args:
-            ir_code: LLVM IR code to execute
+            ir_code: LLVM IR code to execute, or an already parsed and verified
+                module (which is handed straight to the JIT)
             stdin_data: Optional string/bytes to feed to the program via stdin
+            optimization_level: Codegen optimization level (0-3)
 
         Returns:
             Tuple of (exit_code: int, stdout: str)
         """
-        mod = None
-        tmp_path = None
-        saved_stdout_fd = None
-        stdin_tmp_path = None
-        saved_stdin_fd = None
-        windows_redirect_used = False
-        windows_stdin_redirect_used = False
+        engine = self._engine_for(optimization_level)
+        try:
+            mod, main_func = self._load(ir_code, engine)
+        except Exception as e:
+            raise RuntimeError(f"Failed to execute LLVM IR: {str(e)}")
+        try:
+            with self._io_lock:
+                return self._run_captured(main_func, self._stdin_bytes(stdin_data))
+        except Exception as e:
+            raise RuntimeError(f"Failed to execute LLVM IR: {str(e)}")
+        finally:
+            self._unload(engine, mod)
+
+    def run_cases(self, ir_code: str | llvm.ModuleRef, inputs: List[str | bytes | None],
+                  optimization_level: int = 0, limits: Optional[ExecutionLimits] = None) -> List[ExecutionResult]:
+        """JIT a module once and run its main function against each input.
+
+        Args:
+            ir_code: LLVM IR code, or an already parsed and verified module
+            inputs: Stdin contents, one per run
+            optimization_level: Codegen optimization level (0-3)
+            limits: Optional resource limits; when set, each run happens in a
+                forked child that is killed when it exceeds them
 
+        Returns:
+            One ExecutionResult per input
+        """
+        return list(self.iter_cases(ir_code, inputs, optimization_level, limits))
+
+    def iter_cases(self, ir_code: str | llvm.ModuleRef, inputs: Iterable[str | bytes | None],
+                   optimization_level: int = 0, limits: Optional[ExecutionLimits] = None) -> Iterator[ExecutionResult]:
+        """Generator form of run_cases, yielding each result as soon as it is ready.
+
+        Generated programs only use constant globals, so main can be re-entered
+        without reloading the module between runs.
+        """
+        if limits is not None and not hasattr(os, "fork"):
+            self.logger.warning("Execution limits require os.fork; running without limits")
+            limits = None
+        engine = self._engine_for(optimization_level)
+        jit_start = time.perf_counter()
+        try:
+            mod, main_func = self._load(ir_code, engine)
+        except Exception as e:
+            raise RuntimeError(f"Failed to execute LLVM IR: {str(e)}")
+        # Code generation is paid once; it is reported on the first result
+        jit_time = time.perf_counter() - jit_start
         try:
-            # Parse the IR code
+            for stdin_data in inputs:
+                stdin_bytes = self._stdin_bytes(stdin_data)
+                try:
+                    if limits is not None:
+                        result = self._run_limited(main_func, stdin_bytes, limits)
+                    else:
+                        with self._io_lock:
+                            start = time.perf_counter()
+                            exit_code, stdout = self._run_captured(main_func, stdin_bytes)
+                            result = ExecutionResult(exit_code, stdout, time.perf_counter() - start)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to execute LLVM IR: {str(e)}")
+                result.jit_time, jit_time = jit_time, 0.0
+                yield result
+        finally:
+            self._unload(engine, mod)
+
+    def _load(self, ir_code: str | llvm.ModuleRef, engine: llvm.ExecutionEngine):
+        """Add a module to engine, generate its code and return (module, main)."""
+        # Parse the IR code
+        if isinstance(ir_code, llvm.ModuleRef):
+            mod = ir_code
+        else:
             mod = llvm.parse_assembly(ir_code)
             mod.verify()
 
-            # Set the data layout
-            mod.data_layout = str(self.data_layout)
+        # Set the data layout
+        mod.data_layout = str(self.data_layout)
 
-            # Add the module to the engine
-            self.engine.add_module(mod)
-            self.engine.finalize_object()
+        # Add the module to the engine
+        engine.add_module(mod)
+        try:
+            engine.finalize_object()
 
             # Get the main function
-            main_addr = self.engine.get_function_address("main")
+            main_addr = engine.get_function_address("main")
             if not main_addr:
                 raise RuntimeError("No 'main' function found in the module")
-            main_func = ctypes.CFUNCTYPE(ctypes.c_int)(main_addr)
+        except Exception:
+            self._unload(engine, mod)
+            raise
+        return mod, ctypes.CFUNCTYPE(ctypes.c_int)(main_addr)
 
-            # Prepare stdout capture
-            try:
-                sys.stdout.flush()
-            except Exception:
-                pass
-            try:
-                if self.libc is not None:
-                    self.libc.fflush(None)
-            except Exception:
-                pass
+    @staticmethod
+    def _unload(engine: llvm.ExecutionEngine, mod: llvm.ModuleRef) -> None:
+        try:
+            engine.remove_module(mod)
+        except Exception:
+            pass
 
-            fd, tmp_path = tempfile.mkstemp(prefix="jit_stdout_", suffix=".txt")
-            os.close(fd)
+    @staticmethod
+    def _stdin_bytes(stdin_data: str | bytes | None) -> bytes:
+        if stdin_data is None:
+            return b""
+        if isinstance(stdin_data, str):
+            return stdin_data.encode("utf-8")
+        return bytes(stdin_data)
 
-            # Prepare stdin capture (provide data if any; use empty file to avoid blocking)
-            fd_in, stdin_tmp_path = tempfile.mkstemp(prefix="jit_stdin_", suffix=".txt")
-            os.close(fd_in)
+    def _flush_stdio(self) -> None:
+        """Flush Python and C stdio buffers so output lands in the right place."""
+        try:
+            sys.stdout.flush()
+        except Exception:
+            pass
+        try:
+            if self.libc is not None:
+                self.libc.fflush(None)
+        except Exception:
+            pass
+
+    def _reset_c_stdin(self) -> None:
+        """Clear C stdin EOF/error indicators (from earlier runs or the host's own stdin)."""
+        if self.libc is None or os.name == "nt":
+            return
+        try:
+            stdin_ptr = ctypes.c_void_p.in_dll(self.libc, "stdin")
+            self.libc.clearerr(stdin_ptr)
+        except Exception:
+            pass
+
+    def _open_pipes(self):
+        """Create the stdin/stdout pipes for one run.
+
+        Returns:
+            Tuple of (stdout_read_fd, stdout_write_fd, stdin_read_fd, stdin_write_fd).
+            On Windows the write/read ends handed to the program are MSVCRT fds
+            and the ends we keep are Python fds.
+        """
+        if os.name != "nt" or self.libc is None:
+            out_r, out_w = os.pipe()
+            in_r, in_w = os.pipe()
+            return out_r, out_w, in_r, in_w
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.CreatePipe.argtypes = [ctypes.POINTER(wintypes.HANDLE), ctypes.POINTER(wintypes.HANDLE),
+                                        wintypes.LPVOID, wintypes.DWORD]
+        kernel32.CreatePipe.restype = wintypes.BOOL
+        _open_osfhandle = self.libc._open_osfhandle
+        _open_osfhandle.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        _open_osfhandle.restype = ctypes.c_int
+
+        def create_pipe():
+            h_read, h_write = wintypes.HANDLE(), wintypes.HANDLE()
+            if not kernel32.CreatePipe(ctypes.byref(h_read), ctypes.byref(h_write), None, 0):
+                raise OSError("CreatePipe failed")
+            return h_read.value, h_write.value
+
+        out_read_h, out_write_h = create_pipe()
+        in_read_h, in_write_h = create_pipe()
+        out_r = msvcrt.open_osfhandle(out_read_h, os.O_RDONLY)
+        in_w = msvcrt.open_osfhandle(in_write_h, 0)
+        out_w = _open_osfhandle(out_write_h, 0)
+        in_r = _open_osfhandle(in_read_h, 0)
+        return out_r, out_w, in_r, in_w
+
+    def _fd_ops(self):
+        """Return (dup, dup2, close) for the C runtime the JIT'd code writes through."""
+        if os.name == "nt" and self.libc is not None:
+            _dup = self.libc._dup
+            _dup.argtypes = [ctypes.c_int]
+            _dup.restype = ctypes.c_int
+            _dup2 = self.libc._dup2
+            _dup2.argtypes = [ctypes.c_int, ctypes.c_int]
+            _dup2.restype = ctypes.c_int
+            _close = self.libc._close
+            _close.argtypes = [ctypes.c_int]
+            _close.restype = ctypes.c_int
+            return _dup, _dup2, _close
+        return os.dup, os.dup2, os.close
+
+    def _run_captured(self, main_func, stdin_bytes: bytes):
+        """Run main with fds 0/1 redirected to in-memory pipes.
+
+        Returns:
+            Tuple of (exit_code: int, stdout: str)
+        """
+        dup, dup2, close = self._fd_ops()
+        chunks = []
+
+        def drain(fd):
             try:
-                data_bytes = b""
-                if stdin_data is not None:
-                    if isinstance(stdin_data, str):
-                        data_bytes = stdin_data.encode("utf-8")
-                    elif isinstance(stdin_data, (bytes, bytearray)):
-                        data_bytes = bytes(stdin_data)
-                with open(stdin_tmp_path, "wb") as fin:
-                    fin.write(data_bytes)
-            except Exception:
-                pass
-
-            # Redirect stdout and stdin
-            if os.name == "nt" and self.libc is not None:
-                # Windows: redirect MSVCRT stdout using _open_osfhandle + _dup2
-                try:
-                    kernel32 = ctypes.windll.kernel32
-                    GENERIC_WRITE = 0x40000000
-                    GENERIC_READ = 0x80000000
-                    FILE_SHARE_READ = 0x00000001
-                    CREATE_ALWAYS = 2
-                    OPEN_EXISTING = 3
-                    FILE_ATTRIBUTE_NORMAL = 0x00000080
-                    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
-
-                    kernel32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD,
-                                                     wintypes.LPVOID, wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
-                    kernel32.CreateFileW.restype = wintypes.HANDLE
-
-                    hFile = kernel32.CreateFileW(tmp_path, GENERIC_WRITE, FILE_SHARE_READ, None,
-                                                  CREATE_ALWAYS, FILE_ATTRIBUTE_NORMAL, None)
-                    if hFile and hFile != INVALID_HANDLE_VALUE:
-                        _open_osfhandle = self.libc._open_osfhandle
-                        _open_osfhandle.argtypes = [ctypes.c_void_p, ctypes.c_int]
-                        _open_osfhandle.restype = ctypes.c_int
-
-                        _dup = self.libc._dup
-                        _dup.argtypes = [ctypes.c_int]
-                        _dup.restype = ctypes.c_int
-
-                        _dup2 = self.libc._dup2
-                        _dup2.argtypes = [ctypes.c_int, ctypes.c_int]
-                        _dup2.restype = ctypes.c_int
-
-                        _close = self.libc._close
-                        _close.argtypes = [ctypes.c_int]
-                        _close.restype = ctypes.c_int
-
-                        msvcrt_fd = _open_osfhandle(hFile, 0)
-                        saved_stdout_fd = _dup(1)
-                        if msvcrt_fd >= 0 and saved_stdout_fd >= 0:
-                            if _dup2(msvcrt_fd, 1) == 0:
-                                windows_redirect_used = True
-                        # Don't close hFile here; closing msvcrt_fd will close the handle
-                    else:
-                        windows_redirect_used = False
-                except Exception:
-                    windows_redirect_used = False
+                while True:
+                    data = os.read(fd, 65536)
+                    if not data:
+                        break
+                    chunks.append(data)
+            finally:
+                os.close(fd)
 
-                # Redirect stdin for MSVCRT
-                try:
-                    hIn = kernel32.CreateFileW(stdin_tmp_path, GENERIC_READ, FILE_SHARE_READ, None,
-                                               OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, None)
-                    if hIn and hIn != INVALID_HANDLE_VALUE:
-                        _open_osfhandle = self.libc._open_osfhandle
-                        _open_osfhandle.argtypes = [ctypes.c_void_p, ctypes.c_int]
-                        _open_osfhandle.restype = ctypes.c_int
-
-                        _dup = self.libc._dup
-                        _dup.argtypes = [ctypes.c_int]
-                        _dup.restype = ctypes.c_int
-
-                        _dup2 = self.libc._dup2
-                        _dup2.argtypes = [ctypes.c_int, ctypes.c_int]
-                        _dup2.restype = ctypes.c_int
-
-                        msvcrt_in_fd = _open_osfhandle(hIn, 0)
-                        saved_stdin_fd = _dup(0)
-                        if msvcrt_in_fd >= 0 and saved_stdin_fd >= 0:
-                            if _dup2(msvcrt_in_fd, 0) == 0:
-                                windows_stdin_redirect_used = True
-                    else:
-                        windows_stdin_redirect_used = False
-                except Exception:
-                    windows_stdin_redirect_used = False
-
-            if not windows_redirect_used:
-                # POSIX-compatible dup2 fallback for stdout
-                fd_stdout = 1
-                saved_stdout_fd = os.dup(fd_stdout)
-                cap_fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
-                os.dup2(cap_fd, fd_stdout)
-                os.close(cap_fd)
-
-            if not windows_stdin_redirect_used:
-                # POSIX-compatible stdin redirect
-                fd_stdin = 0
-                saved_stdin_fd = os.dup(fd_stdin)
-                in_fd = os.open(stdin_tmp_path, os.O_RDONLY)
-                os.dup2(in_fd, fd_stdin)
-                os.close(in_fd)
-
-            # Execute the main function
+        def feed(fd, data):
+            try:
+                _write_all(fd, data)
+            except OSError:
+                pass  # Program exited without reading all of its input
+            finally:
+                os.close(fd)
+
+        self._flush_stdio()
+        out_r, out_w, in_r, in_w = self._open_pipes()
+        saved_stdout_fd = dup(1)
+        saved_stdin_fd = dup(0)
+        reader = threading.Thread(target=drain, args=(out_r,), daemon=True)
+        reader.start()
+        writer = None
+        try:
+            dup2(out_w, 1)
+            close(out_w)
+            dup2(in_r, 0)
+            close(in_r)
+            if len(stdin_bytes) <= _PIPE_WRITE_INLINE:
+                feed(in_w, stdin_bytes)
+            else:
+                writer = threading.Thread(target=feed, args=(in_w, stdin_bytes), daemon=True)
+                writer.start()
+
+            # Execute the main function; EOF/error flags on C stdin may be
+            # left over from an earlier run or inherited from our own stdin
+            self._reset_c_stdin()
             exit_code = main_func()
 
             # Flush C stdio after execution to ensure buffers are written
-            try:
-                if self.libc is not None:
-                    self.libc.fflush(None)
-            except Exception:
-                pass
+            self._flush_stdio()
+        finally:
+            # Restoring fd 1 drops the last write end, which ends the reader
+            dup2(saved_stdout_fd, 1)
+            close(saved_stdout_fd)
+            dup2(saved_stdin_fd, 0)
+            close(saved_stdin_fd)
+            reader.join()
+            if writer is not None:
+                writer.join()
 
-            # Restore original stdout
-            if windows_redirect_used and os.name == "nt" and self.libc is not None:
-                try:
-                    _dup2 = self.libc._dup2
-                    _dup2.argtypes = [ctypes.c_int, ctypes.c_int]
-                    _dup2.restype = ctypes.c_int
-                    _close = self.libc._close
-                    _close.argtypes = [ctypes.c_int]
-                    _close.restype = ctypes.c_int
-                    if saved_stdout_fd is not None and saved_stdout_fd >= 0:
-                        _dup2(saved_stdout_fd, 1)
-                        _close(saved_stdout_fd)
-                        saved_stdout_fd = None
-                except Exception:
-                    pass
-            else:
-                if saved_stdout_fd is not None:
-                    try:
-                        os.dup2(saved_stdout_fd, 1)
-                    finally:
-                        os.close(saved_stdout_fd)
-                        saved_stdout_fd = None
+        return exit_code, b"".join(chunks).decode("utf-8", errors="replace")
 
-            # Restore original stdin
-            if windows_stdin_redirect_used and os.name == "nt" and self.libc is not None:
-                try:
-                    _dup2 = self.libc._dup2
-                    _dup2.argtypes = [ctypes.c_int, ctypes.c_int]
-                    _dup2.restype = ctypes.c_int
-                    _close = self.libc._close
-                    _close.argtypes = [ctypes.c_int]
-                    _close.restype = ctypes.c_int
-                    if saved_stdin_fd is not None and saved_stdin_fd >= 0:
-                        _dup2(saved_stdin_fd, 0)
-                        _close(saved_stdin_fd)
-                        saved_stdin_fd = None
-                except Exception:
-                    pass
-            else:
-                if saved_stdin_fd is not None:
-                    try:
-                        os.dup2(saved_stdin_fd, 0)
-                    finally:
-                        os.close(saved_stdin_fd)
-                        saved_stdin_fd = None
 
-            # Read captured output
-            stdout_data = ""
-            try:
-                with open(tmp_path, "rb") as f:
-                    stdout_data = f.read().decode("utf-8", errors="replace")
-            finally:
-                try:
-                    if tmp_path and os.path.exists(tmp_path):
-                        os.remove(tmp_path)
-                except Exception:
-                    pass
-                try:
-                    if stdin_tmp_path and os.path.exists(stdin_tmp_path):
-                        os.remove(stdin_tmp_path)
-                except Exception:
-                    pass
+    def _run_limited(self, main_func, stdin_bytes: bytes, limits: ExecutionLimits) -> ExecutionResult:
+        """Run main in a forked child under resource limits.
 
-            return exit_code, stdout_data
+        The child inherits the JIT'd code copy-on-write, gets rlimits for CPU
+        time and address space, and talks to us over pipes. This process acts
+        as the watchdog: it kills the child on wall-clock timeout, when its
+        resident memory grows past the limit or when it writes too much output.
 
-        except Exception as e:
-            raise RuntimeError(f"Failed to execute LLVM IR: {str(e)}")
+        Returns:
+            ExecutionResult with the status and the resources the child used
+        """
+        self._flush_stdio()
+        out_r, out_w = os.pipe()
+        in_r, in_w = os.pipe()
+        address_space, baseline_rss = process_memory(os.getpid())
+        start = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 127
+            try:
+                os.dup2(out_w, 1)
+                os.dup2(in_r, 0)
+                for fd in (out_r, out_w, in_r, in_w):
+                    os.close(fd)
+                limits.apply_rlimits(address_space)
+                self._reset_c_stdin()
+                exit_code = main_func() & 0xFF
+                if self.libc is not None:
+                    self.libc.fflush(None)
+            finally:
+                os._exit(exit_code)
+
+        os.close(out_w)
+        os.close(in_r)
+        stdin_view = memoryview(stdin_bytes)
+        if stdin_view:
+            os.set_blocking(in_w, False)
+        else:
+            os.close(in_w)
+            in_w = None
+        # A pidfd becomes readable when the child exits, so the watchdog wakes immediately
+        try:
+            pid_fd = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            pid_fd = None
+        deadline = start + limits.wall_time if limits.wall_time else None
+        chunks = []
+        output_size = 0
+        status = 'ok'
+        wait_status = rusage = None
+        try:
+            while True:
+                readers = [fd for fd in (out_r, pid_fd) if fd is not None]
+                writers = [in_w] if in_w is not None else []
+                if readers or writers:
+                    readable, writable, _ = select.select(readers, writers, [], _WATCHDOG_INTERVAL)
+                else:
+                    time.sleep(_WATCHDOG_INTERVAL)
+                    readable = writable = []
+                if writable:
+                    try:
+                        stdin_view = stdin_view[os.write(in_w, stdin_view[:65536]):]
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                    except OSError:
+                        stdin_view = stdin_view[:0]  # Program exited or closed its stdin
+                    if not stdin_view:
+                        os.close(in_w)
+                        in_w = None
+                if out_r in readable:
+                    data = os.read(out_r, 65536)
+                    if not data:
+                        os.close(out_r)
+                        out_r = None
+                    else:
+                        chunks.append(data)
+                        output_size += len(data)
+                        if limits.output and output_size > limits.output:
+                            status = 'output_exceeded'
+
+                if out_r is None:
+                    done, wait_status, rusage = os.wait4(pid, os.WNOHANG)
+                    if done:
+                        break
+                if status == 'ok' and deadline is not None and time.perf_counter() >= deadline:
+                    status = 'timed_out'
+                if status == 'ok' and limits.memory and process_memory(pid)[1] - baseline_rss > limits.memory:
+                    status = 'memory_exceeded'
+                if status != 'ok':
+                    os.kill(pid, signal.SIGKILL)
+                    _, wait_status, rusage = os.wait4(pid, 0)
+                    break
         finally:
-            if mod is not None:
+            for fd in (out_r, in_w, pid_fd):
+                if fd is not None:
+                    os.close(fd)
+            if wait_status is None:
                 try:
-                    self.engine.remove_module(mod)
-                except Exception:
+                    os.kill(pid, signal.SIGKILL)
+                    os.wait4(pid, 0)
+                except OSError:
                     pass
-            # Best-effort restoration in case of early exceptions
-            try:
-                if os.name == "nt" and self.libc is not None:
-                    _dup2 = getattr(self.libc, "_dup2", None)
-                    _close = getattr(self.libc, "_close", None)
-                    if _dup2 and saved_stdout_fd is not None and saved_stdout_fd >= 0:
-                        _dup2(saved_stdout_fd, 1)
-                        if _close:
-                            _close(saved_stdout_fd)
-                        saved_stdout_fd = None
-                    if _dup2 and saved_stdin_fd is not None and saved_stdin_fd >= 0:
-                        _dup2(saved_stdin_fd, 0)
-                        if _close:
-                            _close(saved_stdin_fd)
-                        saved_stdin_fd = None
-                else:
-                    if saved_stdout_fd is not None:
-                        try:
-                            os.dup2(saved_stdout_fd, 1)
-                        finally:
-                            os.close(saved_stdout_fd)
-                        saved_stdout_fd = None
-                    if saved_stdin_fd is not None:
-                        try:
-                            os.dup2(saved_stdin_fd, 0)
-                        finally:
-                            os.close(saved_stdin_fd)
-                        saved_stdin_fd = None
-            except Exception:
-                pass
-            try:
-                if tmp_path and os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-            except Exception:
-                pass
-            try:
-                if stdin_tmp_path and os.path.exists(stdin_tmp_path):
-                    os.remove(stdin_tmp_path)
-            except Exception:
-                pass
\ No newline at end of file
+        wall_time = time.perf_counter() - start
+
+        exit_code = os.waitstatus_to_exitcode(wait_status)
+        cpu_time = rusage.ru_utime + rusage.ru_stime
+        peak_memory = max(0, max_rss_bytes(rusage) - baseline_rss)
+        if status == 'ok':
+            if limits.memory and peak_memory > limits.memory:
+                status = 'memory_exceeded'
+            elif limits.cpu_time and (cpu_time > limits.cpu_time or exit_code == -signal.SIGXCPU):
+                status = 'timed_out'
+            elif exit_code < 0:
+                status = 'crashed'
+        output = b"".join(chunks)
+        if limits.output:
+            output = output[:limits.output]
+        return ExecutionResult(exit_code, output.decode("utf-8", errors="replace"), wall_time, status,
+                               cpu_time=cpu_time, peak_memory=peak_memory)
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
@@ -123,7 +123,9 @@ class IRGenerator:
             func = self.module.get_global(node.name)
         else:
             func = ir.Function(self.module, func_type, name=node.name)
-        func.attributes.add('noinline')
+        # Keep functions separate at -O0 so the emitted IR mirrors the source
+        if not self.config.get('optimization_level', 0):
+            func.attributes.add('noinline')
         # Only generate body if not already generated
         if func.is_declaration:
             entry_block = func.append_basic_block('entry')
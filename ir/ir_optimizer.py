@@ -0,0 +1,96 @@
+from typing import Dict, Optional
+import logging
+from llvmlite import binding as llvm
+
+class IROptimizer:
+    """Runs LLVM's standard optimization pipeline over generated IR."""
+
+    # Inliner thresholds clang uses for -O2 and -O3; -O1 only runs the always-inliner
+    INLINING_THRESHOLDS: Dict[int, Optional[int]] = {0: None, 1: None, 2: 225, 3: 275}
+
+    def __init__(self, target_machine: Optional[llvm.TargetMachine] = None):
+        """Initialize the optimizer.
+
+        Args:
+            target_machine: Target machine whose analysis passes (e.g. target
+                transform info for the vectorizers) are added to each pipeline
+        """
+        self.logger = logging.getLogger(__name__)
+        self.target_machine = target_machine
+        self._module_pass_managers: Dict[int, llvm.ModulePassManager] = {}
+
+    @staticmethod
+    def clamp_level(level: Optional[int]) -> int:
+        """Map a requested optimization level onto LLVM's 0-3 range."""
+        try:
+            return max(0, min(3, int(level or 0)))
+        except (TypeError, ValueError):
+            return 0
+
+    def _builder(self, level: int) -> llvm.PassManagerBuilder:
+        pmb = llvm.create_pass_manager_builder()
+        pmb.opt_level = level
+        pmb.size_level = 0
+        threshold = self.INLINING_THRESHOLDS[level]
+        if threshold is not None:
+            pmb.inlining_threshold = threshold
+        pmb.loop_vectorize = level >= 2
+        pmb.slp_vectorize = level >= 2
+        return pmb
+
+    def _module_pass_manager(self, level: int) -> llvm.ModulePassManager:
+        # Module pass managers are module-independent, so build one per level
+        mpm = self._module_pass_managers.get(level)
+        if mpm is None:
+            mpm = llvm.create_module_pass_manager()
+            if self.target_machine is not None:
+                self.target_machine.add_analysis_passes(mpm)
+            self._builder(level).populate(mpm)
+            self._module_pass_managers[level] = mpm
+        return mpm
+
+    def optimize(self, mod: llvm.ModuleRef, level: int) -> llvm.ModuleRef:
+        """Optimize a parsed module in place.
+
+        Args:
+            mod: Parsed and verified LLVM module
+            level: Optimization level (0-3); 0 leaves the module untouched
+
+        Returns:
+            The same module, optimized
+        """
+        level = self.clamp_level(level)
+        if level == 0:
+            return mod
+
+        # Function passes first (per function), then the module pipeline
+        fpm = llvm.create_function_pass_manager(mod)
+        if self.target_machine is not None:
+            self.target_machine.add_analysis_passes(fpm)
+        self._builder(level).populate(fpm)
+        fpm.initialize()
+        for func in mod.functions:
+            if not func.is_declaration:
+                fpm.run(func)
+        fpm.finalize()
+
+        self._module_pass_manager(level).run(mod)
+        self.logger.debug(f"Optimized module at O{level}")
+        return mod
+
+    def optimize_ir(self, ir_code: str, level: int) -> str:
+        """Optimize textual LLVM IR and return the optimized IR text.
+
+        Args:
+            ir_code: LLVM IR code
+            level: Optimization level (0-3)
+
+        Returns:
+            Optimized LLVM IR code (unchanged for level 0)
+        """
+        level = self.clamp_level(level)
+        if level == 0:
+            return ir_code
+        mod = llvm.parse_assembly(ir_code)
+        mod.verify()
+        return str(self.optimize(mod, level))
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import logging
+import os
+import threading
+from llvmlite import binding as llvm
+
+from compile_cache import cache_root, private_directory, read_private, write_private
+
+# Cached objects run as native code, so the directory must be private to the current user
+DEFAULT_CACHE_DIR = cache_root() / 'objcache'
+
+class ObjectCache:
+    """On-disk cache of MCJIT machine code, shared by every process using the directory.
+
+    Objects are keyed by a hash of the optimized module's bitcode together
+    with the target triple, host CPU name/features and codegen optimization
+    level. The directory is bounded in bytes and evicts the least recently
+    used objects (by file mtime, which is refreshed on every hit).
+
+    The directory is scanned once at startup; after that its size is
+    tracked in memory, and it is only rescanned (to pick up objects written
+    by other processes) when an eviction is due.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached objects (created with mode
+                0700 if missing)
+            max_bytes: Upper bound on the total size of cached objects
+
+        Raises:
+            OSError: If the directory cannot be created, or is owned by or
+                writable by another user
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = private_directory(cache_dir if cache_dir else DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pending_keys: Dict[int, str] = {}
+        # File name -> size, least recently used first
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._scan()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        try:
+            self._host = f"{llvm.get_host_cpu_name()}|{llvm.get_host_cpu_features().flatten()}"
+        except Exception:
+            self._host = llvm.get_host_cpu_name()
+
+    def attach(self, engine: llvm.ExecutionEngine, target_machine: llvm.TargetMachine, opt_level: int) -> None:
+        """Install this cache as the object cache of an MCJIT engine."""
+        prefix = f"{target_machine.triple}|{self._host}|O{opt_level}"
+        engine.set_object_cache(
+            notify_func=lambda module, buffer: self._store(module, buffer),
+            getbuffer_func=lambda module: self._load(module, prefix),
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.o"
+
+    def _load(self, module: llvm.ModuleRef, prefix: str) -> Optional[bytes]:
+        """MCJIT getbuffer hook: return cached machine code for module, if any."""
+        digest = hashlib.sha256(prefix.encode('utf-8'))
+        digest.update(module.as_bitcode())
+        key = digest.hexdigest()
+        path = self._path(key)
+        try:
+            data = read_private(path)
+            os.utime(path)
+        except OSError as e:
+            if not isinstance(e, FileNotFoundError):
+                self.logger.warning(f"Ignoring object cache entry {path}: {e}")
+            with self._lock:
+                self.misses += 1
+                self._pending_keys[id(module)] = key
+            return None
+        with self._lock:
+            self.hits += 1
+            if path.name in self._files:
+                self._files.move_to_end(path.name)
+        return data
+
+    def _store(self, module: llvm.ModuleRef, buffer: bytes) -> None:
+        """MCJIT notify hook: persist freshly generated machine code."""
+        with self._lock:
+            key = self._pending_keys.pop(id(module), None)
+        if key is None:
+            return
+        path = self._path(key)
+        try:
+            write_private(path, buffer)
+        except OSError as e:
+            self.logger.warning(f"Failed to write object cache entry {path}: {e}")
+            return
+        with self._lock:
+            self._bytes += len(buffer) - self._files.pop(path.name, 0)
+            self._files[path.name] = len(buffer)
+            over = self._bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def _scan(self) -> None:
+        """Rebuild the in-memory index from the directory, oldest objects first."""
+        entries = []
+        for path in self.cache_dir.glob('*.o'):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, path.name, st.st_size))
+        entries.sort()
+        with self._lock:
+            self._files = OrderedDict((name, size) for _, name, size in entries)
+            self._bytes = sum(self._files.values())
+
+    def _evict(self) -> None:
+        """Delete least recently used objects until the directory is under 90% of max_bytes."""
+        # Other processes may have added or evicted objects since the last scan
+        self._scan()
+        target = self.max_bytes * 9 // 10
+        while True:
+            with self._lock:
+                if self._bytes <= target or not self._files:
+                    return
+                name, size = self._files.popitem(last=False)
+                self._bytes -= size
+            try:
+                (self.cache_dir / name).unlink()
+            except OSError:
+                continue
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and the tracked directory size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'files': len(self._files),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0,
+            }
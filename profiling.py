@@ -0,0 +1,128 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import threading
+import time
+import tracemalloc
+
+# tracemalloc is process-wide: timers profiling memory share one tracing session,
+# started by the first and stopped by the last (unless something else started it)
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+class StageTimer:
+    """Collects high-resolution timings (and optionally peak memory) per pipeline stage.
+
+    Use as a context manager around one compilation. Memory profiling uses
+    tracemalloc, which only sees Python allocations and slows everything
+    down, so it is opt-in.
+    """
+
+    def __init__(self, profile_memory: bool = False):
+        """Initialize the timer.
+
+        Args:
+            profile_memory: Record the peak Python memory allocated in each stage
+        """
+        self.profile_memory = profile_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.cache_hit = False
+        self._tracing = False
+
+    def __enter__(self) -> 'StageTimer':
+        global _tracing_users, _tracing_owned
+        if self.profile_memory and not self._tracing:
+            with _tracing_lock:
+                if _tracing_users == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _tracing_owned = True
+                _tracing_users += 1
+            self._tracing = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _tracing_users, _tracing_owned
+        if self._tracing:
+            self._tracing = False
+            with _tracing_lock:
+                _tracing_users -= 1
+                if _tracing_users == 0 and _tracing_owned:
+                    tracemalloc.stop()
+                    _tracing_owned = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage name."""
+        tracing = self.profile_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            peak = None
+            # Tracing stopped mid-stage (by a timer outside this one) leaves no peak to read
+            if tracing and tracemalloc.is_tracing():
+                peak = max(0, tracemalloc.get_traced_memory()[1] - base)
+            self.record(name, (time.perf_counter_ns() - start) / 1e9, peak)
+
+    def record(self, name: str, seconds: float, peak_memory: Optional[int] = None) -> None:
+        """Add a stage measured elsewhere (e.g. in an execution child)."""
+        entry = self.stages.setdefault(name, {'time_ms': 0.0})
+        entry['time_ms'] = round(entry['time_ms'] + seconds * 1000, 3)
+        if peak_memory is not None:
+            entry['peak_memory_kb'] = max(entry.get('peak_memory_kb', 0), peak_memory // 1024)
+
+    def merge(self, timings: Dict[str, Any]) -> None:
+        """Add the stages of another StageTimer.as_dict() result (e.g. from a worker)."""
+        for name, entry in timings.get('stages', {}).items():
+            peak_kb = entry.get('peak_memory_kb')
+            self.record(name, entry['time_ms'] / 1000, None if peak_kb is None else peak_kb * 1024)
+        self.cache_hit = self.cache_hit or timings.get('cache_hit', False)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the breakdown: per-stage entries, their sum and whether the compile cache hit."""
+        return {
+            'stages': self.stages,
+            'total_ms': round(sum(entry['time_ms'] for entry in self.stages.values()), 3),
+            'cache_hit': self.cache_hit,
+        }
+
+
+class StageStats:
+    """Thread-safe aggregate of StageTimer breakdowns across many compilations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self.compilations = 0
+        self.cache_hits = 0
+
+    def add(self, timings: Optional[Dict[str, Any]]) -> None:
+        """Fold one StageTimer.as_dict() result into the aggregate."""
+        if not timings:
+            return
+        with self._lock:
+            self.compilations += 1
+            self.cache_hits += bool(timings.get('cache_hit'))
+            for name, entry in timings.get('stages', {}).items():
+                totals = self._stages.setdefault(name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+                totals['count'] += 1
+                totals['total_ms'] += entry['time_ms']
+                totals['max_ms'] = max(totals['max_ms'], entry['time_ms'])
+                if 'peak_memory_kb' in entry:
+                    totals['max_peak_memory_kb'] = max(totals.get('max_peak_memory_kb', 0), entry['peak_memory_kb'])
+
+    def summary(self) -> Dict[str, Any]:
+        """Return per-stage count, mean, max and total times in milliseconds."""
+        with self._lock:
+            stages = {}
+            for name, totals in self._stages.items():
+                stages[name] = {
+                    **totals,
+                    'total_ms': round(totals['total_ms'], 3),
+                    'mean_ms': round(totals['total_ms'] / totals['count'], 3),
+                }
+            return {'compilations': self.compilations, 'cache_hits': self.cache_hits, 'stages': stages}
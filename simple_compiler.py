@@ -1,72 +1,472 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
+import hashlib
 import logging
+import os
+import threading
+import time
 from pathlib import Path
-import re
 
+from llvmlite import ir
+from llvmlite import binding as llvm
+
+from compile_cache import LRUCache, fingerprint
 from frontend import plugin_manager
+from frontend.ast.nodes import validate_tree
 from frontend.parser import Parser
-from frontend.preprocessor.preprocessor import Preprocessor
+from frontend.pch import PrecompiledHeaders
+from frontend.preprocessor.preprocessor import STDLIB_PATH, Preprocessor
 from ir.ir_generator import IRGenerator
 from ir.ir_formatter import IRFormatter
 from ir.ir_executor import IRExecutor
+from ir.execution import ExecutionLimits, ExecutionResult
+from ir.execution_pool import ExecutionPool
+from ir.ir_optimizer import IROptimizer
+from profiling import StageTimer
+
+# Bundled example programs, also used to warm the parser
+EXAMPLES_DIR = Path(__file__).parent / 'examples'
+
+class CompiledProgram:
+    """An optimized module produced by ModernCompiler.
+
+    The module is kept as bitcode; textual and formatted IR are only built
+    when a caller asks for them.
+    """
+
+    def __init__(self, module: llvm.ModuleRef, formatter: IRFormatter):
+        self.bitcode = module.as_bitcode()
+        self._module: Optional[llvm.ModuleRef] = module
+        self._formatter = formatter
+        self._ir_code: Optional[str] = None
+        self._formatted: Optional[str] = None
+
+    def take_module(self) -> llvm.ModuleRef:
+        """Return a ModuleRef for execution.
+
+        The freshly compiled module is handed out once; later calls
+        (e.g. compile cache hits) load a new module from the bitcode.
+        """
+        module, self._module = self._module, None
+        if module is None:
+            module = llvm.parse_bitcode(self.bitcode)
+        return module
+
+    @property
+    def ir_code(self) -> str:
+        """Optimized LLVM IR text."""
+        if self._ir_code is None:
+            module = self._module if self._module is not None else llvm.parse_bitcode(self.bitcode)
+            self._ir_code = str(module)
+        return self._ir_code
+
+    @property
+    def formatted(self) -> str:
+        """Optimized LLVM IR, formatted and commented for display."""
+        if self._formatted is None:
+            self._formatted = self._formatter.format_with_comments(self.ir_code)
+        return self._formatted
+
+def normalize_cases(cases: List[Any]) -> List[Dict[str, Any]]:
+    """Turn batch test cases into dicts with 'stdin' and 'expected_output' keys.
+
+    Args:
+        cases: Stdin strings, or dicts with 'stdin' and optional 'expected_output'
+
+    Returns:
+        List of normalized case dicts
+
+    Raises:
+        ValueError: If a case is neither a string nor a dict, or its stdin or
+            expected_output is not a string
+    """
+    normalized = []
+    for index, case in enumerate(cases):
+        if isinstance(case, dict):
+            stdin, expected = case.get('stdin'), case.get('expected_output')
+        else:
+            stdin, expected = case, None
+        if stdin is not None and not isinstance(stdin, (str, bytes)):
+            raise ValueError(f"case {index}: stdin must be a string, got {type(stdin).__name__}")
+        if expected is not None and not isinstance(expected, str):
+            raise ValueError(f"case {index}: expected_output must be a string, got {type(expected).__name__}")
+        normalized.append({'stdin': stdin or '', 'expected_output': expected})
+    return normalized
+
+def output_matches(actual: str, expected: str) -> bool:
+    """Compare program output the way judges usually do: ignoring trailing whitespace."""
+    actual_lines = [line.rstrip() for line in actual.rstrip().splitlines()]
+    expected_lines = [line.rstrip() for line in expected.rstrip().splitlines()]
+    return actual_lines == expected_lines
+
+def record_run_timings(timer: StageTimer, case_results: List[Dict[str, Any]]) -> None:
+    """Add the fork, JIT and execution times reported by program runs to timer."""
+    for case in case_results:
+        if case.get('fork_latency_ms'):
+            timer.record('fork', case['fork_latency_ms'] / 1000)
+        if case.get('jit_time_ms'):
+            timer.record('jit', case['jit_time_ms'] / 1000)
+        timer.record('execute', case['wall_time_ms'] / 1000)
+
+def summarize_batch(case_results: List[Dict[str, Any]], optimization_level: int,
+                    timings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the batch-run response from per-case results and the stage timings."""
+    checked = [case for case in case_results if case['passed'] is not None]
+    passed = sum(1 for case in checked if case['passed'])
+    return {
+        'success': True,
+        'cases': case_results,
+        'total': len(case_results),
+        'passed': passed,
+        'failed': len(checked) - passed,
+        'total_run_time_ms': round(sum(case['wall_time_ms'] for case in case_results), 3),
+        'optimization_level': optimization_level,
+        'timings': timings,
+        'errors': []
+    }
+
+def source_file(source: str) -> Optional[Path]:
+    """Return source as a Path if it names an existing file rather than holding code."""
+    if '\n' in source:
+        return None
+    try:
+        path = Path(source)
+        return path if path.is_file() else None
+    except (OSError, ValueError):
+        # e.g. a one-line program longer than the maximum file name length
+        return None
 
 class ModernCompiler:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         self.logger = logging.getLogger(__name__)
-        self.preprocessor = Preprocessor(include_paths=self.config.get('include_paths', []))
-        self.parser = Parser()
+        # The preprocessor, parser, IR generator and in-process JIT are not
+        # thread-safe; forked program runs happen outside this lock
+        self._lock = threading.RLock()
+        self.preprocessor = Preprocessor(include_paths=self.config.get('include_paths', []),
+                                         macros=self.config.get('macros'))
+        # 'antlr' (default) or 'rd', the recursive-descent parser, which hands anything
+        # it does not parse exactly like the ANTLR builder to the ANTLR parser
+        self.parser = Parser(self.config.get('frontend_engine', 'antlr'))
         self.ir_generator = IRGenerator()
         self.ir_formatter = IRFormatter()
-        self.ir_executor = IRExecutor()
+        self.ir_executor = IRExecutor(self.config)
+        self.ir_optimizer = IROptimizer(self.ir_executor.target_machine)
+        # Compiled programs keyed on preprocessed source + optimization level + config
+        self.compile_cache = LRUCache(self.config.get('compile_cache_size', 256))
 
-        # init plugins
+        # init plugins (discovery and initialization are shared across compilers in the process)
         plugin_manager.load_plugins()
+        plugin_manager.initialize_plugins(self.config)
+        self.preprocessor.use_plugins(plugin_manager.plugins.values())
+        # Bundled header declarations are parsed once and spliced into each translation unit
+        self.pch = None
+        if self.config.get('precompiled_headers', True):
+            self.pch = PrecompiledHeaders(self.parser, self.config.get('pch_cache_dir'),
+                                          maxsize=int(self.config.get('pch_cache_size', 256)))
+            self.preprocessor.precompiled = self.pch
+        # Bundled headers are preprocessed once per process, so including them is a cache lookup
+        if self.config.get('preload_headers', True):
+            self.preprocessor.preload_headers()
+        # Long-lived servers (web app, compile workers) warm the parser prediction
+        # caches on a bundled corpus instead of on their first requests
+        self.parser_warm_up = None
+        if self.config.get('warm_up_parser', False):
+            self.parser_warm_up = self.parser.warm_up(self._warm_up_corpus())
+
+        # Forked execution children are created last so they inherit every import and warm cache
+        self.execution_pool = None
+        if self.config.get('execution_mode') == 'forkserver':
+            if hasattr(os, 'fork'):
+                self.execution_pool = ExecutionPool(
+                    self.ir_executor,
+                    max_workers=self.config.get('execution_workers', 4),
+                    max_runs_per_child=self.config.get('execution_max_runs_per_child', 100),
+                    fork_lock=self._lock,
+                )
+            else:
+                self.logger.warning("execution_mode 'forkserver' requires os.fork; running programs in-process")
+
+    def _warm_up_corpus(self) -> Iterator[Tuple[str, str]]:
+        """Preprocessed examples and stdlib headers, as (path, source) pairs."""
+        paths = sorted(EXAMPLES_DIR.glob('*.c')) + sorted(Path(STDLIB_PATH).glob('*.h'))
+        for path in paths:
+            try:
+                yield str(path), self.preprocessor.process(path.read_text(), filename=str(path))
+            except Exception as e:
+                self.logger.warning(f"Skipping {path} in parser warm-up: {e}")
+        self.preprocessor.reset()
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return counters for every cache (and the execution pool) used by this compiler."""
+        stats = {'compile_cache': self.compile_cache.stats(),
+                 'header_cache': self.preprocessor.header_cache.stats(),
+                 'preprocessor_output': self.preprocessor.output_cache.stats(),
+                 'parser': self.parser.stats()}
+        if self.parser_warm_up is not None:
+            stats['parser_warm_up'] = self.parser_warm_up
+        if self.pch is not None:
+            stats['precompiled_headers'] = self.pch.stats()
+        if self.ir_executor.object_cache is not None:
+            stats['object_cache'] = self.ir_executor.object_cache.stats()
+        if self.execution_pool is not None:
+            stats['execution_pool'] = self.execution_pool.stats()
+        stats['plugin_outputs'] = plugin_manager.output_cache.stats()
+        for name, plugin_stats in plugin_manager.stats().items():
+            stats[f'plugin:{name}'] = plugin_stats
+        return stats
+
+    def _settings(self, config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """The compiler config with per-call overrides applied (self.config itself is never changed)."""
+        return {**self.config, **config} if config else self.config
+
+    def _run_cases(self, program: CompiledProgram | bytes, stdin_inputs: List[Any],
+                   optimization_level: int, config: Optional[Dict[str, Any]] = None) -> List[ExecutionResult]:
+        """Run main once per stdin input, in forked children when the execution pool is enabled.
+
+        Resource limits come from the config (cpu_time_limit, wall_time_limit,
+        memory_limit_mb, output_limit_kb). Runs in the execution pool do not
+        hold the compiler lock, so they overlap with other compilations.
+        """
+        limits = ExecutionLimits.from_config(self._settings(config))
+        bitcode = program if isinstance(program, bytes) else program.bitcode
+        if self.execution_pool is not None:
+            return self.execution_pool.run_cases(bitcode, stdin_inputs, optimization_level, limits)
+        with self._lock:
+            module = llvm.parse_bitcode(bitcode) if isinstance(program, bytes) else program.take_module()
+            return self.ir_executor.run_cases(module, stdin_inputs, optimization_level=optimization_level, limits=limits)
+
+    def _compile_program(self, source: str, optimization_level: Optional[int] = None,
+                         timer: Optional[StageTimer] = None,
+                         config: Optional[Dict[str, Any]] = None) -> CompiledProgram:
+        """Compile under the compiler lock (see _build_program)."""
+        with self._lock:
+            return self._build_program(source, optimization_level, timer or StageTimer(), self._settings(config))
+
+    def _build_program(self, source: str, optimization_level: Optional[int], timer: StageTimer,
+                       config: Dict[str, Any]) -> CompiledProgram:
+        """Run the compilation pipeline and return the optimized program.
+
+        The generated module is serialized to text exactly once, parsed and
+        verified by LLVM, then run through the optimization pipeline for the
+        requested level (defaulting to config['optimization_level']). Results
+        are cached on a hash of the preprocessed source, the optimization
+        level and the compiler config, so resubmitting the same program skips
+        parsing, IR generation and optimization. Bundled headers are not
+        parsed with the program; their precompiled declarations are spliced
+        in. Sources of at least config['stream_threshold_kb'] (default
+        1024, 0 disables) are preprocessed and lexed as a stream. With
+        config['validate_ast'] every AST node is type-checked before IR
+        generation. Each stage is timed into timer.
+        """
+        if optimization_level is None:
+            optimization_level = config.get('optimization_level', 0)
+        optimization_level = IROptimizer.clamp_level(optimization_level)
 
-    def compile(self, source: str, execute: bool = False) -> str:
         # Read source
-        if Path(source).exists():
-            code = Path(source).read_text()
+        filename = '<source>'
+        streaming = False
+        threshold = int(config.get('stream_threshold_kb', 1024)) * 1024
+        path = source_file(source)
+        if path is not None:
+            filename = source
+            # Large files are read line by line while they are lexed
+            streaming = 0 < threshold <= path.stat().st_size
+            code = None if streaming else path.read_text()
         else:
             code = source
+            streaming = 0 < threshold <= len(code)
+        # Text-pass plugins need the whole preprocessed source
+        streaming = streaming and not any(plugin.text_pass for plugin in plugin_manager.plugins.values())
+
+        if streaming:
+            ast, digest, headers = self._parse_streaming(code, filename, timer)
+            cache_key = fingerprint(digest, [self.pch.key(text) for _, text in headers] if headers else None,
+                                    optimization_level, config)
+            cached = self.compile_cache.get(cache_key)
+            if cached is not None:
+                timer.cache_hit = True
+                return cached
+        else:
+            # Preprocess
+            with timer.stage('preprocess'):
+                code = self.preprocessor.process(code, filename=filename)
+                headers = list(self.preprocessor.precompiled_headers)
 
-        # Preprocess
-        code = self.preprocessor.process(code)
-        # Plugins
-        code = plugin_manager.process_source(code, self.config)
-        # Parse
-        ast = self.parser.parse(code)
+            cache_key = fingerprint(code, [self.pch.key(text) for _, text in headers] if headers else None,
+                                    optimization_level, config)
+            cached = self.compile_cache.get(cache_key)
+            if cached is not None:
+                timer.cache_hit = True
+                return cached
+
+            # Plugins
+            with timer.stage('plugins'):
+                code = plugin_manager.process_source(code, config)
+            # Parse
+            with timer.stage('parse'):
+                ast = self.parser.parse(code)
+        if headers:
+            with timer.stage('pch'):
+                ast.declarations[:0] = self.pch.declarations(headers)
+        # Node type checks are off unless asked for: they touch every node
+        if config.get('validate_ast', False):
+            with timer.stage('validate'):
+                validate_tree(ast)
         # IR
-        self.ir_generator = IRGenerator()  # fresh module per compile
-        self.ir_generator.visit(ast)
-        ir_code = str(self.ir_generator.module)
+        with timer.stage('irgen'):
+            self.ir_generator = IRGenerator({**config, 'optimization_level': optimization_level})  # fresh module per compile
+            self.ir_generator.visit(ast)
 
         # Ensure main exists
-        if not re.search(r'define\s+\w+\s+@("main"|main)\s*\(', ir_code):
+        main_func = self.ir_generator.module.globals.get('main')
+        if not isinstance(main_func, ir.Function) or main_func.is_declaration:
             raise RuntimeError("No 'main' function found in the generated IR.")
 
-        # Format
-        formatted = self.ir_formatter.format_with_comments(ir_code)
+        # Verify and optimize (the only text serialization of the module)
+        with timer.stage('verify'):
+            module = llvm.parse_assembly(str(self.ir_generator.module))
+            module.verify()
+        with timer.stage('optimize'):
+            self.ir_optimizer.optimize(module, optimization_level)
+
+        with timer.stage('serialize'):
+            program = CompiledProgram(module, self.ir_formatter)
+        self.compile_cache.put(cache_key, program)
+        return program
+
+    def _parse_streaming(self, code: Optional[str], filename: str,
+                         timer: StageTimer) -> Tuple[Any, str, List[Tuple[str, str]]]:
+        """Preprocess and parse in one pass, handing preprocessed chunks straight to the lexer.
+
+        Neither the preprocessed source nor a character array of it is ever
+        held in full. The chunks are hashed on the way through, so the
+        compile cache still applies (after parsing).
+
+        Args:
+            code: Source text, or None to read filename line by line
+            filename: Source file name
+
+        Returns:
+            (AST, hex digest of the preprocessed source, precompiled headers)
+        """
+        digest = hashlib.sha256()
+        preprocess_ns = 0
+
+        def chunks(source: Iterable[str]) -> Iterator[str]:
+            nonlocal preprocess_ns
+            pieces = self.preprocessor.iter_process(source, filename=filename)
+            while True:
+                start = time.perf_counter_ns()
+                piece = next(pieces, None)
+                preprocess_ns += time.perf_counter_ns() - start
+                if piece is None:
+                    return
+                digest.update(piece.encode('utf-8'))
+                yield piece
+
+        start = time.perf_counter_ns()
+        if code is None:
+            with open(filename, 'r') as f:
+                ast = self.parser.parse(chunks(f))
+        else:
+            ast = self.parser.parse(chunks(code))
+        total_ns = time.perf_counter_ns() - start
+        timer.record('preprocess', preprocess_ns / 1e9)
+        timer.record('parse', (total_ns - preprocess_ns) / 1e9)
+        return ast, digest.hexdigest(), list(self.preprocessor.precompiled_headers)
+
+    def compile(self, source: str, execute: bool = False, config: Optional[Dict[str, Any]] = None) -> str:
+        with self._lock:
+            program = self._compile_program(source, config=config)
+            formatted = program.formatted
 
         if execute:
-            exit_code, stdout = self.ir_executor.execute(ir_code)
-            self.logger.info("Program output: %s", stdout)
+            level = IROptimizer.clamp_level(self._settings(config).get('optimization_level', 0))
+            result = self._run_cases(program, [None], level, config)[0]
+            self.logger.info("Program output: %s", result.output)
         return formatted
 
     def generate_ir_only(self, source: str) -> str:
         """Generate IR without executing the program."""
         return self.compile(source, execute=False)
 
-    def compile_and_execute(self, source: str, optimization_level: int = 0, ai_enhanced: bool = False, stdin: str | bytes | None = None) -> Dict[str, Any]:
-        ir_code = self.compile(source, execute=False)
-        exit_code, stdout = self.ir_executor.execute(str(self.ir_generator.module), stdin_data=stdin)
+    def compile_and_execute(self, source: str, optimization_level: int = 0, ai_enhanced: bool = False, stdin: str | bytes | None = None, include_ir: bool = True,
+                            config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        optimization_level = IROptimizer.clamp_level(optimization_level)
+        with StageTimer(self.config.get('profile_memory', False)) as timer:
+            with self._lock:
+                program = self._compile_program(source, optimization_level, timer, config)
+                # Render the IR before the module is handed to the JIT
+                with timer.stage('format'):
+                    ir_code = program.formatted if include_ir else ''
+            compilation_time = timer.as_dict()['total_ms']
+            result = self._run_cases(program, [stdin], optimization_level, config)[0]
+            record_run_timings(timer, [result.to_dict()])
+        errors = [result.error] if result.error else []
         return {
-            'success': True,
+            'success': not errors,
             'ir_code': ir_code,
-            'output': stdout,
-            'exit_code': exit_code,
+            'output': result.output,
+            'exit_code': result.exit_code,
             'optimization_level': optimization_level,
             'ai_enhanced': ai_enhanced,
-            'compilation_time': 0.0,
-            'errors': []
+            'compilation_time': compilation_time,
+            'timings': timer.as_dict(),
+            'execution': {key: value for key, value in result.to_dict().items() if key != 'output'},
+            'error': errors[0] if errors else None,
+            'errors': errors
         }
+
+    def compile_bitcode(self, source: str, optimization_level: Optional[int] = None,
+                        config: Optional[Dict[str, Any]] = None) -> Tuple[bytes, Dict[str, Any]]:
+        """Compile source and return (optimized module as LLVM bitcode, stage timings)."""
+        with StageTimer(self.config.get('profile_memory', False)) as timer:
+            program = self._compile_program(source, optimization_level, timer, config)
+        return program.bitcode, timer.as_dict()
+
+    def execute_cases(self, bitcode: bytes, cases: List[Any], optimization_level: int = 0,
+                      config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """JIT an optimized module once and run it against each test case.
+
+        Args:
+            bitcode: Optimized module, as returned by compile_bitcode
+            cases: Test cases (see normalize_cases)
+            optimization_level: Codegen optimization level (0-3)
+            config: Per-call overrides of the compiler config (e.g. execution limits)
+
+        Returns:
+            Per-case dicts with status, output, exit_code, wall_time_ms,
+            jit_time_ms, fork_latency_ms and passed (None when the case has
+            no expected output)
+        """
+        cases = normalize_cases(cases)
+        optimization_level = IROptimizer.clamp_level(optimization_level)
+        runs = self._run_cases(bitcode, [case['stdin'] for case in cases], optimization_level, config)
+        results = []
+        for case, run in zip(cases, runs):
+            expected = case['expected_output']
+            passed = None
+            if expected is not None:
+                passed = run.status == 'ok' and output_matches(run.output, expected)
+            results.append({**run.to_dict(), 'passed': passed})
+        return results
+
+    def run_batch(self, source: str, cases: List[Any], optimization_level: int = 0,
+                  config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Compile source once and run it against many stdin test cases.
+
+        Args:
+            source: C source code or path
+            cases: Stdin strings, or dicts with 'stdin' and optional 'expected_output'
+            optimization_level: Optimization level (0-3)
+            config: Per-call overrides of the compiler config
+
+        Returns:
+            Batch result with per-case results and pass/fail totals
+        """
+        optimization_level = IROptimizer.clamp_level(optimization_level)
+        with StageTimer(self.config.get('profile_memory', False)) as timer:
+            program = self._compile_program(source, optimization_level, timer, config)
+            results = self.execute_cases(program.bitcode, cases, optimization_level, config)
+            record_run_timings(timer, results)
+        return summarize_batch(results, optimization_level, timer.as_dict())
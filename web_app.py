@@ -4,7 +4,10 @@ import os, sys
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
-from simple_compiler import ModernCompiler
+from simple_compiler import ModernCompiler, normalize_cases
+from compile_pool import CompilePool
+from ir.ir_optimizer import IROptimizer
+from profiling import StageStats
 import logging
 import json
 import time
@@ -24,7 +27,28 @@ import threading
 from pathlib import Path
 
 app = Flask(__name__)
-compiler = ModernCompiler()
+# Programs run in forked children by default where fork exists; COMPILER_EXECUTION=inprocess opts out
+COMPILER_CONFIG = {
+    'execution_mode': os.environ.get('COMPILER_EXECUTION', 'forkserver' if hasattr(os, 'fork') else 'inprocess'),
+    # Upper bounds for every program run; requests may only lower them
+    'cpu_time_limit': float(os.environ.get('COMPILER_CPU_TIME_LIMIT', '5')),
+    'wall_time_limit': float(os.environ.get('COMPILER_WALL_TIME_LIMIT', '10')),
+    'memory_limit_mb': float(os.environ.get('COMPILER_MEMORY_LIMIT_MB', '256')),
+    'output_limit_kb': float(os.environ.get('COMPILER_OUTPUT_LIMIT_KB', '1024')),
+    # Pay parser warm-up once at startup rather than on the first requests
+    'warm_up_parser': True,
+}
+EXECUTION_LIMIT_KEYS = ('cpu_time_limit', 'wall_time_limit', 'memory_limit_mb', 'output_limit_kb')
+# Worker-pool mode: COMPILER_WORKERS=N compiles in N processes, 0 keeps the in-process compiler
+COMPILER_WORKERS = int(os.environ.get('COMPILER_WORKERS', '0'))
+# In pool mode programs only run in the workers (each with its own execution
+# children), so the parent compiler never executes; it is built before the
+# workers fork so they inherit its warm parser caches
+compiler = ModernCompiler({**COMPILER_CONFIG, 'execution_mode': 'inprocess'} if COMPILER_WORKERS > 0
+                          else dict(COMPILER_CONFIG))
+compile_pool = CompilePool(workers=COMPILER_WORKERS, config=COMPILER_CONFIG) if COMPILER_WORKERS > 0 else None
+# Per-stage pipeline timings aggregated over every compilation served
+stage_stats = StageStats()
 start_time = time.time()  # Track application start time
 
 # Configure logging
@@ -41,6 +65,37 @@ real_time_stats = {
     'total_lines_compiled': 0
 }
 
+def run_compiler(method, config, *args, **kwargs):
+    """Run a ModernCompiler method with a per-request config.
+
+    Dispatches to the worker pool when enabled; otherwise calls the shared
+    compiler, which serializes compilation but runs forked programs
+    concurrently.
+    """
+    if compile_pool is not None:
+        return getattr(compile_pool, method)(*args, config=config, **kwargs)
+    return getattr(compiler, method)(*args, config=config, **kwargs)
+
+def clamp_execution_limits(request_config):
+    """Keep per-request execution limits within the server-wide limits (0 means unlimited)."""
+    for key in EXECUTION_LIMIT_KEYS:
+        server_limit = COMPILER_CONFIG[key]
+        try:
+            requested = float(request_config.get(key) or 0)
+        except (TypeError, ValueError):
+            requested = 0
+        if server_limit:
+            request_config[key] = min(requested, server_limit) if requested > 0 else server_limit
+        else:
+            request_config[key] = max(requested, 0)
+    return request_config
+
+def compile_cache_stats():
+    """Cache counters (per cache) for whichever execution mode is active."""
+    if compile_pool is not None:
+        return compile_pool.cache_stats()
+    return compiler.cache_stats()
+
 # Performance monitoring
 def update_system_stats():
     """Update real-time system statistics"""
@@ -93,7 +148,14 @@ def get_stats():
     average_time_ms = round(avg_time_sec * 1000, 2)
     ai_count = sum(1 for e in compilation_history if e.get('ai_enhanced'))
     ai_rate = round((ai_count / total * 100) if total else 0, 2)
-    return jsonify({ 'total_compilations': total, 'success_rate': success_rate, 'average_compilation_time': average_time_ms, 'ai_usage_rate': ai_rate })
+    return jsonify({
+        'total_compilations': total,
+        'success_rate': success_rate,
+        'average_compilation_time': average_time_ms,
+        'ai_usage_rate': ai_rate,
+        'stage_timings': stage_stats.summary(),
+        **compile_cache_stats()
+    })
 
 @app.route('/api/system-info')
 def get_system_info():
@@ -338,7 +400,7 @@ def generate_ir():
             return jsonify({'success': False, 'error': 'No code provided'})
         
         # Generate IR using the compiler
-        ir_code = compiler.generate_ir_only(code)
+        ir_code = run_compiler('compile', {}, code)
         
         return jsonify({
             'success': True,
@@ -401,9 +463,10 @@ def compile_code():
         session_id = data.get('session_id', str(uuid.uuid4()))
 
         # Extract optimization settings from request and optional stdin
-        optimization_level = data.get('optimization_level', 0)
+        optimization_level = IROptimizer.clamp_level(data.get('optimization_level', 0))
         ai_enhanced = data.get('ai_enhanced', False)
         stdin_text = data.get('stdin', '')
+        include_ir = data.get('include_ir', True)
 
         logger.info(f"Optimization level: {optimization_level}, AI enhanced: {ai_enhanced}")
         logger.info(f"Code length: {len(code)} characters")
@@ -411,10 +474,8 @@ def compile_code():
         if not code.strip():
             return jsonify({'success': False, 'error': 'No code provided'})
 
-        # Update compiler configuration with optimization settings
-        compiler.config.update(config)
-        compiler.config['optimization_level'] = optimization_level
-        compiler.config['ai_enhanced'] = ai_enhanced
+        # Per-request compiler configuration with optimization settings
+        request_config = clamp_execution_limits({**config, 'optimization_level': optimization_level, 'ai_enhanced': ai_enhanced})
 
         # Track compilation start
         start_time = time.time()
@@ -431,13 +492,16 @@ def compile_code():
         }
 
         # Compile and execute the code
-        logger.info("Starting compilation with compiler.compile_and_execute()")
+        logger.info("Starting compilation with compile_and_execute()")
         try:
-            compilation_result = compiler.compile_and_execute(
+            compilation_result = run_compiler(
+                'compile_and_execute',
+                request_config,
                 code,
                 optimization_level=optimization_level,
                 ai_enhanced=ai_enhanced,
                 stdin=stdin_text,
+                include_ir=include_ir,
             )
         except Exception as e:
             import traceback
@@ -446,6 +510,7 @@ def compile_code():
             return jsonify({'success': False, 'error': tb, 'message': 'Unhandled exception occurred'}), 500
 
         logger.info(f"Compilation result: {compilation_result}")
+        stage_stats.add(compilation_result.get('timings'))
 
         # Calculate compilation time
         compile_time = time.time() - start_time
@@ -486,6 +551,8 @@ def compile_code():
                 'session_id': session_id,
                 'message': compilation_result.get('message', ''),
                 'ir_code': compilation_result.get('ir_code', ''),  # Include IR for advanced users
+                'execution': compilation_result.get('execution'),
+                'timings': compilation_result.get('timings'),
                 'source_lines': compilation_result.get('source_lines', 0)
             })
         else:
@@ -493,6 +560,9 @@ def compile_code():
                 'success': False,
                 'error': compilation_result.get('error', 'Unknown compilation error'),
                 'message': compilation_result.get('message', ''),
+                'result': compilation_result.get('output', ''),
+                'execution': compilation_result.get('execution'),
+                'timings': compilation_result.get('timings'),
                 'compilation_time': round(compile_time * 1000, 2),
                 'session_id': session_id
             })
@@ -510,6 +580,53 @@ def compile_code():
 
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/judge', methods=['POST'])
+def judge_code():
+    """Compile once and run the program against a list of stdin test cases"""
+    try:
+        data = request.json
+        code = data.get('code', '')
+        config = data.get('config', {})
+        cases = data.get('cases', [])
+        optimization_level = IROptimizer.clamp_level(data.get('optimization_level', 0))
+
+        if not code.strip():
+            return jsonify({'success': False, 'error': 'No code provided'})
+        if not isinstance(cases, list) or not cases:
+            return jsonify({'success': False, 'error': 'No test cases provided'})
+        try:
+            cases = normalize_cases(cases)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': f'Invalid test case: {e}'}), 400
+
+        request_config = clamp_execution_limits({**config, 'optimization_level': optimization_level})
+
+        start_time = time.time()
+        real_time_stats['total_compilations'] = real_time_stats.get('total_compilations', 0) + 1
+        batch_result = run_compiler('run_batch', request_config, code, cases, optimization_level=optimization_level)
+        judge_time = time.time() - start_time
+        stage_stats.add(batch_result.get('timings'))
+
+        compilation_history.append({
+            'id': data.get('session_id', str(uuid.uuid4())),
+            'timestamp': datetime.now().isoformat(),
+            'code_length': len(code),
+            'compile_time': judge_time,
+            'success': batch_result['success'],
+            'config': config,
+            'optimization_level': optimization_level,
+            'test_cases': batch_result['total']
+        })
+        if len(compilation_history) > 100:
+            compilation_history.pop(0)
+
+        return jsonify({**batch_result, 'judge_time': round(judge_time * 1000, 2)})
+
+    except Exception as e:
+        logger.error(f"Judge error: {e}")
+        real_time_stats['total_errors'] = real_time_stats.get('total_errors', 0) + 1
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/get-ir', methods=['POST'])
 def get_ir_code():
     """Get the generated LLVM IR for given C code"""
@@ -517,21 +634,19 @@ def get_ir_code():
         data = request.json
         code = data.get('code', '')
         config = data.get('config', {})
-        optimization_level = data.get('optimization_level', 0)
+        optimization_level = IROptimizer.clamp_level(data.get('optimization_level', 0))
         ai_enhanced = data.get('ai_enhanced', False)
         
         if not code.strip():
             return jsonify({'success': False, 'error': 'No code provided'})
         
-        # Update compiler configuration
-        compiler.config.update(config)
-        compiler.config['optimization_level'] = optimization_level
-        compiler.config['ai_enhanced'] = ai_enhanced
+        # Per-request compiler configuration
+        request_config = {**config, 'optimization_level': optimization_level, 'ai_enhanced': ai_enhanced}
         
         start_time = time.time()
         
         # Generate IR without execution
-        ir_code = compiler.compile(code, execute=False)
+        ir_code = run_compiler('compile', request_config, code)
         
         compile_time = time.time() - start_time
         